@@ -0,0 +1,786 @@
+#!/usr/bin/env python3
+"""
+Performans Benchmark'ları
+Yerel stand-in sunucular ile ölçüm (gerçek borsaya istek atılmaz)
+
+KULLANIM:
+    python benchmark.py ws-orders              # WebSocket API vs REST emir gecikmesi
+    python benchmark.py ws-orders -n 1000
+    python benchmark.py json                   # JSON decoder'ları (REST + stream payload)
+    python benchmark.py json --payload-dir recorded/   # Kaydedilmiş payload'lar ile
+    python benchmark.py logging                # Döngü başına loglama maliyeti (senkron vs kuyruk)
+    python benchmark.py hedge                  # Yavaş kuyruklu GET: hedge kapalı vs açık
+    python benchmark.py transport              # Boşta kalan bağlantı: keep-warm kapalı vs açık
+    python benchmark.py batch                  # 5 sinyal: tek tek place_order vs batchOrders
+    python benchmark.py klines                 # Warmup: satır satır update_price vs NumPy + load_history
+    python benchmark.py coalesce               # Döngü + dashboard aynı ticker'ı ister: single-flight / TTL
+    python benchmark.py feed                   # Tick patlaması > strateji hızı: callback başına vs birleştiren tampon
+    python benchmark.py indicators             # SMA / RSI / Bollinger: pencereden yeniden hesap vs streaming O(1)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+API_KEY = "benchmark-key"
+SECRET_KEY = "benchmark-secret"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, samples: List[float]):
+    """Gecikme özetini milisaniye olarak yazdır"""
+    ms = [s * 1000 for s in samples]
+    print(f"  {name:<22} n={len(ms):<5} mean={statistics.mean(ms):7.3f}ms  "
+          f"p50={percentile(ms, 50):7.3f}ms  p90={percentile(ms, 90):7.3f}ms  "
+          f"p99={percentile(ms, 99):7.3f}ms")
+
+
+def measure(func: Callable, iterations: int, warmup: int = 20) -> List[float]:
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def write_config(tmp_dir: str, api_url: str, ws_url: str, ws_api_url: str, **network) -> str:
+    """Stand-in sunuculara işaret eden geçici client config'i"""
+    config = {
+        "api_credentials": {"api_key": API_KEY, "secret_key": SECRET_KEY},
+        "testnet_config": {"api_url": api_url, "ws_url": ws_url, "ws_api_url": ws_api_url},
+        "network": network,
+        "logging": {"level": "WARNING"},
+    }
+    path = Path(tmp_dir) / "benchmark_config.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+# ----------------------------------------------------------------------
+# Stand-in exchange (REST + WebSocket API, aiohttp)
+# ----------------------------------------------------------------------
+
+def _valid_signature(payload: str, signature: str) -> bool:
+    expected = hmac.new(SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _order_result(params: Dict) -> Dict:
+    return {
+        "orderId": int(time.time() * 1e6),
+        "symbol": params.get("symbol"),
+        "clientOrderId": params.get("newClientOrderId", ""),
+        "status": "FILLED",
+        "avgPrice": "50000.0",
+        "origQty": str(params.get("quantity")),
+        "executedQty": str(params.get("quantity")),
+        "side": params.get("side"),
+        "type": params.get("type"),
+    }
+
+
+class StandInExchange:
+    """Arka plan thread'inde çalışan yerel REST + ws-fapi sunucusu"""
+
+    def __init__(self, base_latency: float = 0.0, tail_rate: float = 0.0, tail_latency: float = 0.0,
+                 keepalive_timeout: float = 75.0):
+        """
+        Args:
+            base_latency / tail_rate / tail_latency: ticker ve REST emir yanıt
+                gecikmesi; ticker isteklerinin tail_rate kadarı tail_latency sürer
+            keepalive_timeout: Sunucunun boştaki bağlantıyı kapatma süresi
+        """
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        self.base_latency = base_latency
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.ticker_requests = 0
+        self.keepalive_timeout = keepalive_timeout
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "StandInExchange":
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/fapi"
+
+    @property
+    def ws_api_url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/ws-fapi/v1"
+
+    def _run(self):
+        from aiohttp import web, WSMsgType
+
+        def signed(request) -> bool:
+            # Binance gibi: imza gönderilen (encode edilmiş) query string üzerinden
+            payload, _, signature = request.rel_url.raw_query_string.rpartition("&signature=")
+            return _valid_signature(payload, signature)
+
+        async def rest_order(request):
+            await asyncio.sleep(self.base_latency)
+            if not signed(request):
+                return web.json_response({"code": -1022, "msg": "Signature invalid"}, status=400)
+            return web.json_response(_order_result(dict(request.query)))
+
+        async def rest_batch_orders(request):
+            await asyncio.sleep(self.base_latency)
+            if not signed(request):
+                return web.json_response({"code": -1022, "msg": "Signature invalid"}, status=400)
+            orders = json.loads(request.query["batchOrders"])
+            if len(orders) > 5:
+                return web.json_response({"code": -1102, "msg": "Max 5 orders per batch"}, status=400)
+            return web.json_response([
+                _order_result(params) if float(params["quantity"]) > 0
+                else {"code": -4003, "msg": "Quantity less than or equal to zero."}
+                for params in orders
+            ])
+
+        async def ticker_price(request):
+            self.ticker_requests += 1
+            slow = random.random() < self.tail_rate
+            await asyncio.sleep(self.tail_latency if slow else self.base_latency)
+            return web.json_response({"symbol": request.query.get("symbol", "BTCUSDT"),
+                                      "price": "50000.0", "time": int(time.time() * 1000)})
+
+        async def ws_api(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                req = json.loads(msg.data)
+                params = dict(req["params"])
+                signature = params.pop("signature", "")
+                payload = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+                if not _valid_signature(payload, signature):
+                    response = {"id": req["id"], "status": 400,
+                                "error": {"code": -1022, "msg": "Signature invalid"}}
+                else:
+                    response = {"id": req["id"], "status": 200, "result": _order_result(params)}
+                await ws.send_str(json.dumps(response))
+            return ws
+
+        async def serve():
+            app = web.Application()
+            app.router.add_post("/fapi/v1/order", rest_order)
+            app.router.add_post("/fapi/v1/batchOrders", rest_batch_orders)
+            app.router.add_get("/fapi/v1/ticker/price", ticker_price)
+            app.router.add_get("/ws-fapi/v1", ws_api)
+            runner = web.AppRunner(app, access_log=None, keepalive_timeout=self.keepalive_timeout)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(serve())
+        self._ready.set()
+        self.loop.run_forever()
+
+
+# ----------------------------------------------------------------------
+# Payload'lar (kaydedilmiş dosyalar yoksa gerçek formatta üretilir)
+# ----------------------------------------------------------------------
+
+def sample_rest_payloads() -> Dict[str, bytes]:
+    """exchangeInfo (~250 sembol) ve 1000'lik kline yanıtı"""
+    symbols = []
+    for i in range(250):
+        symbols.append({
+            "symbol": f"SYM{i}USDT", "pair": f"SYM{i}USDT", "contractType": "PERPETUAL",
+            "deliveryDate": 4133404800000, "onboardDate": 1569398400000, "status": "TRADING",
+            "maintMarginPercent": "2.5000", "requiredMarginPercent": "5.0000",
+            "baseAsset": f"SYM{i}", "quoteAsset": "USDT", "marginAsset": "USDT",
+            "pricePrecision": 2, "quantityPrecision": 3, "baseAssetPrecision": 8, "quotePrecision": 8,
+            "underlyingType": "COIN", "underlyingSubType": [], "triggerProtect": "0.0500",
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": "0.10", "maxPrice": "1000000", "tickSize": "0.10"},
+                {"filterType": "LOT_SIZE", "minQty": "0.001", "maxQty": "1000", "stepSize": "0.001"},
+                {"filterType": "MARKET_LOT_SIZE", "minQty": "0.001", "maxQty": "120", "stepSize": "0.001"},
+                {"filterType": "MAX_NUM_ORDERS", "limit": 200},
+                {"filterType": "MAX_NUM_ALGO_ORDERS", "limit": 10},
+                {"filterType": "MIN_NOTIONAL", "notional": "5"},
+                {"filterType": "PERCENT_PRICE", "multiplierUp": "1.0500", "multiplierDown": "0.9500",
+                 "multiplierDecimal": "4"},
+            ],
+            "orderTypes": ["LIMIT", "MARKET", "STOP", "STOP_MARKET", "TAKE_PROFIT",
+                           "TAKE_PROFIT_MARKET", "TRAILING_STOP_MARKET"],
+            "timeInForce": ["GTC", "IOC", "FOK", "GTX"],
+        })
+    exchange_info = {"timezone": "UTC", "serverTime": 1700000000000, "rateLimits": [], "assets": [],
+                     "symbols": symbols}
+    start = 1700000000000
+    klines = [[start + i * 60000, "50000.10", "50010.00", "49990.00", "50005.50", "12.345",
+               start + i * 60000 + 59999, "617000.12", 100, "6.1", "305000.00", "0"]
+              for i in range(1000)]
+    return {
+        "exchangeInfo": json.dumps(exchange_info, separators=(",", ":")).encode(),
+        "klines(1000)": json.dumps(klines, separators=(",", ":")).encode(),
+    }
+
+
+def sample_stream_messages() -> List[str]:
+    """Combined stream'in ticker / kline / markPrice mesajları"""
+    messages = []
+    for i in range(100):
+        price = f"{50000 + i * 0.1:.2f}"
+        messages.append(json.dumps({"stream": "btcusdt@ticker", "data": {
+            "e": "24hrTicker", "E": 1700000000000 + i, "s": "BTCUSDT", "p": "-120.50", "P": "-0.240",
+            "w": "50010.11", "c": price, "Q": "0.003", "o": "50120.60", "h": "50500.00",
+            "l": "49700.00", "v": "123456.789", "q": "6170000000.12", "O": 1699913600000,
+            "C": 1700000000000 + i, "F": 1, "L": 999, "n": 999}}, separators=(",", ":")))
+        messages.append(json.dumps({"stream": "btcusdt@kline_1m", "data": {
+            "e": "kline", "E": 1700000000000 + i, "s": "BTCUSDT", "k": {
+                "t": 1699999980000, "T": 1700000039999, "s": "BTCUSDT", "i": "1m", "f": 100, "L": 200,
+                "o": "50001.0", "c": price, "h": "50010.0", "l": "49990.0", "v": "12.345", "n": 100,
+                "x": i % 60 == 0, "q": "617000.1", "V": "6.1", "Q": "305000.0", "B": "0"}}},
+            separators=(",", ":")))
+        messages.append(json.dumps({"stream": "btcusdt@markPrice@1s", "data": {
+            "e": "markPriceUpdate", "E": 1700000000000 + i, "s": "BTCUSDT", "p": price,
+            "i": "50001.1", "P": "50002.2", "r": "0.00010000", "T": 1700006400000}},
+            separators=(",", ":")))
+    return messages
+
+
+def load_recorded_payloads(payload_dir: str) -> Tuple[Dict[str, bytes], List[str]]:
+    """*.json: REST yanıtı, *.jsonl: satır başına bir stream mesajı"""
+    rest, stream = {}, []
+    for path in sorted(Path(payload_dir).glob("*.json")):
+        rest[path.stem] = path.read_bytes()
+    for path in sorted(Path(payload_dir).glob("*.jsonl")):
+        stream.extend(line for line in path.read_text().splitlines() if line.strip())
+    return rest, stream
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+def bench_ws_orders(args):
+    """place_order: WebSocket API transport vs REST (aynı client, aynı imzalama)"""
+    from src.binance_futures_api import BinanceFuturesTestnetAPI
+
+    exchange = StandInExchange().start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = write_config(
+            tmp_dir, exchange.api_url, "ws://127.0.0.1:1", exchange.ws_api_url,
+            ws_orders={"enabled": True, "timeout": 5.0}
+        )
+        api = BinanceFuturesTestnetAPI(config_path)
+        api.logger.setLevel(logging.WARNING)
+        api.rate_limiter.order_limit_10s = api.rate_limiter.order_limit_1m = 10 ** 9
+
+        def order():
+            api.place_order("BTCUSDT", "BUY", "MARKET", 0.001)
+
+        print(f"\n⚡ Order round-trip latency (local stand-in, {args.iterations} orders)")
+
+        transport = api.ws_orders
+        api.ws_orders = None
+        rest = measure(order, args.iterations)
+        report("REST (keep-alive)", rest)
+
+        api.ws_orders = transport
+        api.start_ws_orders()
+        deadline = time.time() + 5
+        while not transport.connected and time.time() < deadline:
+            time.sleep(0.01)
+        if not transport.connected:
+            print("  ❌ WebSocket API stand-in unreachable")
+            return
+        ws = measure(order, args.iterations)
+        report("WebSocket API", ws)
+        print(f"  transport stats: {transport.stats}")
+        print(f"  p50 speedup: {percentile(rest, 50) / percentile(ws, 50):.2f}x")
+
+        api.stop_ws_orders()
+        api.close()
+    exchange.stop()
+
+
+def bench_json(args):
+    """REST yanıtı decode ve stream mesajı decode + parse: decoder'lar karşılaştırmalı"""
+    from src.json_codec import JSON_DECODERS, extract_stream_payload
+    from src.market_data import parse_stream_message
+
+    if args.payload_dir:
+        rest_payloads, stream_messages = load_recorded_payloads(args.payload_dir)
+    else:
+        rest_payloads, stream_messages = sample_rest_payloads(), sample_stream_messages()
+
+    print(f"\n🧮 JSON decode (decoders: {', '.join(sorted(JSON_DECODERS))})")
+    iterations = max(args.iterations // 10, 5)
+    for name, body in rest_payloads.items():
+        print(f" {name} ({len(body) / 1024:.0f} KiB)")
+        for decoder_name, loads in sorted(JSON_DECODERS.items()):
+            report(decoder_name, measure(lambda: loads(body), iterations, warmup=3))
+
+    if not stream_messages:
+        return
+    print(f" stream messages (decode + parse_stream_message, {len(stream_messages)} msgs per sample)")
+
+    def run(decode):
+        def batch():
+            for message in stream_messages:
+                parse_stream_message(decode(message))
+        return batch
+
+    def extract(message):
+        return extract_stream_payload(message) or JSON_DECODERS["json"](message)
+
+    per_message = len(stream_messages)
+    variants = [(decoder_name, loads) for decoder_name, loads in sorted(JSON_DECODERS.items())]
+    variants.append(("regex extract", extract))
+    for label, decode in variants:
+        samples = measure(run(decode), iterations, warmup=3)
+        report(label, [s / per_message for s in samples])
+
+
+def bench_hedge(args):
+    """get_ticker_price, %3'ü yavaş yanıt: hedge kapalı vs açık (sync + async client)"""
+    from src.binance_futures_api import BinanceFuturesTestnetAPI
+    from src.async_binance_futures_api import AsyncBinanceFuturesTestnetAPI
+
+    exchange = StandInExchange(base_latency=0.002, tail_rate=0.03, tail_latency=0.25).start()
+    print(f"\n🪝 Hedged GET (local stand-in: 2ms, 3% at 250ms, {args.iterations} requests)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = write_config(
+            tmp_dir, exchange.api_url, "ws://127.0.0.1:1", exchange.ws_api_url,
+            latency={"hedge": True}
+        )
+
+        def run(api, call, label):
+            api.rate_limiter.weight_limit = 10 ** 9
+            for hedge in (False, True):
+                api.latency.hedge = hedge
+                api.latency.stats.update(hedged=0, hedge_wins=0)
+                sent_before = exchange.ticker_requests
+                samples = measure(call, args.iterations)
+                report(f"{label}, hedge {'on' if hedge else 'off'}", samples)
+                extra = (exchange.ticker_requests - sent_before) / (args.iterations + 20) - 1
+                print(f"  {'':<22} extra requests={extra * 100:.1f}%  {api.latency.stats}")
+            print(f"  {'':<22} {api.latency.summary()}")
+
+        api = BinanceFuturesTestnetAPI(config_path)
+        run(api, lambda: api.get_ticker_price("BTCUSDT"), "sync")
+        api.close()
+
+        loop = asyncio.new_event_loop()
+        async_api = AsyncBinanceFuturesTestnetAPI(config_path)
+        run(async_api, lambda: loop.run_until_complete(async_api.get_ticker_price("BTCUSDT")), "async")
+        loop.run_until_complete(async_api.close())
+        loop.close()
+    exchange.stop()
+
+
+def bench_batch(args):
+    """Aynı döngüde 5 giriş sinyali: sıralı place_order vs tek /v1/batchOrders"""
+    from src.binance_futures_api import BinanceFuturesTestnetAPI
+
+    # 5ms sunucu gecikmesi: aynı bölgedeki bir borsanın yaklaşık RTT'si
+    exchange = StandInExchange(base_latency=0.005).start()
+    orders = [dict(symbol=f"SYM{i}USDT", side="BUY", order_type="MARKET", quantity=0.01)
+              for i in range(5)]
+    iterations = max(args.iterations // 5, 20)
+    print(f"\n📦 Batch orders (local stand-in, 5ms server latency, {iterations} cycles of 5 orders)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = write_config(tmp_dir, exchange.api_url, "ws://127.0.0.1:1", exchange.ws_api_url)
+        api = BinanceFuturesTestnetAPI(config_path)
+        api.rate_limiter.order_limit_10s = api.rate_limiter.order_limit_1m = 10 ** 9
+        api.rate_limiter.weight_limit = 10 ** 9
+
+        def sequential():
+            for order in orders:
+                api.place_order(**order)
+
+        def batch():
+            results = api.place_orders_batch(orders)
+            assert all(isinstance(r, dict) for r in results), results
+
+        report("sequential place_order", measure(sequential, iterations, warmup=3))
+        report("place_orders_batch", measure(batch, iterations, warmup=3))
+        print("  signed requests per cycle: 5 -> 1")
+        api.close()
+    exchange.stop()
+
+
+def bench_coalesce(args):
+    """Trading döngüsü ve dashboard thread'leri aynı anda aynı ticker'ları ister"""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.binance_futures_api import BinanceFuturesTestnetAPI
+
+    exchange = StandInExchange(base_latency=0.02).start()
+    symbols = [f"SYM{i}USDT" for i in range(5)]
+    callers, rounds = 6, max(args.iterations // 10, 20)
+    print(f"\n🧲 Request coalescing (20ms server, {callers} callers x {len(symbols)} symbols, {rounds} rounds)")
+    variants = [
+        ("off", {"enabled": False}),
+        ("single-flight", {"ttl": {}}),
+        ("single-flight + 1s TTL", {"ttl": {"/v1/ticker/price": 1.0}}),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir, ThreadPoolExecutor(callers * len(symbols)) as pool:
+        for label, cache_config in variants:
+            config_path = write_config(tmp_dir, exchange.api_url, "ws://127.0.0.1:1",
+                                       exchange.ws_api_url, request_cache=cache_config,
+                                       http={"pool_maxsize": callers * len(symbols)})
+            api = BinanceFuturesTestnetAPI(config_path)
+            api.rate_limiter.weight_limit = 10 ** 9
+            sent_before = exchange.ticker_requests
+
+            def one_round():
+                list(pool.map(api.get_ticker_price, symbols * callers))
+
+            samples = measure(one_round, rounds, warmup=0)
+            sent = exchange.ticker_requests - sent_before
+            report(label, samples)
+            print(f"  {'':<22} requests sent/round={sent / rounds:.1f} "
+                  f"(of {callers * len(symbols)})  {api.request_cache.stats}")
+            api.close()
+    exchange.stop()
+
+
+def bench_feed(args):
+    """Akış stratejiden hızlıyken teslim anındaki fiyat yaşı: mesaj başına callback vs ConflatingBuffer"""
+    from src.conflating_buffer import ConflatingBuffer
+
+    symbols = [f"SYM{i}USDT" for i in range(8)]
+    rate, duration, handler_cost = 8000, 2.0, 0.0003
+    print(f"\n🌊 Feed burst ({rate} ticks/s over {len(symbols)} symbols for {duration:.0f}s, "
+          f"{handler_cost * 1000:.1f}ms handler, kline close every 0.25s)")
+
+    async def run(conflate: bool):
+        loop = asyncio.get_running_loop()
+        staleness, closes = [], []
+
+        def on_event(event):
+            time.sleep(handler_cost)  # strateji / sinyal değerlendirme
+            if event["type"] == "kline":
+                closes.append(event["open_time"])
+            staleness.append(time.perf_counter() - event["produced_at"])
+
+        buffer = ConflatingBuffer(loop, on_event)
+        produced_closes = []
+
+        def produce():
+            started = time.perf_counter()
+            sent = 0
+            while (elapsed := time.perf_counter() - started) < duration:
+                while sent < elapsed * rate:
+                    symbol = symbols[sent % len(symbols)]
+                    event = {"type": "ticker", "symbol": symbol, "price": float(sent),
+                             "volume": float(sent), "produced_at": time.perf_counter()}
+                    if sent % int(rate / 4) == 0:
+                        event = dict(event, type="kline", closed=True, open_time=sent)
+                        produced_closes.append(sent)
+                    if conflate:
+                        buffer.put(event)
+                    else:
+                        loop.call_soon_threadsafe(on_event, event)
+                    sent += 1
+                time.sleep(0.001)
+            return sent
+
+        sent = await asyncio.to_thread(produce)
+        # Kuyrukta kalanların teslimini bekle (loop callback'leri sleep'ten önce çalışır)
+        while len(closes) < len(produced_closes):
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        label = "conflating buffer" if conflate else "callback per message"
+        report(label, staleness)
+        print(f"  {'':<22} ticks={sent} handled={len(staleness)} "
+              f"closes={len(closes)}/{len(produced_closes)} in order={closes == produced_closes}"
+              + (f" dropped={buffer.stats['dropped']} max_pending={buffer.stats['max_pending']}" if conflate else ""))
+
+    asyncio.run(run(conflate=False))
+    asyncio.run(run(conflate=True))
+
+
+def bench_klines(args):
+    """1000'lik kline yanıtı -> strateji geçmişi: satır satır vs kolonlu NumPy yolu"""
+    from src.binance_futures_api import BinanceFuturesTestnetAPI
+    from src.json_codec import get_json_decoder
+    from src.kline_store import klines_to_array
+    from production_bot_v2 import MTFTradingStrategy
+
+    with open(PROJECT_ROOT / "config" / "production_config.json") as f:
+        bot_config = json.load(f)
+    body = sample_rest_payloads()["klines(1000)"]
+    loads = get_json_decoder("auto")
+    iterations = max(args.iterations // 5, 20)
+    print(f"\n🕯️  Kline warmup (1000 candles: decode + validate + load into strategy, {iterations} runs)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        api = BinanceFuturesTestnetAPI(write_config(tmp_dir, "http://127.0.0.1:1", "ws://127.0.0.1:1",
+                                                    "ws://127.0.0.1:1"))
+
+        def per_row():
+            # Eski yol: get_klines doğrulaması + collect_initial_data döngüsü
+            strategy = MTFTradingStrategy(bot_config)
+            for kline in api._parse_klines("BTCUSDT", loads(body)):
+                strategy.update_price("BTCUSDT", float(kline[4]), float(kline[5]))
+
+        def columnar():
+            strategy = MTFTradingStrategy(bot_config)
+            strategy.load_history("BTCUSDT", klines_to_array(loads(body)))
+
+        def decode_only():
+            klines_to_array(loads(body))
+
+        # Backtest / disk önbelleği: mumlar zaten dizi olarak okunur
+        cached = klines_to_array(loads(body))
+
+        def from_cache():
+            MTFTradingStrategy(bot_config).load_history("BTCUSDT", cached)
+
+        report("per-row update_price", measure(per_row, iterations, warmup=3))
+        report("array + load_history", measure(columnar, iterations, warmup=3))
+        report("  (decode to array)", measure(decode_only, iterations, warmup=3))
+        report("cached -> load_history", measure(from_cache, iterations, warmup=3))
+        api.close()
+
+
+def bench_indicators(args):
+    """Yeni fiyat başına indikatör maliyeti: pencereden yeniden hesap vs streaming, periyot taraması"""
+    import numpy as np
+    from src.indicators import RollingBollinger, RollingRSI, RollingSMA
+    from src.price_history import PriceRingBuffer
+    from production_bot_v2 import MTFTradingStrategy
+
+    rng = np.random.default_rng(7)
+    prices = (65000 * np.exp(np.cumsum(rng.normal(0, 0.001, 20000)))).tolist()
+    batch = 100
+    iterations = max(args.iterations // 5, 50)
+    print(f"\n📈 Indicators (per new price: update + read, {iterations} x {batch} prices)")
+
+    def window_sma(history, period):
+        return float(history.prices(period).sum()) / period
+
+    def window_rsi(history, period):
+        window = history.prices(period + 1)
+        changes = window[1:] - window[:-1]
+        gains = np.maximum(changes, 0.0)
+        return float(gains.sum()), float((gains - changes).sum())
+
+    def window_bollinger(history, period):
+        window = history.prices(period)
+        deviations = window - float(window.sum()) / period
+        return float(deviations @ deviations)
+
+    def per_update_us(step) -> List[float]:
+        position = [0]
+
+        def run():
+            start = position[0]
+            for price in prices[start:start + batch]:
+                step(price)
+            position[0] = (start + batch) % (len(prices) - batch)
+
+        return [s / batch * 1e6 for s in measure(run, iterations)]
+
+    def line(name: str, samples: List[float]):
+        print(f"  {name:<22} mean={statistics.mean(samples):6.2f}us  "
+              f"p50={percentile(samples, 50):6.2f}us  p99={percentile(samples, 99):6.2f}us")
+
+    for period in (14, 200, 2000, 10000):
+        print(f"  period={period}")
+        history = PriceRingBuffer(2 * period)
+        history.extend(prices[:2 * period], np.zeros(2 * period), 0.0)
+        for name, window_func, rolling in (
+            ("sma", window_sma, RollingSMA(period)),
+            ("rsi", window_rsi, RollingRSI(period)),
+            ("bollinger", window_bollinger, RollingBollinger(period, 2.0)),
+        ):
+            rolling.extend(prices[:2 * period])
+
+            def recompute(price, window_func=window_func):
+                history.append(price, 0.0, 0.0)
+                window_func(history, period)
+
+            def streaming(price, rolling=rolling):
+                rolling.update(price)
+                rolling.value
+
+            line(f"  {name} window", per_update_us(recompute))
+            line(f"  {name} streaming", per_update_us(streaming))
+
+    # Strateji: tick başına update_price + generate_signal (config periyotları)
+    with open(PROJECT_ROOT / "config" / "production_config.json") as f:
+        bot_config = json.load(f)
+    strategy = MTFTradingStrategy(bot_config)
+    for price in prices[:1000]:
+        strategy.update_price("BTCUSDT", price)
+
+    def tick(price):
+        strategy.update_price("BTCUSDT", price)
+        strategy.generate_signal("BTCUSDT", price)
+
+    print("  strategy (update_price + generate_signal)")
+    line("  per tick", per_update_us(tick))
+
+
+def bench_transport(args):
+    """Döngüler arası boşta bağlantı soğur: transport ve keep-warm ping karşılaştırması"""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.binance_futures_api import BinanceFuturesTestnetAPI
+    from src.http_transport import HTTP_TRANSPORTS
+
+    # Sunucu 0.3s boşta kalan bağlantıyı kapatır; döngüler arası 0.6s bekleme
+    exchange = StandInExchange(keepalive_timeout=0.3).start()
+    gap, burst = 0.6, 8
+    cycles = max(args.iterations // 50, 5)
+    print(f"\n🔌 HTTP transport ({cycles} cycles: {gap}s idle, 1 request + {burst} concurrent)")
+    with tempfile.TemporaryDirectory() as tmp_dir, ThreadPoolExecutor(burst) as pool:
+        for name in sorted(HTTP_TRANSPORTS):
+            for keepalive in (0, 0.15):
+                config_path = write_config(
+                    tmp_dir, exchange.api_url, "ws://127.0.0.1:1", exchange.ws_api_url,
+                    http={"transport": name, "keepalive_interval": keepalive,
+                          "warm_connections": burst}
+                )
+                api = BinanceFuturesTestnetAPI(config_path)
+                api.rate_limiter.weight_limit = 10 ** 9
+                api.get_ticker_price("BTCUSDT")
+                api.start_keepalive()
+                first, handshakes = [], 0
+                for _ in range(cycles):
+                    time.sleep(gap)
+                    before = api.transport.stats["handshakes"]
+                    start = time.perf_counter()
+                    api.get_ticker_price("BTCUSDT")
+                    first.append(time.perf_counter() - start)
+                    list(pool.map(lambda _: api.get_ticker_price("BTCUSDT"), range(burst)))
+                    handshakes += api.transport.stats["handshakes"] - before
+                report(f"{name}, keep-warm {'on' if keepalive else 'off'}", first)
+                print(f"  {'':<22} handshakes/cycle={handshakes / cycles:.1f}  {api.transport.stats}")
+                api.close()
+    exchange.stop()
+
+
+def bench_logging(args):
+    """Bir trading döngüsünün log çağrıları: senkron handler'lar vs QueueListener"""
+    from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+    from src.log_pipeline import install_queue_logging, stop_queue_logging
+
+    symbols = [f"SYM{i}USDT" for i in range(10)]
+    response = {"symbol": "BTCUSDT", "price": "43250.10", "time": 1700000000000}
+
+    def build_handlers(log_dir: str) -> Dict[str, List[logging.Handler]]:
+        fmt = logging.Formatter('%(asctime)s | %(name)s | %(levelname)-8s | %(funcName)s:%(lineno)d | %(message)s')
+        main_handler = TimedRotatingFileHandler(f"{log_dir}/bot.log", when='midnight', encoding='utf-8')
+        error_handler = RotatingFileHandler(f"{log_dir}/errors.log", maxBytes=10 * 1024 * 1024)
+        error_handler.setLevel(logging.ERROR)
+        trade_handler = RotatingFileHandler(f"{log_dir}/trades.log", maxBytes=10 * 1024 * 1024)
+        for handler in (main_handler, error_handler, trade_handler):
+            handler.setFormatter(fmt)
+        return {"BenchBot": [main_handler, error_handler], "BenchTrades": [trade_handler]}
+
+    def cycle(bot, trades, api, lazy: bool):
+        for symbol in symbols:
+            # API client logger INFO seviyesinde: lazy çağrıda string hiç oluşturulmaz
+            if lazy:
+                api.debug("API response for %s: %s = %s", symbol, type(response), response)
+                bot.debug("%s: $%.4f", symbol, 43250.1)
+            else:
+                api.debug(f"API response for {symbol}: {type(response)} = {response}")
+                bot.debug(f"{symbol}: ${43250.1:.4f}")
+            bot.info("📊 %s: price=%.4f signal=%s", symbol, 43250.1, "HOLD")
+        trades.info("CLOSE BTCUSDT LONG qty=0.001 pnl=1.25")
+
+    api = logging.getLogger("BenchAPI")
+    api.setLevel(logging.INFO)
+    api.propagate = False
+    bot = logging.getLogger("BenchBot")
+    bot.setLevel(logging.DEBUG)
+    trades = logging.getLogger("BenchTrades")
+    trades.setLevel(logging.INFO)
+
+    print(f"\n📝 Logging cost per cycle on the calling thread ({len(symbols)} symbols, {args.iterations} cycles)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handlers = build_handlers(tmp_dir)
+        for name, logger_handlers in handlers.items():
+            logger = logging.getLogger(name)
+            logger.propagate = False
+            for handler in logger_handlers:
+                logger.addHandler(handler)
+        sync = measure(lambda: cycle(bot, trades, api, lazy=False), args.iterations)
+        report("sync handlers, eager", sync)
+        for logger_handlers in handlers.values():
+            for handler in logger_handlers:
+                handler.close()
+
+        # Gerçek döngüde 30 sn bekleme var: listener kuyruğu döngüler arasında boşaltır
+        listener = install_queue_logging(build_handlers(tmp_dir))
+        queued = []
+        for i in range(args.iterations + 20):
+            start = time.perf_counter()
+            cycle(bot, trades, api, lazy=True)
+            elapsed = time.perf_counter() - start
+            while not listener.queue.empty():
+                time.sleep(0.0005)
+            if i >= 20:
+                queued.append(elapsed)
+        report("queue listener, lazy", queued)
+        stop_queue_logging(listener)
+        for handler in listener.handlers:
+            handler.close()
+    print(f"  p50 speedup: {percentile(sync, 50) / percentile(queued, 50):.2f}x")
+
+
+BENCHMARKS = {
+    "batch": bench_batch,
+    "coalesce": bench_coalesce,
+    "feed": bench_feed,
+    "hedge": bench_hedge,
+    "indicators": bench_indicators,
+    "json": bench_json,
+    "klines": bench_klines,
+    "logging": bench_logging,
+    "transport": bench_transport,
+    "ws-orders": bench_ws_orders,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GenetiX performance benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    parser.add_argument("--payload-dir", help="Kaydedilmiş payload'lar (json benchmark)")
+    args = parser.parse_args()
+
+    names = sorted(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    for name in names:
+        BENCHMARKS[name](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Geçmiş Kline İndirici
+Backtest ve uzun lookback için mumları yerel önbelleğe indirir
+
+KULLANIM:
+    python download_klines.py --days 90                  # config'deki semboller, 1m
+    python download_klines.py BTCUSDT ETHUSDT --interval 5m --start 2024-01-01
+    python download_klines.py --days 365 --concurrency 16
+
+Önbellekte olan aralıklar tekrar indirilmez; kesilen indirme aynı komutla devam eder.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.binance_futures_api import BinanceFuturesTestnetAPI
+from src.kline_downloader import KlineDownloader
+
+try:
+    from src.async_binance_futures_api import AsyncBinanceFuturesTestnetAPI
+except ImportError:
+    AsyncBinanceFuturesTestnetAPI = None
+
+
+def parse_date(value: str) -> int:
+    """YYYY-MM-DD (UTC) -> ms"""
+    dt = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+async def run(args, config: dict):
+    history = dict(config.get("history", {}))
+    if args.cache_dir:
+        history["cache_dir"] = args.cache_dir
+    if args.concurrency:
+        history["concurrency"] = args.concurrency
+
+    use_async = config.get("network", {}).get("async_client", False) and AsyncBinanceFuturesTestnetAPI is not None
+    api = AsyncBinanceFuturesTestnetAPI(args.config) if use_async else BinanceFuturesTestnetAPI(args.config)
+
+    end_ms = parse_date(args.end) if args.end else None
+    if args.start:
+        start_ms = parse_date(args.start)
+    else:
+        start_ms = int((time.time() - args.days * 86400) * 1000)
+
+    downloader = KlineDownloader.from_config(api, history)
+    started = time.perf_counter()
+    try:
+        downloaded = await downloader.download(args.symbols or config["symbols_to_trade"],
+                                               args.interval, start_ms, end_ms)
+    finally:
+        if use_async:
+            await api.close()
+        else:
+            api.close()
+
+    elapsed = time.perf_counter() - started
+    for symbol, count in downloaded.items():
+        print(f"  {symbol:<10} {count:>9,} candles")
+    stats = downloader.stats
+    print(f"✅ {stats['candles']:,} candles, {stats['pages']} pages in {elapsed:.1f}s "
+          f"-> {downloader.store.root} (failed months: {stats['failed_months']})")
+    return 1 if stats["failed_months"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download historical klines into the local cache")
+    parser.add_argument("symbols", nargs="*", help="Semboller (varsayılan: config symbols_to_trade)")
+    parser.add_argument("--config", default="config/production_config.json")
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--days", type=float, default=30, help="--start yoksa geriye dönük gün sayısı")
+    parser.add_argument("--start", help="YYYY-MM-DD (UTC)")
+    parser.add_argument("--end", help="YYYY-MM-DD (UTC, hariç; varsayılan: şimdi)")
+    parser.add_argument("--cache-dir", help="Varsayılan: config history.cache_dir")
+    parser.add_argument("--concurrency", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    with open(args.config) as f:
+        config = json.load(f)
+    sys.exit(asyncio.run(run(args, config)))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import traceback
+import uuid
 from decimal import Decimal, ROUND_DOWN
+import numpy as np
 from colorama import init, Fore, Back, Style
 from threading import Thread
 from flask import Flask, jsonify, send_file
@@ -76,7 +78,11 @@ def api_stats():
             "positions": len(bot_instance.positions),
             "trades": bot_instance.stats['trades_closed'],
             "win_rate": round(win_rate, 2),
-            "status": "running" if bot_instance.is_running else "stopped"
+            "status": "running" if bot_instance.is_running else "stopped",
+            "request_cache": bot_instance.api.request_cache.stats,
+            "premium_index": bot_instance.api.premium_index.stats,
+            "margin": bot_instance.margin_engine.summary(bot_instance.account_balance),
+            "market_data": bot_instance.market_data_stats()
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -98,8 +104,10 @@ def api_positions():
         positions_list = []
         for symbol, pos in bot_instance.positions.items():
             try:
-                # Anlık fiyatı al
-                current_price = bot_instance.api.get_current_price(symbol)
+                # Anlık fiyatı al (döngünün fiyat snapshot'ından, yoksa API'den)
+                current_price = bot_instance.price_snapshot.get(symbol)
+                if current_price is None:
+                    current_price = bot_instance.api_call_threadsafe(bot_instance.api.get_current_price, symbol)
                 if current_price is None:
                     continue # Fiyat alınamazsa pozisyonu atla
 
@@ -114,6 +122,10 @@ def api_positions():
                     pnl = (entry_price - current_price) * quantity
                 
                 pnl_percent = (pnl / (entry_price * quantity)) * 100 if entry_price > 0 else 0
+                
+                # Margin engine'den (mark price tick'leriyle güncel, istek yok)
+                margin = bot_instance.margin_engine.positions.get(symbol, {})
+                liquidation_price = bot_instance.margin_engine.liquidation_price(symbol, bot_instance.account_balance)
 
                 positions_list.append({
                     "symbol": symbol,
@@ -121,7 +133,9 @@ def api_positions():
                     "entry_price": entry_price,
                     "current_price": current_price,
                     "quantity": quantity,
-                    "leverage": pos.get('leverage', 5),
+                    "leverage": margin.get('leverage', pos.get('leverage', 5)),
+                    "liquidation_price": round(liquidation_price, 4) if liquidation_price else None,
+                    "maint_margin": round(margin.get('maint_margin', 0.0), 2),
                     "pnl": round(pnl, 2),
                     "pnl_percent": round(pnl_percent, 2),
                     "duration": (datetime.now() - pos.get('entry_time', datetime.now())).total_seconds()
@@ -161,6 +175,27 @@ def api_activity():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/funding')
+def api_funding():
+    """Get funding rate and mark price for traded symbols"""
+    if not bot_instance:
+        return jsonify({"error": "Bot not initialized"}), 503
+    
+    try:
+        # markPrice stream canlıyken istek atılmaz; eksik semboller tek toplu istekle gelir
+        rates = bot_instance.api_call_threadsafe(bot_instance.api.get_funding_rates, bot_instance.symbols)
+        funding = [{
+            "symbol": symbol,
+            "funding_rate": entry['funding_rate'],
+            "mark_price": entry['mark_price'],
+            "next_funding_time": entry['next_funding_time']
+        } for symbol, entry in sorted(rates.items())]
+        
+        return jsonify({"funding": funding})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 def start_dashboard_server(port=8080):
     """Start Flask dashboard server in background thread"""
     def run_server():
@@ -193,6 +228,29 @@ except ImportError:
     print(f"{Fore.YELLOW}Lütfen src/ klasörünün mevcut olduğundan emin olun.{Style.RESET_ALL}")
     sys.exit(1)
 
+from src.market_data import MarketDataEngine
+from src.user_data_stream import UserDataStream
+from src.log_pipeline import install_queue_logging
+from src.kline_store import KlineStore
+from src.kline_sync import KlineSync
+from src.margin_engine import MarginEngine
+from src.indicators import SymbolIndicators
+from src.price_history import PriceRingBuffer
+
+# Asenkron client opsiyonel (aiohttp gerekli)
+try:
+    from src.async_binance_futures_api import AsyncBinanceFuturesTestnetAPI
+except ImportError:
+    AsyncBinanceFuturesTestnetAPI = None
+
+# Bot emirlerinin newClientOrderId öneki (user data stream'de dış emirlerden ayırmak için)
+BOT_ORDER_PREFIX = "gx2_"
+# Borsa tarafı çıkış emirleri: dolum nedeni clientOrderId'den okunur
+EXIT_ORDER_PREFIXES = {
+    'STOP_LOSS': f"{BOT_ORDER_PREFIX}sl_",
+    'TAKE_PROFIT': f"{BOT_ORDER_PREFIX}tp_",
+}
+
 
 class ColoredFormatter(logging.Formatter):
     """Colored console logging"""
@@ -206,6 +264,8 @@ class ColoredFormatter(logging.Formatter):
     }
     
     def format(self, record):
+        # Kopya üzerinde renklendir: aynı kayıt dosya handler'larına da gider
+        record = logging.makeLogRecord(record.__dict__)
         color = self.COLORS.get(record.levelname, Fore.WHITE)
         record.levelname = f"{color}{record.levelname:8}{Style.RESET_ALL}"
         return super().format(record)
@@ -214,10 +274,15 @@ class ColoredFormatter(logging.Formatter):
 class MTFTradingStrategy:
     """Multi-Timeframe Validated Strategy"""
     
+    MAX_HISTORY = 500  # Sembol başına tutulan veri
+    
     def __init__(self, config: Dict):
         self.config = config
         self.strategy_params = config['validated_strategy']['parameters']
-        self.price_history = {symbol: [] for symbol in config['symbols_to_trade']}
+        # Sembol başına kolonlu ring buffer (price / volume / timestamp)
+        self.price_history: Dict[str, PriceRingBuffer] = {
+            symbol: PriceRingBuffer(self.MAX_HISTORY) for symbol in config['symbols_to_trade']
+        }
         
         # İndikatör parametreleri
         self.sma_short = int(self.strategy_params['sma_short'])
@@ -232,60 +297,80 @@ class MTFTradingStrategy:
         self.volume_threshold = self.strategy_params['volume_threshold']
         self.trend_strength = self.strategy_params['trend_strength']
         self.confluence_weight = self.strategy_params['confluence_weight']
+        self.rsi_period = 14
         
-    def update_price(self, symbol: str, price: float, volume: float = None):
-        """Fiyat verisini güncelle"""
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
+        # Sembol başına streaming indikatörler: fiyat başına O(1) güncellenir,
+        # generate_signal pencereyi yeniden taramaz
+        self.indicators: Dict[str, SymbolIndicators] = {}
         
-        self.price_history[symbol].append({
-            'price': price,
-            'volume': volume or 0,
-            'timestamp': datetime.now()
-        })
+    def history(self, symbol: str) -> PriceRingBuffer:
+        """Sembolün fiyat geçmişi (yoksa oluşturulur)"""
+        history = self.price_history.get(symbol)
+        if history is None:
+            history = self.price_history[symbol] = PriceRingBuffer(self.MAX_HISTORY)
+        return history
+    
+    def symbol_indicators(self, symbol: str) -> SymbolIndicators:
+        """Sembolün streaming indikatörleri (yoksa mevcut geçmişten kurulur)"""
+        indicators = self.indicators.get(symbol)
+        if indicators is None:
+            indicators = self.indicators[symbol] = SymbolIndicators(
+                (self.sma_short, self.sma_long), self.rsi_period, self.bb_period, self.bb_std
+            )
+            history = self.price_history.get(symbol)
+            if history is not None and len(history):
+                indicators.extend(history.prices())
+        return indicators
+    
+    def update_price(self, symbol: str, price: float, volume: float = None):
+        """Fiyat verisini güncelle (son MAX_HISTORY değer tutulur)"""
+        self.symbol_indicators(symbol).update(price)
+        self.history(symbol).append(price, volume or 0, time.time())
+    
+    def load_history(self, symbol: str, klines: np.ndarray):
+        """
+        Kline dizisini (KLINE_DTYPE) toplu olarak fiyat geçmişine ekle
         
-        # Son 500 veriyi tut
-        if len(self.price_history[symbol]) > 500:
-            self.price_history[symbol] = self.price_history[symbol][-500:]
+        Warmup / backtest için update_price döngüsü yerine: kolonlar tek vektörel
+        yazmayla eklenir ve yalnızca tutulacak son MAX_HISTORY mum işlenir.
+        """
+        tail = klines[-self.MAX_HISTORY:]
+        self.symbol_indicators(symbol).extend(tail['close'])
+        self.history(symbol).extend(tail['close'], tail['volume'], tail['close_time'] / 1000)
     
     def calculate_sma(self, symbol: str, period: int) -> Optional[float]:
-        """SMA hesapla"""
+        """SMA hesapla (takip edilen periyotlar streaming, diğerleri pencereden)"""
+        sma = self.symbol_indicators(symbol).sma.get(period)
+        if sma is not None:
+            return sma.value
         try:
             if symbol not in self.price_history or len(self.price_history[symbol]) < period:
                 return None
             
-            prices = [p['price'] for p in self.price_history[symbol][-period:]]
+            prices = self.price_history[symbol].prices(period)
             if len(prices) < period:
                 return None
                 
-            return sum(prices) / period
+            return float(prices.sum()) / period
         except (KeyError, IndexError, ZeroDivisionError):
             return None
     
     def calculate_rsi(self, symbol: str, period: int = 14) -> Optional[float]:
-        """RSI hesapla"""
+        """RSI hesapla (strateji periyodu streaming, diğerleri pencereden)"""
+        if period == self.rsi_period:
+            return self.symbol_indicators(symbol).rsi.value
         try:
             if symbol not in self.price_history or len(self.price_history[symbol]) < period + 1:
                 return None
             
-            prices = [p['price'] for p in self.price_history[symbol][-(period+1):]]
+            prices = self.price_history[symbol].prices(period + 1)
             if len(prices) < period + 1:
                 return None
             
-            gains = []
-            losses = []
-            
-            for i in range(1, len(prices)):
-                change = prices[i] - prices[i-1]
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-            
-            avg_gain = sum(gains) / period
-            avg_loss = sum(losses) / period
+            changes = prices[1:] - prices[:-1]
+            gains = np.maximum(changes, 0.0)
+            avg_gain = float(gains.sum()) / period
+            avg_loss = float((gains - changes).sum()) / period
             
             if avg_loss == 0:
                 return 100
@@ -298,26 +383,8 @@ class MTFTradingStrategy:
             return None
     
     def calculate_bollinger_bands(self, symbol: str) -> Optional[Tuple[float, float, float]]:
-        """Bollinger Bands hesapla"""
-        try:
-            if symbol not in self.price_history or len(self.price_history[symbol]) < self.bb_period:
-                return None
-            
-            prices = [p['price'] for p in self.price_history[symbol][-self.bb_period:]]
-            if len(prices) < self.bb_period:
-                return None
-            
-            sma = sum(prices) / self.bb_period
-            
-            variance = sum([(p - sma) ** 2 for p in prices]) / self.bb_period
-            std = variance ** 0.5
-            
-            upper = sma + (std * self.bb_std)
-            lower = sma - (std * self.bb_std)
-            
-            return upper, sma, lower
-        except (KeyError, IndexError, ZeroDivisionError):
-            return None
+        """Bollinger Bands (upper, middle, lower)"""
+        return self.symbol_indicators(symbol).bollinger.value
     
     def generate_signal(self, symbol: str, current_price: float) -> Dict:
         """Trading sinyali üret"""
@@ -436,16 +503,44 @@ class ProductionTradingBot:
         # Config yükle
         self.load_config()
         
-        # API
+        # API (network.async_client: aiohttp tabanlı client, yoksa senkron client)
         self.logger.info(f"🔌 Binance Futures Testnet API bağlanıyor...")
-        self.api = BinanceFuturesTestnetAPI(str(self.config_path))
+        use_async = self.config.get('network', {}).get('async_client', False)
+        if use_async and AsyncBinanceFuturesTestnetAPI is None:
+            self.logger.warning("⚠️  aiohttp bulunamadı, senkron API client kullanılıyor")
+            use_async = False
+        if use_async:
+            self.api = AsyncBinanceFuturesTestnetAPI(str(self.config_path))
+        else:
+            self.api = BinanceFuturesTestnetAPI(str(self.config_path))
+        self.api_is_async = use_async
+        self.loop = None  # initialize() içinde set edilir
+        self.background_tasks: set = set()
+        self.order_lock = asyncio.Lock()  # Eşzamanlı sembollerde risk kontrolü + emir atomik
+        
+        # Toplu emir: döngüdeki giriş sinyalleri biriktirilip /v1/batchOrders ile gönderilir
+        self.batch_orders = self.config['trading_config'].get('batch_orders', False)
+        self.order_intents: List[Tuple[str, Dict, float]] = []  # [(symbol, signal, price)]
+        
+        # Borsa tarafı SL/TP: girişte STOP_MARKET + TAKE_PROFIT_MARKET reduce-only emirleri
+        self.exit_orders_enabled = self.config['trading_config'].get('exit_orders', False)
         
         # Strategy
         self.logger.info(f"🧬 MTF Validated Strategy yükleniyor...")
         self.strategy = MTFTradingStrategy(self.config)
         
+        # Warmup mumları: disk önbelleği + yalnızca son kapanan mumdan sonrası REST'ten
+        history_config = self.config.get('history', {})
+        self.kline_sync = KlineSync(
+            self.api,
+            KlineStore(history_config.get('cache_dir', 'data/klines')),
+            window=history_config.get('sync_window', 500)
+        )
+        
         # Bot state
         self.positions = {}  # {symbol: position_data}
+        # Pozisyonların margin / likidasyon durumu (mark price tick'leriyle güncel)
+        self.margin_engine = MarginEngine()
         self.trade_history = []
         self.account_balance = 0.0
         self.initial_balance = 0.0
@@ -454,6 +549,21 @@ class ProductionTradingBot:
         self.symbols = self.config['symbols_to_trade']
         self.portfolio_weights = self.config['portfolio_weights']
         
+        # Döngü başına tek istekle alınan fiyatlar {symbol: price}
+        self.price_snapshot: Dict[str, float] = {}
+        self.price_snapshot_time = 0.0
+        
+        # WebSocket market data (push) - yalnızca loop thread'inde güncellenir
+        self.market_data: Optional[MarketDataEngine] = None
+        self.live_prices: Dict[str, float] = {}
+        # Backfill süren semboller: {symbol: {'pending': n, 'rows': {open_time: (close, volume)}}}
+        # Canlı kapanışlar backfill bitene kadar bekletilir, sonra open_time sırasıyla eklenir
+        self.kline_backfills: Dict[str, Dict] = {}
+        
+        # User data stream (emir dolumu / bakiye / pozisyon push) - loop thread'inde uygulanır
+        self.user_stream: Optional[UserDataStream] = None
+        self.external_fill_pnl: Dict[int, float] = {}  # {order_id: birikmiş realized pnl}
+        
         # Statistics
         self.stats = {
             'trades_opened': 0,
@@ -507,6 +617,31 @@ class ProductionTradingBot:
 
 
     
+    async def api_call(self, func, *args, **kwargs):
+        """
+        API metodunu event loop'u bloklamadan çağır
+        
+        Asenkron client'ta doğrudan await edilir; senkron client'ta çağrı
+        thread pool'a verilir, böylece semboller eşzamanlı işlenebilir.
+        """
+        if self.api_is_async:
+            return await func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    def api_call_threadsafe(self, func, *args, **kwargs):
+        """Loop dışındaki thread'lerden (Flask dashboard) API çağrısı"""
+        if self.api_is_async:
+            future = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), self.loop)
+            return future.result(timeout=15)
+        return func(*args, **kwargs)
+    
+    def spawn_background(self, coro) -> asyncio.Task:
+        """Arka plan task'ı başlat (shutdown'da iptal edilir)"""
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+    
     def print_banner(self):
         """Başlangıç banner'ı"""
         if not self.background:
@@ -529,6 +664,9 @@ class ProductionTradingBot:
         - Main log: All logs, rotates daily, keeps 30 days
         - Trade log: Trade-specific logs, rotates at 10MB
         - Error log: ERROR+ only
+        
+        Handler'lar QueueListener thread'inde çalışır: dosya yazma ve
+        rotation trading loop'unu bloklamaz.
         """
         # Log directory
         log_dir = PROJECT_ROOT / "logs" / "production"
@@ -542,7 +680,7 @@ class ProductionTradingBot:
         # Root logger
         self.logger = logging.getLogger('ProductionBot')
         self.logger.setLevel(logging.DEBUG)
-        self.logger.handlers.clear()  # Clear existing handlers
+        bot_handlers = []
         
         # Console handler (colored)
         if not self.background:
@@ -553,7 +691,7 @@ class ProductionTradingBot:
                 datefmt='%H:%M:%S'
             )
             console.setFormatter(console_fmt)
-            self.logger.addHandler(console)
+            bot_handlers.append(console)
         
         # Main file handler (time-based rotation: daily, keeps 30 days)
         main_handler = TimedRotatingFileHandler(
@@ -569,7 +707,7 @@ class ProductionTradingBot:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         main_handler.setFormatter(main_fmt)
-        self.logger.addHandler(main_handler)
+        bot_handlers.append(main_handler)
         
         # Error handler (size-based rotation: 50MB, keeps 5 files)
         error_handler = RotatingFileHandler(
@@ -580,12 +718,11 @@ class ProductionTradingBot:
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(main_fmt)
-        self.logger.addHandler(error_handler)
+        bot_handlers.append(error_handler)
         
         # Trade logger (size-based rotation: 10MB, keeps 10 files)
         self.trade_logger = logging.getLogger('Trades')
         self.trade_logger.setLevel(logging.INFO)
-        self.trade_logger.handlers.clear()
         trade_handler = RotatingFileHandler(
             trade_log,
             maxBytes=10 * 1024 * 1024,  # 10MB
@@ -593,7 +730,14 @@ class ProductionTradingBot:
             encoding='utf-8'
         )
         trade_handler.setFormatter(main_fmt)
-        self.trade_logger.addHandler(trade_handler)
+        
+        # Tüm handler'lar tek arka plan thread'inde (log çağrısı yalnızca kuyruğa yazar)
+        # Root: API client ve diğer src.* logger'ları da aynı kuyruktan bot log'larına
+        self.log_listener = install_queue_logging({
+            'ProductionBot': bot_handlers,
+            'Trades': [trade_handler],
+            '': bot_handlers,
+        })
         
         self.logger.info("="*80)
         self.logger.info("🚀 GenetiX Production Bot Starting...")
@@ -627,6 +771,7 @@ class ProductionTradingBot:
         """Bot başlat (gelişmiş hata yönetimi ile)"""
         global bot_instance
         bot_instance = self  # Global instance için
+        self.loop = asyncio.get_running_loop()
         
         try:
             self.logger.info("🔧 Initializing bot...")
@@ -634,7 +779,7 @@ class ProductionTradingBot:
             # API Health Check - Binance'e erişim var mı?
             self.logger.info("🔍 Checking Binance API connection...")
             try:
-                server_time = self.api.get_server_time()
+                server_time = await self.api_call(self.api.get_server_time)
                 if server_time:
                     from datetime import datetime
                     server_dt = datetime.fromtimestamp(server_time / 1000)
@@ -649,6 +794,16 @@ class ProductionTradingBot:
                 self.logger.error("  3. API credentials in config")
                 raise NetworkError(f"Cannot connect to Binance API: {e}")
             
+            # Kalıcı WebSocket emir bağlantısı (bağlanana kadar emirler REST ile gider)
+            if self.api.start_ws_orders():
+                self.logger.info("⚡ WebSocket order entry enabled (REST fallback)")
+            
+            # Döngüler arası boşta bağlantıyı sıcak tut (async: loop task'ı, sync: thread)
+            if self.api.start_keepalive():
+                transport = ("aiohttp (HTTP/1.1)" if self.api_is_async
+                             else f"{self.api.transport.name} ({self.api.transport.protocol})")
+                self.logger.info(f"🔌 HTTP transport: {transport}, keep-warm enabled")
+            
             # Dashboard server başlat
             dashboard_port = self.config.get('dashboard', {}).get('port', 8080)
             try:
@@ -660,15 +815,15 @@ class ProductionTradingBot:
             
             # Hesap bakiyesi (retry ile)
             max_retries = 3
+            snapshot = None
             for attempt in range(max_retries):
                 try:
-                    balances = self.api.get_balance()
-                    for bal in balances:
-                        if bal['asset'] == 'USDT':
-                            self.account_balance = float(bal['walletBalance'])
-                            self.initial_balance = self.account_balance
-                            self.daily_start_balance = self.account_balance
-                            break
+                    snapshot = await self.refresh_account_snapshot()
+                    usdt_balance = snapshot.wallet_balance('USDT')
+                    if usdt_balance is not None:
+                        self.account_balance = usdt_balance
+                        self.initial_balance = self.account_balance
+                        self.daily_start_balance = self.account_balance
                     self.logger.info(f"💰 Account Balance: ${self.account_balance:,.2f} USDT")
                     break
                     
@@ -686,12 +841,34 @@ class ProductionTradingBot:
             if self.dry_run:
                 self.logger.warning(f"{Fore.YELLOW}⚠️  DRY RUN MODE - No real orders!{Style.RESET_ALL}")
             
-            # Açık pozisyonları yükle
-            await self.load_positions()
+            # Exchange metadata (step size, tick size, minNotional) - bir kez indir
+            try:
+                await self.api_call(self.api.refresh_exchange_info)
+            except BinanceAPIError as e:
+                self.logger.warning(f"⚠️  Exchange info unavailable, using config precision: {e}")
+            self.spawn_background(self.exchange_info_refresh_loop())
+            
+            # Açık pozisyonları yükle (aynı snapshot'tan)
+            await self.load_positions(snapshot)
+            
+            # Leverage / margin tipi bir kez: giriş emri yolunda ayar isteği kalmaz
+            if not self.dry_run:
+                await self.reconcile_symbol_settings()
+            
+            # Leverage bracket'leri (maintenance margin kademeleri) - bir kez indir
+            await self.load_leverage_brackets()
+            
+            # Emir dolumları ve pozisyon değişiklikleri push ile (REST polling yerine)
+            if self.config.get('user_data', {}).get('enabled', False):
+                await self.start_user_stream()
             
             # İlk fiyat verilerini topla
             await self.collect_initial_data()
             
+            # Push tabanlı market data (strateji kline kapanışlarıyla beslenir)
+            if self.config.get('market_data', {}).get('enabled', False):
+                self.start_market_data()
+            
             self.is_running = True
             self.logger.info(f"{Fore.GREEN}✅ Bot initialized successfully!{Style.RESET_ALL}")
             
@@ -711,11 +888,17 @@ class ProductionTradingBot:
             self.logger.error(traceback.format_exc())
             raise
     
-    async def load_positions(self):
+    async def refresh_account_snapshot(self):
+        """Hesap + pozisyon snapshot'ını tek istekle yenile"""
+        return await self.api_call(self.api.get_account_snapshot)
+    
+    async def load_positions(self, snapshot=None):
         """Açık pozisyonları yükle"""
         try:
+            if snapshot is None:
+                snapshot = await self.refresh_account_snapshot()
             for symbol in self.symbols:
-                pos = self.api.get_position(symbol)
+                pos = snapshot.get_position(symbol)
                 if pos and float(pos.get('positionAmt', 0)) != 0:
                     amt = float(pos['positionAmt'])
                     self.positions[symbol] = {
@@ -725,46 +908,417 @@ class ProductionTradingBot:
                         'unrealized_pnl': float(pos['unRealizedProfit']),
                         'entry_time': datetime.now()  # Gerçek time bilinmiyor
                     }
+                    self.update_margin_position(symbol)
                     self.logger.info(f"📍 Position loaded: {symbol} {self.positions[symbol]['side']}")
         except Exception as e:
             self.logger.warning(f"⚠️  Position load error: {e}")
+        
+        if self.exit_orders_enabled and self.positions and not self.dry_run:
+            await self.restore_exit_orders()
+    
+    async def reconcile_symbol_settings(self):
+        """Tüm semboller için leverage / margin tipini config'e getir (yalnızca farklı olanlar)"""
+        trading_config = self.config['trading_config']
+        leverage = trading_config['leverage']
+        margin_type = trading_config.get('margin_type')
+        
+        async def reconcile(symbol: str) -> int:
+            changed = 0
+            # Margin tipi açık pozisyonda değiştirilemez; leverage ayrı denenir
+            if margin_type:
+                try:
+                    changed += await self.api_call(self.api.ensure_margin_type, symbol, margin_type)
+                except BinanceAPIError as e:
+                    self.logger.warning(f"⚠️  {symbol} margin type not set to {margin_type}: {e}")
+            try:
+                changed += await self.api_call(self.api.ensure_leverage, symbol, leverage)
+            except BinanceAPIError as e:
+                self.logger.warning(f"⚠️  {symbol} leverage not set to {leverage}x: {e}")
+            return changed
+        
+        results = await asyncio.gather(*(reconcile(symbol) for symbol in self.symbols))
+        updated = sum(1 for changed in results if changed)
+        self.logger.info(f"⚙️  Symbol settings: {leverage}x {margin_type or ''}, "
+                         f"{updated} updated, {len(results) - updated} already set")
+    
+    async def restore_exit_orders(self):
+        """Restart sonrası: açık SL/TP emirlerini pozisyonlara bağla, eksikleri gönder"""
+        try:
+            open_orders = await self.api_call(self.api.get_open_orders)
+        except BinanceAPIError as e:
+            self.logger.warning(f"⚠️  Open orders unavailable, exit orders not restored: {e}")
+            return
+        
+        for order in open_orders:
+            reason = self.exit_order_reason(order.get('clientOrderId', ''))
+            pos = self.positions.get(order.get('symbol'))
+            if reason is None or pos is None:
+                continue
+            pos.setdefault('exit_orders', {})[reason] = {
+                'order_id': order['orderId'],
+                'client_order_id': order['clientOrderId'],
+                'stop_price': float(order['stopPrice'])
+            }
+            self.logger.info(f"🔗 {order['symbol']} {reason} order restored @ ${float(order['stopPrice']):,.4f}")
+        
+        missing = [symbol for symbol, pos in self.positions.items() if not pos.get('exit_orders')]
+        if missing:
+            await self.attach_exit_orders(missing)
+    
+    async def exchange_info_refresh_loop(self):
+        """exchangeInfo önbelleğini TTL dolmadan arka planda yenile"""
+        while not self.shutdown_requested:
+            await asyncio.sleep(self.api.exchange_info.ttl * 0.9)
+            try:
+                await self.api_call(self.api.refresh_exchange_info)
+            except Exception as e:
+                self.logger.warning(f"⚠️  Exchange info refresh failed: {e}")
+            await self.load_leverage_brackets()
+    
+    async def load_leverage_brackets(self):
+        """Tüm semboller için leverage bracket'lerini tek istekle al"""
+        try:
+            self.margin_engine.load_brackets(await self.api_call(self.api.get_leverage_brackets))
+            self.logger.info(f"📐 Leverage brackets loaded for {len(self.margin_engine.brackets)} symbols")
+        except Exception as e:
+            self.logger.warning(f"⚠️  Leverage brackets unavailable, using default margin ratio: {e}")
+    
+    def update_margin_position(self, symbol: str):
+        """self.positions'taki değişikliği margin engine'e yansıt"""
+        pos = self.positions.get(symbol)
+        if pos is None:
+            self.margin_engine.remove_position(symbol)
+            return
+        leverage = self.api.symbol_settings.leverage.get(symbol, self.config['trading_config']['leverage'])
+        mark = self.api.premium_index.entries.get(symbol)
+        self.margin_engine.update_position(symbol, pos['size'], pos['entry_price'], leverage,
+                                           mark['mark_price'] if mark else None)
+    
+    def start_market_data(self):
+        """Combined ticker/kline/markPrice stream'ini başlat"""
+        md_config = self.config.get('market_data', {})
+        self.market_data = MarketDataEngine(
+            ws_url=self.api.ws_url,
+            symbols=self.symbols,
+            loop=self.loop,
+            on_event=self.on_market_event,
+            on_gap=self.on_market_gap,
+            kline_interval=md_config.get('kline_interval', '1m'),
+            conflate=md_config.get('conflate', True),
+            logger=self.logger
+        )
+        self.market_data.start()
+    
+    def market_data_stats(self) -> Dict:
+        """Stream sayaçları ve birleştirme tamponunun gecikme / drop sayaçları"""
+        if self.market_data is None:
+            return {}
+        stats = dict(self.market_data.stats)
+        if self.market_data.buffer is not None:
+            stats["buffer"] = dict(self.market_data.buffer.stats)
+        return stats
+    
+    @property
+    def market_data_live(self) -> bool:
+        """Stream bağlı ve güncel mi (değilse REST polling'e dönülür)"""
+        if self.market_data is None:
+            return False
+        max_silence = self.config.get('market_data', {}).get('max_silence', 30)
+        return self.market_data.is_healthy(max_silence)
+    
+    def on_market_event(self, event: Dict):
+        """Stream event'i (loop thread'inde çalışır)"""
+        symbol = event['symbol']
+        if event['type'] == 'ticker':
+            self.live_prices[symbol] = event['price']
+        elif event['type'] == 'kline':
+            if not event['closed']:
+                return
+            backfill = self.kline_backfills.get(symbol)
+            if backfill is not None:
+                backfill['rows'][event['open_time']] = (event['close'], event['volume'])
+            else:
+                self.strategy.update_price(symbol, event['close'], event['volume'])
+        elif event['type'] == 'mark_price':
+            # Funding / mark price okumaları (api.get_funding_rate) istek atmadan buradan karşılanır
+            self.api.premium_index.apply_mark_price(event)
+            self.margin_engine.update_mark(symbol, event['mark_price'])
+    
+    def on_market_gap(self, symbol: str, start_ms: int, end_ms: int):
+        """Kaçırılan kline aralığını REST ile doldur (loop thread'inde çalışır)"""
+        # Gap'ten sonraki canlı kapanışlar backfill'den önce stratejiye eklenmez
+        backfill = self.kline_backfills.setdefault(symbol, {'pending': 0, 'rows': {}})
+        backfill['pending'] += 1
+        self.spawn_background(self.backfill_klines(symbol, start_ms, end_ms))
+    
+    async def backfill_klines(self, symbol: str, start_ms: int, end_ms: int):
+        """Gap aralığındaki kapanmış kline'ları bekletilen canlı kapanışlarla sırayla ekle"""
+        backfill = self.kline_backfills[symbol]
+        try:
+            interval = self.config.get('market_data', {}).get('kline_interval', '1m')
+            klines = await self.api_call(self.api.get_klines_array, symbol, interval, limit=1000,
+                                         start_time=start_ms, end_time=end_ms)
+            # Yalnızca kapanmış mumlar; aynı open_time'lı canlı kapanış varsa o kazanır
+            klines = klines[klines['close_time'] < int(time.time() * 1000)]
+            for open_time, close, volume in zip(klines['open_time'].tolist(), klines['close'].tolist(),
+                                                klines['volume'].tolist()):
+                backfill['rows'].setdefault(open_time, (close, volume))
+            self.logger.info(f"🩹 {symbol}: {len(klines)} missing candles backfilled")
+        except Exception as e:
+            self.logger.error(f"❌ {symbol} backfill error: {e}")
+        finally:
+            backfill['pending'] -= 1
+            if backfill['pending'] == 0:
+                # Son backfill bitti: gap mumları + bekletilen kapanışlar open_time sırasıyla
+                del self.kline_backfills[symbol]
+                rows = backfill['rows']
+                for open_time in sorted(rows):
+                    close, volume = rows[open_time]
+                    self.strategy.update_price(symbol, close, volume)
+    
+    async def start_user_stream(self):
+        """listenKey al, user data stream'i ve keepalive task'ını başlat"""
+        try:
+            listen_key = await self.api_call(self.api.create_listen_key)
+        except BinanceAPIError as e:
+            self.logger.warning(f"⚠️  User data stream unavailable, using REST polling: {e}")
+            return
+        self.user_stream = UserDataStream(
+            ws_url=self.api.ws_url,
+            listen_key=listen_key,
+            loop=self.loop,
+            on_event=self.on_user_event,
+            on_reconnect=self.on_user_stream_reconnect,
+            logger=self.logger
+        )
+        self.user_stream.start()
+        self.spawn_background(self.listen_key_keepalive_loop())
+    
+    @property
+    def user_stream_live(self) -> bool:
+        """User data stream bağlı mı (değilse pozisyonlar REST ile senkronize edilir)"""
+        return self.user_stream is not None and self.user_stream.is_healthy()
+    
+    async def listen_key_keepalive_loop(self):
+        """listenKey'i 60 dakikalık süresi dolmadan uzat"""
+        interval = self.config.get('user_data', {}).get('keepalive_interval', 1800)
+        while not self.shutdown_requested:
+            await asyncio.sleep(interval)
+            try:
+                await self.api_call(self.api.keepalive_listen_key)
+            except BinanceAPIError as e:
+                self.logger.warning(f"⚠️  listenKey keepalive failed, renewing: {e}")
+                await self.renew_listen_key()
+    
+    async def renew_listen_key(self):
+        """Yeni listenKey al ve user data stream'i yeniden bağla"""
+        try:
+            listen_key = await self.api_call(self.api.create_listen_key)
+        except BinanceAPIError as e:
+            self.logger.error(f"❌ listenKey renewal failed: {e}")
+            return
+        await asyncio.to_thread(self.user_stream.set_listen_key, listen_key)
+    
+    def on_user_stream_reconnect(self):
+        """Kopukluk sırasında kaçan event'ler için REST ile bir kez mutabakat"""
+        self.spawn_background(self.reconcile_with_exchange())
+    
+    async def reconcile_with_exchange(self):
+        """Pozisyon ve bakiyeyi tek hesap snapshot'ı ile doğrula"""
+        try:
+            snapshot = await self.refresh_account_snapshot()
+        except Exception as e:
+            self.logger.error(f"❌ Account snapshot error: {e}")
+            return None
+        await self.sync_positions_with_exchange(snapshot)
+        await self.health_check(snapshot)
+        return snapshot
+    
+    def on_user_event(self, event: Dict):
+        """User data event'i (loop thread'inde çalışır)"""
+        if event['type'] == 'account':
+            self.apply_account_update(event)
+        elif event['type'] == 'order':
+            self.apply_order_update(event)
+        elif event['type'] == 'account_config':
+            # Leverage borsada (ör. web arayüzünden) değişti: sonraki girişte yeniden ayarlanır
+            self.api.symbol_settings.leverage[event['symbol']] = event['leverage']
+            self.update_margin_position(event['symbol'])
+        elif event['type'] == 'listen_key_expired':
+            self.logger.warning("⚠️  listenKey expired, renewing...")
+            self.spawn_background(self.renew_listen_key())
+    
+    def apply_account_update(self, event: Dict):
+        """ACCOUNT_UPDATE: bakiye ve pozisyonları borsadaki değerlere çek"""
+        usdt_balance = event['balances'].get('USDT')
+        if usdt_balance is not None:
+            self.account_balance = usdt_balance
+        
+        for update in event['positions']:
+            symbol = update['symbol']
+            if symbol not in self.symbols:
+                continue
+            amount = update['amount']
+            if amount == 0:
+                pos = self.positions.pop(symbol, None)
+                self.update_margin_position(symbol)
+                if pos is not None:
+                    self.logger.info(f"🔄 {symbol} position closed on exchange")
+                    self.cancel_exit_orders_later(symbol, pos)
+                continue
+            
+            # Bot'a ait alanlar (signal, order_id, entry_time) korunur
+            pos = self.positions.get(symbol, {})
+            if not pos:
+                self.logger.info(f"📍 Position update from stream: {symbol} {amount}")
+            self.positions[symbol] = {
+                **pos,
+                'size': amount,
+                'side': 'LONG' if amount > 0 else 'SHORT',
+                'entry_price': update['entry_price'],
+                'unrealized_pnl': update['unrealized_pnl'],
+                'entry_time': pos.get('entry_time', datetime.now())
+            }
+            self.update_margin_position(symbol)
+    
+    def apply_order_update(self, event: Dict):
+        """
+        ORDER_TRADE_UPDATE: bot dışı dolumları (manuel, likidasyon, borsa SL/TP)
+        işlem geçmişine yaz
+        
+        Bot'un kendi emirleri open_position / close_position'da kaydedilir.
+        """
+        if event['execution_type'] != 'TRADE':
+            return
+        exit_reason = self.exit_order_reason(event['client_order_id'])
+        if exit_reason is not None:
+            self.apply_exit_fill(event, exit_reason)
+            return
+        if event['client_order_id'].startswith(BOT_ORDER_PREFIX):
+            return
+        
+        order_id = event['order_id']
+        pnl = self.external_fill_pnl.get(order_id, 0.0) + event['realized_pnl']
+        if event['status'] != 'FILLED':
+            # Kısmi dolum: emir tamamlanınca tek işlem olarak kaydet
+            self.external_fill_pnl[order_id] = pnl
+            return
+        self.external_fill_pnl.pop(order_id, None)
+        
+        symbol = event['symbol']
+        if pnl == 0 and not event['reduce_only']:
+            self.logger.info(f"📍 External order filled: {symbol} {event['side']} {event['filled_qty']} @ ${event['avg_price']:,.2f}")
+            self.trade_history.append({
+                'timestamp': datetime.now().isoformat(),
+                'symbol': symbol,
+                'action': 'OPEN',
+                'side': event['side'],
+                'quantity': event['filled_qty'],
+                'price': event['avg_price'],
+                'reason': 'EXTERNAL',
+                'order_id': order_id
+            })
+            return
+        
+        reason = 'LIQUIDATION' if event['client_order_id'].startswith('autoclose') else 'EXTERNAL'
+        pnl_percent = self.record_closed_trade(symbol, event['side'], event['filled_qty'],
+                                               event['avg_price'], pnl, reason)
+        self.logger.info(f"{'🟢' if pnl > 0 else '🔴'} Position CLOSED: {symbol} | {reason} | P&L: ${pnl:,.2f} ({pnl_percent:+.2f}%)")
+        self.trade_logger.info(f"CLOSE | {symbol} | {reason} | ${pnl:,.2f} | {pnl_percent:+.2f}% | Exit: ${event['avg_price']:.2f}")
+    
+    def apply_exit_fill(self, event: Dict, reason: str):
+        """Borsa tarafı SL/TP dolumu: işlemi kaydet, pozisyonu kapat, kardeş emri iptal et"""
+        order_id = event['order_id']
+        pnl = self.external_fill_pnl.get(order_id, 0.0) + event['realized_pnl']
+        if event['status'] != 'FILLED':
+            self.external_fill_pnl[order_id] = pnl
+            return
+        self.external_fill_pnl.pop(order_id, None)
+        
+        symbol = event['symbol']
+        icon = "🛑" if reason == 'STOP_LOSS' else "🎯"
+        self.logger.info(f"{icon} {reason} triggered on exchange: {symbol} @ ${event['avg_price']:,.2f}")
+        self.log_exit_close(symbol, event['side'], event['filled_qty'], event['avg_price'], pnl, reason)
+        
+        # ACCOUNT_UPDATE pozisyonu önceden kaldırmış olabilir (kardeş emir orada iptal edilir)
+        pos = self.positions.pop(symbol, None)
+        self.update_margin_position(symbol)
+        if pos is not None:
+            self.cancel_exit_orders_later(symbol, pos)
+    
+    def log_exit_close(self, symbol: str, side: str, quantity: float, price: float,
+                       pnl: float, reason: str, entry_price: Optional[float] = None):
+        """Kapanış emrini kaydet ve logla"""
+        pnl_percent = self.record_closed_trade(symbol, side, quantity, price, pnl, reason)
+        icon = "🟢" if pnl > 0 else "🔴"
+        entry = f" | Entry: ${entry_price:.2f}" if entry_price is not None else ""
+        self.logger.info(f"{icon} Position CLOSED: {symbol} | {reason} | P&L: ${pnl:,.2f} ({pnl_percent:+.2f}%)")
+        self.trade_logger.info(f"CLOSE | {symbol} | {reason} | ${pnl:,.2f} | {pnl_percent:+.2f}%{entry} | Exit: ${price:.2f}")
+    
+    def record_closed_trade(self, symbol: str, side: str, quantity: float, price: float,
+                            pnl: float, reason: str) -> float:
+        """Kapanan işlemi istatistiklere ve geçmişe yaz, P&L yüzdesini döndür"""
+        pnl_percent = (pnl / self.account_balance) * 100
+        
+        self.stats['trades_closed'] += 1
+        if pnl > 0:
+            self.stats['wins'] += 1
+            self.stats['consecutive_losses'] = 0
+        else:
+            self.stats['losses'] += 1
+            self.stats['consecutive_losses'] += 1
+        
+        self.trade_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'symbol': symbol,
+            'action': 'CLOSE',
+            'side': side,
+            'quantity': quantity,
+            'price': price,
+            'pnl': pnl,
+            'pnl_percent': pnl_percent,
+            'reason': reason
+        })
+        self.daily_pnl += pnl
+        return pnl_percent
+    
+    @staticmethod
+    def new_client_order_id() -> str:
+        """Bot emirleri için benzersiz newClientOrderId"""
+        return f"{BOT_ORDER_PREFIX}{uuid.uuid4().hex[:24]}"
+    
+    @staticmethod
+    def exit_order_reason(client_order_id: str) -> Optional[str]:
+        """SL/TP emrinin clientOrderId'sinden kapanış nedeni (STOP_LOSS / TAKE_PROFIT)"""
+        for reason, prefix in EXIT_ORDER_PREFIXES.items():
+            if client_order_id.startswith(prefix):
+                return reason
+        return None
     
     async def collect_initial_data(self):
         """İlk market verilerini topla (güvenli veri kontrolü ile)"""
         self.logger.info("📥 Collecting initial market data...")
         
+        interval = self.config.get('market_data', {}).get('kline_interval', '1m')
         for symbol in self.symbols:
             try:
-                # Son 200 candle (1m interval)
-                klines = self.api.get_klines(symbol, '1m', limit=200)
+                # Yalnızca yeni kapanmış mumlar (önbellekteki mumlar diskten okunur)
+                klines = await self.kline_sync.sync(symbol, interval)
                 
-                # GÜÇLENDIRILMIŞ KONTROL: Liste boş mu, geçerli mi?
-                if klines and isinstance(klines, list) and len(klines) > 0:
-                    loaded_count = 0
-                    for kline in klines:
-                        # Her kline'ın en az 6 element olduğundan emin ol
-                        if kline and len(kline) >= 6:
-                            try:
-                                price = float(kline[4])  # Close
-                                volume = float(kline[5])
-                                self.strategy.update_price(symbol, price, volume)
-                                loaded_count += 1
-                            except (ValueError, TypeError, IndexError) as e:
-                                self.logger.warning(f"⚠️  Invalid kline data for {symbol}: {e}")
-                                continue
-                    
-                    if loaded_count > 0:
-                        self.logger.info(f"✅ {symbol}: {loaded_count} candles loaded")
-                    else:
-                        self.logger.warning(f"⚠️  {symbol}: No valid candles found")
+                if len(klines) > 0:
+                    self.strategy.load_history(symbol, klines)
+                    self.logger.info(f"✅ {symbol}: {len(klines)} candles loaded")
                 else:
-                    # Liste boş veya geçersiz
-                    self.logger.warning(f"⚠️  Received empty or invalid candle data for {symbol}. Skipping.")
+                    self.logger.warning(f"⚠️  {symbol}: No new candles. Skipping.")
                 
             except Exception as e:
                 self.logger.error(f"❌ {symbol} data load error: {e}")
                 self.logger.error(traceback.format_exc())
         
+        stats = self.kline_sync.stats
+        self.logger.info(f"📥 Kline sync: {stats['requests']} requests, {stats['rows']} rows fetched, "
+                         f"{stats['cache_rows']} from cache")
+        
         # Biraz bekle
         await asyncio.sleep(2)
     
@@ -775,10 +1329,12 @@ class ProductionTradingBot:
         iteration = 0
         last_save = time.time()
         last_health_check = time.time()
+        last_reconcile = time.time()
         last_status_display = time.time()
         
         save_interval = self.config['monitoring']['save_results_interval']
         health_interval = self.config['monitoring']['health_check_interval']
+        reconcile_interval = self.config.get('user_data', {}).get('reconcile_interval', 1800)
         status_display_interval = 30  # Her 30 saniyede durum göster
         
         while self.is_running and not self.shutdown_requested:
@@ -786,22 +1342,51 @@ class ProductionTradingBot:
                 iteration += 1
                 current_time = time.time()
                 
-                # Tüm sembolleri işle
-                for symbol in self.symbols:
-                    await self.process_symbol(symbol)
+                # Döngü başına retry bütçesini yenile
+                self.api.retry_policy.start_cycle()
+                
+                # Tüm fiyatları tek istekte al
+                await self.refresh_price_snapshot()
+                
+                # Tüm sembolleri eşzamanlı işle (döngü süresi en yavaş sembole eşit)
+                await asyncio.gather(*(self.process_symbol(symbol) for symbol in self.symbols))
+                
+                # Döngüde biriken giriş emirleri (5'lik batch'ler)
+                if self.order_intents:
+                    await self.submit_order_intents()
+                
+                save_due = current_time - last_save >= save_interval
+                health_due = current_time - last_health_check >= health_interval
+                
+                # User data stream canlıyken pozisyon ve bakiye push ile güncel;
+                # REST snapshot yalnızca seyrek mutabakat için alınır
+                stream_live = self.user_stream_live
+                if stream_live:
+                    sync_due = current_time - last_reconcile >= reconcile_interval
+                else:
+                    sync_due = save_due
+                
+                # Sync ve health check aynı hesap snapshot'ını okur (tek istek)
+                snapshot = None
+                if sync_due or (health_due and not stream_live):
+                    try:
+                        snapshot = await self.refresh_account_snapshot()
+                    except Exception as e:
+                        self.logger.error(f"❌ Account snapshot error: {e}")
                 
                 # Periyodik kayıt
-                if current_time - last_save >= save_interval:
+                if save_due:
                     await self.save_results()
                     last_save = current_time
-                
-                 # Pozisyonları Binance ile senkronize et (daha az sıklıkla)
-                if current_time - last_save >= save_interval:
-                    await self.sync_positions_with_exchange()
+                    
+                # Pozisyonları Binance ile senkronize et (daha az sıklıkla)
+                if sync_due and snapshot is not None:
+                    await self.sync_positions_with_exchange(snapshot)
+                    last_reconcile = current_time
                     
                 # Health check
-                if current_time - last_health_check >= health_interval:
-                    await self.health_check()
+                if health_due:
+                    await self.health_check(snapshot)
                     last_health_check = current_time
                 
                 # Status display (console)
@@ -809,6 +1394,9 @@ class ProductionTradingBot:
                     self.display_status()
                     last_status_display = current_time
                 
+                # Döngü süresi (loglama dahil, bekleme hariç)
+                self.logger.debug("⏱️  Cycle %d: %.1f ms", iteration, (time.time() - current_time) * 1000)
+                
                 # 30 saniye bekle
                 await asyncio.sleep(30)
                 
@@ -820,11 +1408,33 @@ class ProductionTradingBot:
         self.logger.info("🛑 Main loop terminating...")
         await self.shutdown()
     
+    async def refresh_price_snapshot(self):
+        """Tüm sembollerin fiyatını tek istekle al (döngü başına bir kez)"""
+        # Stream canlıysa REST isteğine gerek yok
+        if self.market_data_live and all(s in self.live_prices for s in self.symbols):
+            self.price_snapshot = dict(self.live_prices)
+            self.price_snapshot_time = time.time()
+            return
+        
+        prices = await self.api_call(self.api.get_all_prices)
+        if not prices:
+            self.logger.warning("⚠️  Bulk price snapshot failed, falling back to per-symbol prices")
+        # Başarısız snapshot'ta eski fiyatları kullanma
+        self.price_snapshot = prices
+        self.price_snapshot_time = time.time()
+    
+    async def get_cycle_price(self, symbol: str) -> Optional[float]:
+        """Döngünün fiyat snapshot'ından fiyat al, yoksa tekil istek at"""
+        price = self.price_snapshot.get(symbol)
+        if price is None:
+            price = await self.api_call(self.api.get_current_price, symbol)
+        return price
+    
     async def process_symbol(self, symbol: str):
         """Tek symbol için trading logic (güvenli fiyat kontrolü ile)"""
         try:
             # Güncel fiyat al - GÜÇLENDİRİLMİŞ KONTROL
-            current_price = self.api.get_current_price(symbol)
+            current_price = await self.get_cycle_price(symbol)
             
             # Fiyat geçerli mi kontrol et
             if current_price is None:
@@ -835,8 +1445,9 @@ class ProductionTradingBot:
                 self.logger.warning(f"⚠️  {symbol}: Invalid price value ({current_price}), skipping cycle")
                 return
             
-            # Price history'ye ekle
-            self.strategy.update_price(symbol, current_price)
+            # Price history'ye ekle (stream canlıysa strateji kline kapanışlarıyla besleniyor)
+            if not self.market_data_live:
+                self.strategy.update_price(symbol, current_price)
             
             # Yeterli veri var mı kontrol et (minimum 200 data point)
             if symbol not in self.strategy.price_history or len(self.strategy.price_history[symbol]) < 200:
@@ -856,24 +1467,70 @@ class ProductionTradingBot:
             if signal['action'] == 'HOLD':
                 return
             
-            # Risk kontrolü
-            if not self.check_risk_limits():
-                self.logger.warning("⚠️  Risk limits exceeded, no new positions")
-                return
-            
             # Confidence kontrolü
             min_conf = self.config['risk_management']['min_confidence']
             if signal['confidence'] < min_conf:
                 return
             
-            # Pozisyon aç
-            await self.open_position(symbol, signal, current_price)
+            async with self.order_lock:
+                # Risk kontrolü
+                if not self.check_risk_limits():
+                    self.logger.warning("⚠️  Risk limits exceeded, no new positions")
+                    return
+                
+                # Pozisyon aç (batch modunda döngü sonunda diğer emirlerle birlikte)
+                if self.batch_orders:
+                    self.order_intents.append((symbol, signal, current_price))
+                else:
+                    await self.open_position(symbol, signal, current_price)
             
         except Exception as e:
             self.logger.error(f"❌ Process error {symbol}: {e}")
             self.logger.error(traceback.format_exc())
     
-    def calculate_position_size(self, symbol: str, current_price: float) -> float:
+    def round_quantity(self, symbol: str, quantity: float) -> float:
+        """Miktarı exchange step size'a, yoksa config precision'a göre aşağı yuvarla"""
+        if self.api.exchange_info.has_filters(symbol):
+            return self.api.exchange_info.round_quantity(symbol, quantity)
+        
+        precision = self.config['precision'][symbol]['quantity']
+        return float(Decimal(str(quantity)).quantize(
+            Decimal(10) ** -precision,
+            rounding=ROUND_DOWN
+        ))
+    
+    def round_price(self, symbol: str, price: float) -> float:
+        """Fiyatı exchange tick size'a, yoksa config precision'a göre yuvarla"""
+        if self.api.exchange_info.has_filters(symbol):
+            return self.api.exchange_info.round_price(symbol, price)
+        
+        precision = self.config['precision'][symbol]['price']
+        return float(Decimal(str(price)).quantize(
+            Decimal(10) ** -precision,
+            rounding=ROUND_DOWN
+        ))
+    
+    def entry_leverage(self, symbol: str) -> int:
+        """Sembolün borsadaki leverage'ı (bilinmiyorsa config)"""
+        return self.api.symbol_settings.leverage.get(symbol, self.config['trading_config']['leverage'])
+    
+    def max_entry_notional(self, symbol: str, reserved_margin: float = 0.0) -> float:
+        """
+        Yeni pozisyonun en büyük notional'ı: margin kullanım limiti ve bracket kapasitesi
+        
+        Args:
+            reserved_margin: Aynı döngüde daha önce boyutlanan (henüz dolmamış)
+                giriş emirlerinin initial margin'i
+        """
+        leverage = self.entry_leverage(symbol)
+        max_utilization = self.config['risk_management'].get('max_margin_utilization', 0.8)
+        engine = self.margin_engine
+        free_margin = (engine.margin_balance(self.account_balance) * max_utilization
+                       - engine.total_initial_margin - reserved_margin)
+        return min(max(free_margin, 0.0) * leverage, engine.max_notional(symbol, leverage))
+    
+    def calculate_position_size(self, symbol: str, current_price: float,
+                                reserved_margin: float = 0.0) -> float:
         """Portfolio-weighted position size hesapla"""
         # Portfolio weight
         weight = self.portfolio_weights.get(symbol, 0.05)
@@ -884,28 +1541,23 @@ class ProductionTradingBot:
         # Symbol allocation
         symbol_allocation = total_allocation * weight
         
-        # Quantity hesapla
-        quantity = symbol_allocation / current_price
+        # Quantity hesapla (boş margin ve leverage bracket'i ile sınırlı)
+        quantity = min(symbol_allocation, self.max_entry_notional(symbol, reserved_margin)) / current_price
         
-        # Precision'a göre yuvarla
-        precision = self.config['precision'][symbol]['quantity']
-        quantity = float(Decimal(str(quantity)).quantize(
-            Decimal(10) ** -precision,
-            rounding=ROUND_DOWN
-        ))
+        # Step size'a göre yuvarla
+        quantity = self.round_quantity(symbol, quantity)
         
         # Min/max kontrolü
         max_usd = self.config['trading_config']['max_position_usd']
         min_usd = self.config['trading_config']['min_position_usd']
+        exchange_min = self.api.exchange_info.min_notional(symbol)
+        if exchange_min is not None:
+            min_usd = max(min_usd, exchange_min)
         
         position_usd = quantity * current_price
         
         if position_usd > max_usd:
-            quantity = max_usd / current_price
-            quantity = float(Decimal(str(quantity)).quantize(
-                Decimal(10) ** -precision,
-                rounding=ROUND_DOWN
-            ))
+            quantity = self.round_quantity(symbol, max_usd / current_price)
         elif position_usd < min_usd:
             self.logger.warning(f"⚠️  Position too small for {symbol}: ${position_usd:.2f}")
             return 0.0
@@ -914,100 +1566,264 @@ class ProductionTradingBot:
     
     async def open_position(self, symbol: str, signal: Dict, current_price: float):
         """Pozisyon aç (gelişmiş hata yönetimi ile)"""
+        try:
+            intent = await self.prepare_entry(symbol, signal, current_price)
+            if intent is None:
+                return
+            await self.place_entry(intent)
+        except Exception as e:
+            self.logger.error(f"❌ Error opening position {symbol}: {e}")
+            self.logger.error(traceback.format_exc())
+    
+    async def place_entry(self, intent: Dict):
+        """Hazırlanmış giriş emrini gönder, dolunca pozisyonu ve çıkış emirlerini kaydet"""
+        symbol = intent['symbol']
+        # Emir ver (MARKET order) - retry kararı API client'ın RetryPolicy'sinde;
+        # emirler yalnızca sunucuya hiç ulaşmadıysa tekrar gönderilir
+        try:
+            order = await self.api_call(self.api.place_order, **intent['order'])
+            if order:
+                self.record_opened_position(intent, order)
+                await self.attach_exit_orders([symbol])
+        except (InsufficientBalanceError, InvalidOrderError, RateLimitError, NetworkError) as e:
+            self.log_order_error(symbol, e)
+    
+    async def prepare_entry(self, symbol: str, signal: Dict, current_price: float,
+                            reserved_margin: float = 0.0) -> Optional[Dict]:
+        """
+        Giriş emrini hazırla (miktar, leverage)
+        
+        Args:
+            reserved_margin: Aynı batch'te önceki intent'lerin ayırdığı initial margin
+        
+        Returns:
+            {'symbol', 'signal', 'price', 'initial_margin', 'order': place_order argümanları}
+            veya None (miktar sıfır / dry run)
+        """
         side = 'BUY' if signal['action'] == 'BUY' else 'SELL'
         
+        # Position size hesapla
+        quantity = self.calculate_position_size(symbol, current_price, reserved_margin)
+        
+        if quantity == 0:
+            return None
+        
+        if self.dry_run:
+            self.logger.info(f"🧪 DRY RUN: {symbol} {side} {quantity} @ ${current_price:,.2f} (Conf: {signal['confidence']:.1%})")
+            return None
+        
+        # Leverage başlangıçta ayarlandı; önbellekte aynıysa istek atılmaz
         try:
-            # Position size hesapla
-            quantity = self.calculate_position_size(symbol, current_price)
+            leverage = self.config['trading_config']['leverage']
+            await self.api_call(self.api.ensure_leverage, symbol, leverage)
+        except BinanceAPIError as e:
+            # Leverage zaten ayarlanmış olabilir, devam et
+            self.logger.debug(f"Leverage setting info: {e}")
+        
+        return {
+            'symbol': symbol,
+            'signal': signal,
+            'price': current_price,
+            'initial_margin': quantity * current_price / self.entry_leverage(symbol),
+            'order': {
+                'symbol': symbol,
+                'side': side,
+                'order_type': "MARKET",
+                'quantity': quantity,
+                'client_order_id': self.new_client_order_id()
+            }
+        }
+    
+    async def submit_order_intents(self):
+        """Döngüde biriken giriş emirlerini gönder (tek emir: place_order, fazlası: batchOrders)"""
+        pending, self.order_intents = self.order_intents, []
+        try:
+            # Intent'ler sırayla boyutlanır: her biri kendi initial margin'ini ayırır,
+            # batch toplamı max_margin_utilization'ı aşamaz
+            intents = []
+            reserved_margin = 0.0
+            for symbol, signal, price in pending:
+                try:
+                    intent = await self.prepare_entry(symbol, signal, price, reserved_margin)
+                except Exception as e:
+                    self.logger.error(f"❌ Error opening position {symbol}: {e}")
+                    continue
+                if intent is not None:
+                    reserved_margin += intent['initial_margin']
+                    intents.append(intent)
             
-            if quantity == 0:
+            if len(intents) == 1:
+                # Tek emir: hazırlanan intent olduğu gibi (yeniden boyutlanmaz, aynı client id)
+                await self.place_entry(intents[0])
                 return
-            
-            if self.dry_run:
-                self.logger.info(f"🧪 DRY RUN: {symbol} {side} {quantity} @ ${current_price:,.2f} (Conf: {signal['confidence']:.1%})")
+            if not intents:
                 return
             
-            # Leverage ayarla (hata yönetimi ile)
-            try:
-                leverage = self.config['trading_config']['leverage']
-                self.api.set_leverage(symbol, leverage)
-            except BinanceAPIError as e:
-                # Leverage zaten ayarlanmış olabilir, devam et
-                self.logger.debug(f"Leverage setting info: {e}")
+            # Sonuçlar emir sırasıyla döner: emir dict'i veya o sembolün hatası
+            results = await self.api_call(self.api.place_orders_batch, [intent['order'] for intent in intents])
+            opened = []
+            for intent, result in zip(intents, results):
+                if isinstance(result, BinanceAPIError):
+                    self.log_order_error(intent['symbol'], result)
+                elif result:
+                    self.record_opened_position(intent, result)
+                    opened.append(intent['symbol'])
+            await self.attach_exit_orders(opened)
             
-            # Emir ver (MARKET order) - Retry mekanizması ile
-            max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    order = self.api.place_order(
-                        symbol=symbol,
-                        side=side,
-                        order_type="MARKET",
-                        quantity=quantity
-                    )
-                    
-                    if order:
-                        self.positions[symbol] = {
-                            'size': quantity if side == 'BUY' else -quantity,
-                            'side': 'LONG' if side == 'BUY' else 'SHORT',
-                            'entry_price': current_price,
-                            'entry_time': datetime.now(),
-                            'signal': signal,
-                            'order_id': order.get('orderId')
-                        }
-                        
-                        self.stats['trades_opened'] += 1
-                        
-                        self.logger.info(f"{Fore.GREEN}✅ Position OPENED: {symbol} {side} {quantity} @ ${current_price:,.2f}{Style.RESET_ALL}")
-                        self.trade_logger.info(f"OPEN | {symbol} | {side} | {quantity} | ${current_price:,.2f} | Conf: {signal['confidence']:.1%} | Confluence: {signal['confluence']:.2f}")
-                        
-                        self.trade_history.append({
-                            'timestamp': datetime.now().isoformat(),
-                            'symbol': symbol,
-                            'action': 'OPEN',
-                            'side': side,
-                            'quantity': quantity,
-                            'price': current_price,
-                            'confidence': signal['confidence'],
-                            'confluence': signal['confluence'],
-                            'order_id': order.get('orderId')
-                        })
-                        
-                        return
-                    break
-                    
-                except InsufficientBalanceError as e:
-                    self.logger.error(f"❌ Insufficient balance for {symbol}: {e}")
-                    return  # Retry yapma
-                    
-                except InvalidOrderError as e:
-                    self.logger.error(f"❌ Invalid order for {symbol}: {e}")
-                    return  # Retry yapma
-                    
-                except RateLimitError as e:
-                    if attempt < max_retries - 1:
-                        self.logger.warning(f"⚠️  Rate limit, waiting 10s...")
-                        await asyncio.sleep(10)
-                    else:
-                        self.logger.error(f"❌ Rate limit exceeded for {symbol}")
-                        return
-                        
-                except NetworkError as e:
-                    if attempt < max_retries - 1:
-                        self.logger.warning(f"⚠️  Network error, retrying...")
-                        await asyncio.sleep(3)
-                    else:
-                        self.logger.error(f"❌ Network error opening position: {e}")
-                        return
-                        
         except Exception as e:
-            self.logger.error(f"❌ Error opening position {symbol}: {e}")
+            self.logger.error(f"❌ Batch order error: {e}")
             self.logger.error(traceback.format_exc())
     
+    def record_opened_position(self, intent: Dict, order: Dict):
+        """Dolan giriş emrini pozisyon, istatistik ve trade geçmişine yaz"""
+        symbol = intent['symbol']
+        signal = intent['signal']
+        current_price = intent['price']
+        side = intent['order']['side']
+        quantity = intent['order']['quantity']
+        
+        # Gerçek dolum fiyatı: yanıttaki avgPrice, yoksa user stream'in yazdığı giriş fiyatı
+        entry_price = (float(order.get('avgPrice') or 0)
+                       or self.positions.get(symbol, {}).get('entry_price')
+                       or current_price)
+        self.positions[symbol] = {
+            'size': quantity if side == 'BUY' else -quantity,
+            'side': 'LONG' if side == 'BUY' else 'SHORT',
+            'entry_price': entry_price,
+            'entry_time': datetime.now(),
+            'signal': signal,
+            'order_id': order.get('orderId')
+        }
+        self.update_margin_position(symbol)
+        
+        self.stats['trades_opened'] += 1
+        
+        self.logger.info(f"{Fore.GREEN}✅ Position OPENED: {symbol} {side} {quantity} @ ${current_price:,.2f}{Style.RESET_ALL}")
+        self.trade_logger.info(f"OPEN | {symbol} | {side} | {quantity} | ${current_price:,.2f} | Conf: {signal['confidence']:.1%} | Confluence: {signal['confluence']:.2f}")
+        
+        self.trade_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'symbol': symbol,
+            'action': 'OPEN',
+            'side': side,
+            'quantity': quantity,
+            'price': current_price,
+            'confidence': signal['confidence'],
+            'confluence': signal['confluence'],
+            'order_id': order.get('orderId')
+        })
+    
+    def log_order_error(self, symbol: str, error: Exception):
+        """Giriş emri hatasını tipine göre logla"""
+        if isinstance(error, InsufficientBalanceError):
+            self.logger.error(f"❌ Insufficient balance for {symbol}: {error}")
+        elif isinstance(error, InvalidOrderError):
+            self.logger.error(f"❌ Invalid order for {symbol}: {error}")
+        elif isinstance(error, RateLimitError):
+            self.logger.error(f"❌ Rate limit exceeded for {symbol}: {error}")
+        elif isinstance(error, NetworkError):
+            self.logger.error(f"❌ Network error opening position {symbol}: {error}")
+        else:
+            self.logger.error(f"❌ Error opening position {symbol}: {error}")
+    
+    def build_exit_orders(self, symbol: str) -> List[Dict]:
+        """Pozisyon için STOP_MARKET + TAKE_PROFIT_MARKET reduce-only emirleri"""
+        pos = self.positions[symbol]
+        entry_price = pos['entry_price']
+        direction = 1 if pos['side'] == 'LONG' else -1
+        sl_percent = self.config['trading_config']['stop_loss_percent']
+        tp_percent = self.config['trading_config']['take_profit_percent']
+        stop_prices = {
+            'STOP_LOSS': entry_price * (1 - direction * sl_percent / 100),
+            'TAKE_PROFIT': entry_price * (1 + direction * tp_percent / 100),
+        }
+        order_types = {'STOP_LOSS': "STOP_MARKET", 'TAKE_PROFIT': "TAKE_PROFIT_MARKET"}
+        
+        return [{
+            'symbol': symbol,
+            'side': 'SELL' if direction == 1 else 'BUY',
+            'order_type': order_types[reason],
+            'quantity': abs(pos['size']),
+            'stop_price': self.round_price(symbol, stop_price),
+            'reduce_only': True,
+            'client_order_id': f"{EXIT_ORDER_PREFIXES[reason]}{uuid.uuid4().hex[:24]}"
+        } for reason, stop_price in stop_prices.items()]
+    
+    async def attach_exit_orders(self, symbols: List[str]):
+        """
+        Yeni pozisyonlara borsa tarafı SL/TP emirleri ekle (tek batchOrders isteği)
+        
+        Gönderilemeyen emirde o pozisyon döngüdeki SL/TP kontrolüyle yönetilir.
+        """
+        if not self.exit_orders_enabled or not symbols:
+            return
+        try:
+            orders = [order for symbol in symbols if symbol in self.positions
+                      for order in self.build_exit_orders(symbol)]
+            results = await self.api_call(self.api.place_orders_batch, orders)
+        except Exception as e:
+            self.logger.error(f"❌ Exit orders not placed for {', '.join(symbols)}: {e}")
+            return
+        
+        for order, result in zip(orders, results):
+            symbol = order['symbol']
+            reason = self.exit_order_reason(order['client_order_id'])
+            if isinstance(result, BinanceAPIError):
+                self.logger.warning(f"⚠️  {symbol} {reason} order rejected, polling fallback: {result}")
+                continue
+            pos = self.positions.get(symbol)
+            if pos is None:
+                # Pozisyon emir yoldayken kapandı: açıkta kalan emri temizle
+                self.spawn_background(self.cancel_exit_orders(symbol, {reason: {
+                    'order_id': result['orderId'], 'client_order_id': order['client_order_id']}}))
+                continue
+            pos.setdefault('exit_orders', {})[reason] = {
+                'order_id': result['orderId'],
+                'client_order_id': order['client_order_id'],
+                'stop_price': order['stop_price']
+            }
+            self.logger.debug("🛡️  %s %s order @ %s", symbol, reason, order['stop_price'])
+    
+    async def cancel_exit_orders(self, symbol: str,
+                                 exit_orders: Dict[str, Dict]) -> Optional[Tuple[str, Dict]]:
+        """
+        SL/TP emirlerini iptal et
+        
+        Returns:
+            İptal edilemeyen emir borsada dolmuşsa (reason, order), yoksa None
+        """
+        async def cancel(reason: str, info: Dict) -> Optional[Tuple[str, Dict]]:
+            try:
+                await self.api_call(self.api.cancel_order, symbol, info['order_id'])
+                return None
+            except BinanceAPIError as e:
+                # Emir tetiklenmiş olabilir: durumunu sorgula
+                try:
+                    order = await self.api_call(self.api.get_order, symbol, order_id=info['order_id'])
+                except BinanceAPIError:
+                    self.logger.warning(f"⚠️  {symbol} {reason} order cancel failed: {e}")
+                    return None
+                if order.get('status') == 'FILLED':
+                    return reason, order
+                return None
+        
+        results = await asyncio.gather(*(cancel(reason, info) for reason, info in exit_orders.items()))
+        return next((result for result in results if result is not None), None)
+    
+    def cancel_exit_orders_later(self, symbol: str, pos: Dict):
+        """Kapanan pozisyonun kalan SL/TP emirlerini arka planda iptal et"""
+        exit_orders = pos.pop('exit_orders', None)
+        if exit_orders and not self.dry_run:
+            self.spawn_background(self.cancel_exit_orders(symbol, exit_orders))
+    
     async def manage_position(self, symbol: str, current_price: float):
         """Pozisyon yönetimi (SL/TP)"""
         try:
             pos = self.positions[symbol]
+            
+            # SL/TP borsada bekliyor ve dolumu user stream bildiriyor: polling gerekmez
+            if len(pos.get('exit_orders', {})) == len(EXIT_ORDER_PREFIXES) and self.user_stream_live:
+                return
             entry_price = pos['entry_price']
             side = pos['side']
             
@@ -1045,15 +1861,26 @@ class ProductionTradingBot:
             if self.dry_run:
                 self.logger.info(f"🧪 DRY RUN: CLOSE {symbol} {side} {quantity} @ ${current_price:,.2f}")
                 del self.positions[symbol]
+                self.update_margin_position(symbol)
                 return
             
+            # Önce borsadaki SL/TP emirleri; biri zaten dolduysa market emri gönderilmez
+            exit_orders = pos.pop('exit_orders', None)
+            if exit_orders:
+                filled = await self.cancel_exit_orders(symbol, exit_orders)
+                if filled is not None:
+                    self.apply_exit_order_status(symbol, pos, *filled)
+                    return
+            
             # Emir ver (MARKET order - pozisyon kapatma)
-            order = self.api.place_order(
+            order = await self.api_call(
+                self.api.place_order,
                 symbol=symbol,
                 side=side,
                 order_type="MARKET",
                 quantity=quantity,
-                reduce_only=True
+                reduce_only=True,
+                client_order_id=self.new_client_order_id()
             )
             
             if order:
@@ -1063,45 +1890,45 @@ class ProductionTradingBot:
                 else:
                     pnl = (pos['entry_price'] - current_price) * quantity
                 
-                pnl_percent = (pnl / self.account_balance) * 100
-                
-                # İstatistik
-                self.stats['trades_closed'] += 1
-                if pnl > 0:
-                    self.stats['wins'] += 1
-                    self.stats['consecutive_losses'] = 0
-                    icon = "🟢"
-                else:
-                    self.stats['losses'] += 1
-                    self.stats['consecutive_losses'] += 1
-                    icon = "🔴"
-                
-                self.logger.info(f"{icon} Position CLOSED: {symbol} | {reason} | P&L: ${pnl:,.2f} ({pnl_percent:+.2f}%)")
-                self.trade_logger.info(f"CLOSE | {symbol} | {reason} | ${pnl:,.2f} | {pnl_percent:+.2f}% | Entry: ${pos['entry_price']:.2f} | Exit: ${current_price:.2f}")
-                
-                self.trade_history.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'symbol': symbol,
-                    'action': 'CLOSE',
-                    'side': side,
-                    'quantity': quantity,
-                    'price': current_price,
-                    'pnl': pnl,
-                    'pnl_percent': pnl_percent,
-                    'reason': reason
-                })
+                self.log_exit_close(symbol, side, quantity, current_price, pnl, reason, pos['entry_price'])
                 
-                del self.positions[symbol]
-                self.account_balance += pnl
-                self.daily_pnl += pnl
+                # User data stream pozisyonu önceden kaldırmış olabilir
+                self.positions.pop(symbol, None)
+                self.update_margin_position(symbol)
+                if not self.user_stream_live:
+                    # Stream canlıyken bakiye ACCOUNT_UPDATE'ten gelir
+                    self.account_balance += pnl
                 
         except Exception as e:
             self.logger.error(f"❌ Close position error {symbol}: {e}")
     
+    def apply_exit_order_status(self, symbol: str, pos: Dict, reason: str, order: Dict):
+        """Kapanışta dolmuş bulunan SL/TP emrini (GET /v1/order yanıtı) kaydet"""
+        removed = self.positions.pop(symbol, None)
+        self.update_margin_position(symbol)
+        if removed is None or self.user_stream_live:
+            # Dolum ORDER_TRADE_UPDATE ile kaydedildi / kaydedilecek
+            return
+        price = float(order.get('avgPrice') or 0) or float(order['stopPrice'])
+        quantity = float(order.get('executedQty') or 0) or abs(pos['size'])
+        if pos['side'] == 'LONG':
+            pnl = (price - pos['entry_price']) * quantity
+        else:
+            pnl = (pos['entry_price'] - price) * quantity
+        self.log_exit_close(symbol, order['side'], quantity, price, pnl, reason, pos['entry_price'])
+        self.account_balance += pnl
+    
     def check_risk_limits(self) -> bool:
         """Risk limitleri kontrol"""
-        # Max pozisyon sayısı
-        if len(self.positions) >= self.config['trading_config']['max_positions']:
+        # Max pozisyon sayısı (döngüde gönderilmeyi bekleyen girişler dahil)
+        if len(self.positions) + len(self.order_intents) >= self.config['trading_config']['max_positions']:
+            return False
+        
+        # Maintenance margin oranı (mark price tick'leriyle güncel, istek yok)
+        max_margin_ratio = self.config['risk_management'].get('max_margin_ratio', 0.5)
+        margin_ratio = self.margin_engine.margin_ratio(self.account_balance)
+        if margin_ratio >= max_margin_ratio:
+            self.logger.error(f"🚨 Margin ratio limit hit: {margin_ratio:.1%}")
             return False
         
         # Günlük kayıp limiti (USD)
@@ -1184,34 +2011,37 @@ class ProductionTradingBot:
         except Exception as e:
             self.logger.error(f"❌ Save results error: {e}")
     
-    async def health_check(self):
+    async def health_check(self, snapshot=None):
         """Health check"""
         try:
+            # User data stream bağlıysa bakiye zaten güncel
+            if snapshot is None and self.user_stream_live:
+                self.logger.debug(f"💚 Health check OK (user stream) | Balance: ${self.account_balance:,.2f}")
+                return
+            
             # API connectivity
-            balances = self.api.get_balance()
-            if not balances:
+            if snapshot is None:
+                snapshot = await self.refresh_account_snapshot()
+            if not snapshot.balances:
                 self.logger.error("🚨 API connection lost!")
                 return
             
             # Bakiye güncelle
-            for bal in balances:
-                if bal['asset'] == 'USDT':
-                    self.account_balance = float(bal['walletBalance'])
-                    break
+            usdt_balance = snapshot.wallet_balance('USDT')
+            if usdt_balance is not None:
+                self.account_balance = usdt_balance
             
             self.logger.debug(f"💚 Health check OK | Balance: ${self.account_balance:,.2f}")
             
         except Exception as e:
             self.logger.error(f"❌ Health check failed: {e}")
     
-    async def sync_positions_with_exchange(self):
+    async def sync_positions_with_exchange(self, snapshot=None):
         try:
-            # Binance'den gerçek açık pozisyonları al
-            actual_positions = {}
-            for symbol in self.symbols:
-                pos_data = self.api.get_position(symbol)
-                if pos_data and float(pos_data.get('positionAmt', 0)) != 0:
-                    actual_positions[symbol] = pos_data
+            # Binance'den gerçek açık pozisyonları al (tek snapshot)
+            if snapshot is None:
+                snapshot = await self.refresh_account_snapshot()
+            actual_positions = snapshot.open_positions()
             # Botun hafızasındaki pozisyonları kontrol et
             symbols_to_remove = []
             for symbol, bot_pos in self.positions.items():
@@ -1221,7 +2051,8 @@ class ProductionTradingBot:
                     symbols_to_remove.append(symbol)
             # Hafızadan gereksiz pozisyonları sil
             for symbol in symbols_to_remove:
-                del self.positions[symbol]
+                self.cancel_exit_orders_later(symbol, self.positions.pop(symbol))
+                self.update_margin_position(symbol)
         except Exception as e:
             self.logger.error(f"❌ Pozisyon senkronizasyon hatası: {e}")
 
@@ -1229,6 +2060,25 @@ class ProductionTradingBot:
         """Graceful shutdown"""
         self.logger.info("🛑 Shutting down...")
         
+        for task in list(self.background_tasks):
+            task.cancel()
+        self.background_tasks.clear()
+        
+        if self.market_data is not None:
+            await asyncio.to_thread(self.market_data.stop)
+            self.logger.info(f"📡 Market data: {self.market_data_stats()}")
+            self.market_data = None
+        
+        await asyncio.to_thread(self.api.stop_ws_orders)
+        
+        if self.user_stream is not None:
+            await asyncio.to_thread(self.user_stream.stop)
+            self.user_stream = None
+            try:
+                await self.api_call(self.api.close_listen_key)
+            except Exception as e:
+                self.logger.debug(f"listenKey close error: {e}")
+        
         try:
             # Son sonuçları kaydet
             await self.save_results()
@@ -1239,6 +2089,14 @@ class ProductionTradingBot:
             self.logger.info(f"💰 Final Balance: ${self.account_balance:,.2f}")
             self.logger.info(f"📊 Total P&L: ${final_pnl:+,.2f} ({final_pnl_percent:+.2f}%)")
             self.logger.info(f"📍 Open Positions: {len(self.positions)}")
+            self.logger.info(f"📦 Request cache: {self.api.request_cache.stats}")
+            
+            if self.api_is_async:
+                self.logger.info(f"🔌 HTTP connections: {self.api.http_stats}")
+                await self.api.close()
+            else:
+                self.logger.info(f"🔌 HTTP connections: {self.api.transport.stats}")
+                await asyncio.to_thread(self.api.close)
             self.logger.info("✅ Shutdown complete")
             
         except Exception as e:
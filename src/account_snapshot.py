@@ -0,0 +1,55 @@
+"""
+Account Snapshot
+Tek /v2/account isteğinden bakiye ve pozisyonları sembol bazlı indeksler
+
+health_check, pozisyon senkronizasyonu ve pozisyon yükleme aynı snapshot'ı
+okur; böylece bir döngüde hesap verisi için tek istek atılır.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+
+class AccountSnapshot:
+    """Değişmez hesap/pozisyon snapshot'ı"""
+
+    def __init__(self, account: Dict, fetched_at: Optional[float] = None):
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.account = account
+        self.balances: Dict[str, Dict] = {
+            asset["asset"]: asset for asset in account.get("assets", [])
+        }
+        self.positions: Dict[str, Dict] = {}
+        for pos in account.get("positions", []):
+            # /v2/account "unrealizedProfit", /v2/positionRisk "unRealizedProfit" kullanır
+            if "unRealizedProfit" not in pos and "unrealizedProfit" in pos:
+                pos = dict(pos, unRealizedProfit=pos["unrealizedProfit"])
+            self.positions[pos["symbol"]] = pos
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def assets(self) -> List[Dict]:
+        """get_balance() ile aynı formatta bakiye listesi"""
+        return list(self.balances.values())
+
+    def wallet_balance(self, asset: str = "USDT") -> Optional[float]:
+        balance = self.balances.get(asset)
+        if balance is None:
+            return None
+        return float(balance["walletBalance"])
+
+    def get_position(self, symbol: str) -> Optional[Dict]:
+        """Sembolün açık pozisyonu (positionAmt != 0), yoksa None"""
+        pos = self.positions.get(symbol)
+        if pos and float(pos.get("positionAmt", 0)) != 0:
+            return pos
+        return None
+
+    def open_positions(self) -> Dict[str, Dict]:
+        return {
+            symbol: pos for symbol, pos in self.positions.items()
+            if float(pos.get("positionAmt", 0)) != 0
+        }
@@ -0,0 +1,683 @@
+"""
+Binance Futures Testnet Asenkron API Client
+BinanceFuturesTestnetAPI ile aynı metodlar ve exception tipleri, aiohttp üzerinde
+
+FEATURES:
+- Event loop'u bloklamayan istekler (asyncio.sleep ile backoff)
+- Tek bir pooled aiohttp.ClientSession (keep-alive bağlantılar, network.http.pool_maxsize)
+- Keep-warm: bağlantı keepalive_interval boşta kalırsa warm_connections kadar
+  eşzamanlı /v1/ping (senkron client'ın thread'i yerine loop task'ı)
+- aiohttp yalnızca HTTP/1.1 destekler: network.http.transport / http2 yalnızca
+  senkron client'ta geçerlidir
+- Senkron client ile ortak rate limit, imzalama ve parse mantığı
+- asyncio.gather ile eşzamanlı istekler: döngü süresi en yavaş isteğe eşit
+- Hedge'li GET'lerde kaybeden istek iptal edilir (bağlantı havuza döner)
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError as e:
+    print(f"Required packages not installed: {e}")
+    print("Please run: pip install aiohttp")
+    raise
+
+from .exchange_info import ExchangeInfoCache
+from .account_snapshot import AccountSnapshot
+from .kline_store import KLINE_DTYPE
+from .premium_index import PremiumIndexSnapshot
+from .binance_futures_api import (
+    BinanceFuturesClientBase,
+    BinanceAPIError,
+    NetworkError,
+    InvalidOrderError,
+    CircuitOpenError,
+)
+
+
+class AsyncBinanceFuturesTestnetAPI(BinanceFuturesClientBase):
+    """Binance Futures Testnet asenkron API client (aiohttp)"""
+
+    # Connection pool
+    POOL_SIZE = 20
+    KEEPALIVE_TIMEOUT = 60
+    REQUEST_TIMEOUT = 10
+
+    def __init__(self, config_path: str = "config/testnet_config.json"):
+        super().__init__(config_path)
+        # Session event loop içinde oluşturulmalı, ilk istekte açılır
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # Pool boyutu ve keep-warm (HTTP/2 seçenekleri yok sayılır)
+        self.http_config = self.config.get("network", {}).get("http", {})
+        self.last_used = time.time()
+        self.http_stats = {"requests": 0, "warm_pings": 0}
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled session'ı (gerekirse) oluştur"""
+        if self.session is None or self.session.closed:
+            pool_size = self.http_config.get("pool_maxsize", self.POOL_SIZE)
+            connector = aiohttp.TCPConnector(
+                limit=pool_size,
+                limit_per_host=pool_size,
+                # Keep-warm ping'leri arasında bağlantı kapanmasın
+                keepalive_timeout=max(self.KEEPALIVE_TIMEOUT,
+                                      2 * self.http_config.get("keepalive_interval", 0))
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-MBX-APIKEY": self.api_key},
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+            )
+        return self.session
+
+    async def close(self):
+        """Keep-warm task'ını durdur, HTTP session'ı kapat"""
+        self.stop_keepalive()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def start_keepalive(self) -> bool:
+        """
+        Bağlantı boşta keepalive_interval'ı aşarsa /v1/ping gönder (loop içinde çağrılır)
+
+        Döngüler arası beklemede havuzdaki bağlantılar soğumaz; warm_connections
+        kadar eşzamanlı ping ile o kadar bağlantı sıcak tutulur.
+        """
+        interval = self.http_config.get("keepalive_interval", 0)
+        if not interval or (self._keepalive_task is not None and not self._keepalive_task.done()):
+            return False
+        self._keepalive_task = asyncio.ensure_future(self._keepalive_loop(interval))
+        return True
+
+    def stop_keepalive(self):
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    async def _keepalive_loop(self, interval: float):
+        url = f"{self.base_url}/v1/ping"
+        connections = self.http_config.get("warm_connections", 1)
+
+        async def ping():
+            # Ping rate limit payından düşer; limit yakınsa atlanır
+            if not self.rate_limiter.try_acquire(1):
+                return
+            self.http_stats["warm_pings"] += 1
+            self.last_used = time.time()
+            try:
+                session = await self._get_session()
+                async with session.get(url, timeout=aiohttp.ClientTimeout(
+                        total=self.latency.max_timeout)) as response:
+                    await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.debug("Keepalive ping failed: %s", e)
+
+        while True:
+            idle = time.time() - self.last_used
+            if idle < interval:
+                wait = interval - idle
+            else:
+                await asyncio.gather(*(ping() for _ in range(connections)))
+                wait = interval
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _check_rate_limit(self, weight: int = 1, orders: int = 0):
+        """Rate limit kontrolü ve bekleme (loop'u bloklamaz)"""
+        waited = await self.rate_limiter.acquire_async(weight, orders)
+        if waited > 0:
+            self.logger.warning(f"⚠️ Rate limit yaklaşıldı, {waited:.1f}s beklendi")
+
+    async def _request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                       signed: bool = False, weight: Optional[int] = None,
+                       orders: Optional[int] = None) -> Union[Dict, List]:
+        """
+        API isteği gönder (BinanceFuturesTestnetAPI._request ile aynı sözleşme)
+
+        Raises:
+            RateLimitError: Rate limit aşıldı
+            NetworkError: Ağ bağlantı hatası (CircuitOpenError dahil)
+            InvalidOrderError: Geçersiz emir parametreleri
+            BinanceAPIError: Diğer API hataları
+        """
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+
+        # GET: önbellekteki yanıt (weight harcanmaz) veya uçuştaki aynı isteğin sonucu
+        if method == "GET" and self.request_cache.enabled:
+            return await self.request_cache.fetch_async(
+                endpoint, params,
+                lambda: self._request_network(method, endpoint, params, signed, weight, orders)
+            )
+        return await self._request_network(method, endpoint, params, signed, weight, orders)
+
+    async def _request_network(self, method: str, endpoint: str, params: Optional[Dict],
+                               signed: bool, weight: Optional[int],
+                               orders: Optional[int]) -> Union[Dict, List]:
+        """İsteği rate limit, circuit breaker ve retry ile ağa gönder"""
+        breaker = self._open_breaker(endpoint)
+
+        # İstek maliyeti (her denemede yeniden düşülür)
+        weight, orders = self._request_cost(method, endpoint, params, weight, orders)
+        session = await self._get_session()
+
+        for attempt in range(self.retry_policy.max_attempts):
+            # Her deneme borsada ayrıca sayılır: weight deneme başına alınır
+            await self._check_rate_limit(weight, orders)
+            # Her denemede yeniden imzala: retry'da timestamp recvWindow dışına düşmez (-1021).
+            # İmzalanan query string olduğu gibi gönderilir (yarl tekrar encode etmez)
+            query = self._prepare_query(params, signed)
+            url = URL(f"{self.base_url}{endpoint}?{query}" if query else f"{self.base_url}{endpoint}",
+                      encoded=True)
+            request_sent = True
+            retry_after = None
+            try:
+                # HTTP request (adaptif timeout, uygunsa hedge'li)
+                hedge_delay = self.latency.hedge_delay(method, endpoint)
+                if hedge_delay is None:
+                    status, headers, body = await self._send(session, method, endpoint, url)
+                else:
+                    status, headers, body = await self._send_hedged(
+                        session, method, endpoint, url, weight, hedge_delay
+                    )
+                self.rate_limiter.sync_from_headers(headers)
+                if status < 400:
+                    breaker.record_success()
+                    return self.json_loads(body) if body else None
+
+                # HTTP hata kodlarını ayıkla
+                try:
+                    error_data = self.json_loads(body) if body else {}
+                except ValueError:
+                    error_data = {}
+                if not isinstance(error_data, dict):
+                    error_data = {}
+                try:
+                    error, retry_after = self._classify_http_error(status, headers, error_data)
+                except BinanceAPIError:
+                    breaker.record_success()  # Endpoint ayakta, istek hatalı
+                    raise
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    request_sent = False  # 429: istek işlenmedi
+
+            except asyncio.TimeoutError as e:
+                # Timeout - istek işlenmiş olabilir
+                breaker.record_failure()
+                error = NetworkError(f"Timeout: {e}")
+
+            except aiohttp.ClientConnectorError as e:
+                # Bağlantı kurulamadı - istek sunucuya ulaşmadı
+                breaker.record_failure()
+                request_sent = False
+                error = NetworkError(f"Connection error: {e}")
+
+            except aiohttp.ClientConnectionError as e:
+                # Bağlantı istek sırasında koptu
+                breaker.record_failure()
+                error = NetworkError(f"Connection error: {e}")
+
+            except aiohttp.ClientError as e:
+                # Diğer request hataları - retry yapma
+                breaker.record_failure()
+                self.logger.error(f"❌ Request failed: {e}")
+                raise BinanceAPIError(str(e))
+
+            finally:
+                # Sonuç kaydedilmeden çıkış (429, beklenmeyen hata, iptal): deneme hakkı bırakılır
+                breaker.release()
+
+            if breaker.state == breaker.OPEN:
+                # Breaker bu istek sırasında açıldı: kalan denemeler gönderilmez
+                raise error
+            delay = self._retry_delay(method, endpoint, attempt, error, request_sent, retry_after)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+
+        # Tüm denemeler başarısız
+        raise BinanceAPIError("Request failed after all retries")
+
+    async def _send(self, session: aiohttp.ClientSession, method: str, endpoint: str,
+                    url: URL) -> Tuple[int, Mapping[str, str], bytes]:
+        """Tek HTTP isteği: (status, headers, body); adaptif timeout, süresi kaydedilir"""
+        timeout = self.latency.timeout_for(method, endpoint)
+        self.http_stats["requests"] += 1
+        self.last_used = time.time()
+        start = time.perf_counter()
+        try:
+            async with session.request(method, url,
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                try:
+                    body = await response.read()
+                except aiohttp.ClientPayloadError:
+                    if response.status < 400:
+                        raise
+                    body = b""
+                result = response.status, response.headers, body
+        except asyncio.TimeoutError:
+            self.latency.record_timeout(method, endpoint, timeout)
+            raise
+        except asyncio.CancelledError:
+            # Hedge'i kaybeden istek: geçen süre alt sınır olarak kaydedilir
+            self.latency.record(method, endpoint, time.perf_counter() - start)
+            raise
+        self.latency.record(method, endpoint, time.perf_counter() - start)
+        return result
+
+    async def _send_hedged(self, session: aiohttp.ClientSession, method: str, endpoint: str,
+                           url: URL, weight: int, hedge_delay: float):
+        """
+        Idempotent GET: hedge_delay içinde yanıt yoksa ikinci istek gönder
+
+        İlk başarılı yanıt döner, diğer istek iptal edilir; ikisi de hata
+        verirse ilk isteğin hatası.
+        """
+        primary = asyncio.ensure_future(self._send(session, method, endpoint, url))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            if done or not self._acquire_hedge(weight):
+                return await primary
+
+            self.logger.debug("Hedging %s %s after %.0f ms", method, endpoint, hedge_delay * 1000)
+            hedge = asyncio.ensure_future(self._send(session, method, endpoint, url))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.latency.stats["hedge_wins"] += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def get_server_time(self) -> int:
+        """Server zamanını al"""
+        response = await self._request("GET", "/v1/time")
+        if isinstance(response, dict):
+            return response["serverTime"]
+        raise ValueError("Invalid response format")
+
+    async def get_account_info(self) -> Dict:
+        """Futures hesap bilgilerini al"""
+        return self._expect_dict(await self._request("GET", "/v2/account", signed=True))
+
+    async def get_balance(self) -> List[Dict]:
+        """Hesap bakiyelerini al"""
+        account = await self.get_account_info()
+        return account.get("assets", [])
+
+    async def get_positions(self) -> List[Dict]:
+        """Açık pozisyonları al"""
+        return self._expect_list(await self._request("GET", "/v2/positionRisk", signed=True))
+
+    async def get_account_snapshot(self, max_age: float = 0) -> AccountSnapshot:
+        """
+        Hesap + pozisyon snapshot'ı al (tek istek)
+
+        Args:
+            max_age: Bu süreden (saniye) yeni snapshot varsa istek atılmaz
+        """
+        snapshot = self._fresh_account_snapshot(max_age)
+        if snapshot is None:
+            snapshot = self._store_account_snapshot(AccountSnapshot(await self.get_account_info()))
+        return snapshot
+
+    async def get_exchange_info(self) -> Dict:
+        """Exchange bilgilerini al (ham yanıt, önbelleksiz)"""
+        return self._expect_dict(await self._request("GET", "/v1/exchangeInfo"))
+
+    async def refresh_exchange_info(self) -> ExchangeInfoCache:
+        """exchangeInfo'yu indir ve önbelleği yenile"""
+        payload = await self.get_exchange_info()
+        self.exchange_info.update(payload)
+        self.rate_limiter.update_limits(payload.get("rateLimits", []))
+        self.logger.info(f"📚 Exchange info cached: {len(self.exchange_info.symbols)} symbols")
+        return self.exchange_info
+
+    async def get_symbol_info(self, symbol: str) -> Dict:
+        """Sembol bilgilerini al (önbellekten, TTL dolduysa yenile)"""
+        if self.exchange_info.is_stale():
+            await self.refresh_exchange_info()
+        return self.exchange_info.get(symbol)
+
+    async def get_ticker_price(self, symbol: str) -> Optional[float]:
+        """
+        Anlık fiyat al
+
+        Returns:
+            float: Geçerli fiyat
+            None: Hata durumunda veya geçersiz veri
+        """
+        try:
+            response = await self._request("GET", "/v1/ticker/price", {"symbol": symbol})
+        except Exception as e:
+            self.logger.error(f"❌ Unexpected error getting price for {symbol}: {e}")
+            return None
+        return self._parse_ticker_price(symbol, response)
+
+    async def get_all_prices(self) -> Dict[str, float]:
+        """
+        Tüm sembollerin anlık fiyatını tek istekte al
+
+        Returns:
+            Dict[str, float]: {symbol: price}, hata durumunda {}
+        """
+        try:
+            response = await self._request("GET", "/v1/ticker/price")
+        except Exception as e:
+            self.logger.error(f"❌ Error getting bulk prices: {e}")
+            return {}
+        return self._parse_all_prices(response)
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 100,
+                         start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[List]:
+        """
+        Kline/Candlestick verisi al
+
+        Returns:
+            List[List]: Kline verisi (her kline en az 6 element içerir)
+            []: Hata durumunda veya boş veri
+        """
+        try:
+            params = {
+                "symbol": symbol,
+                "interval": interval,
+                "limit": limit
+            }
+            if start_time is not None:
+                params["startTime"] = start_time
+            if end_time is not None:
+                params["endTime"] = end_time
+            response = await self._request("GET", "/v1/klines", params)
+            return self._parse_klines(symbol, response)
+        except Exception as e:
+            self.logger.error(f"❌ Error getting klines for {symbol}: {e}")
+            return []
+
+    async def get_klines_array(self, symbol: str, interval: str, limit: int = 100,
+                               start_time: Optional[int] = None, end_time: Optional[int] = None) -> np.ndarray:
+        """Kline verisi, kolonlu NumPy dizisi olarak (hata durumunda boş dizi)"""
+        try:
+            params = {
+                "symbol": symbol,
+                "interval": interval,
+                "limit": limit
+            }
+            if start_time is not None:
+                params["startTime"] = start_time
+            if end_time is not None:
+                params["endTime"] = end_time
+            response = await self._request("GET", "/v1/klines", params)
+            return self._parse_klines_array(symbol, response)
+        except Exception as e:
+            self.logger.error(f"❌ Error getting klines for {symbol}: {e}")
+            return np.empty(0, dtype=KLINE_DTYPE)
+
+    async def get_klines_page(self, symbol: str, interval: str, start_time: int, end_time: int,
+                              limit: int = 1000) -> List[List]:
+        """[start_time, end_time] aralığındaki kline sayfası (hata yutulmaz)"""
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_time,
+            "endTime": end_time,
+            "limit": limit
+        }
+        return self._expect_list(await self._request("GET", "/v1/klines", params))
+
+    async def get_leverage_brackets(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Notional kademeleri (maintMarginRatio, cum); symbol yoksa tüm semboller"""
+        params = {"symbol": symbol} if symbol else None
+        response = await self._request("GET", "/v1/leverageBracket", params, signed=True)
+        return [response] if isinstance(response, dict) else self._expect_list(response)
+
+    async def set_leverage(self, symbol: str, leverage: int) -> Dict:
+        """Leverage ayarla"""
+        params = {
+            "symbol": symbol,
+            "leverage": leverage
+        }
+        result = self._expect_dict(await self._request("POST", "/v1/leverage", params, signed=True))
+        self.symbol_settings.leverage[symbol] = int(result.get("leverage", leverage))
+        return result
+
+    async def set_margin_type(self, symbol: str, margin_type: str) -> Dict:
+        """Margin tipini ayarla (ISOLATED veya CROSSED)"""
+        params = {
+            "symbol": symbol,
+            "marginType": margin_type
+        }
+        try:
+            result = self._expect_dict(await self._request("POST", "/v1/marginType", params, signed=True))
+        except BinanceAPIError as e:
+            if not self._margin_type_unchanged(e):
+                raise
+            result = {"code": -4046, "msg": str(e)}
+        self.symbol_settings.margin_type[symbol] = self.symbol_settings.normalize_margin_type(margin_type)
+        return result
+
+    async def ensure_leverage(self, symbol: str, leverage: int) -> bool:
+        """
+        Leverage farklıysa ayarla (önbellekte aynıysa istek atılmaz)
+
+        Returns:
+            True: POST /v1/leverage gönderildi
+        """
+        if not self.symbol_settings.needs_leverage(symbol, leverage):
+            return False
+        await self.set_leverage(symbol, leverage)
+        return True
+
+    async def ensure_margin_type(self, symbol: str, margin_type: str) -> bool:
+        """Margin tipi farklıysa ayarla (True: istek gönderildi)"""
+        if not self.symbol_settings.needs_margin_type(symbol, margin_type):
+            return False
+        await self.set_margin_type(symbol, margin_type)
+        return True
+
+    async def place_order(self, symbol: str, side: str, order_type: str,
+                          quantity: float, price: Optional[float] = None,
+                          stop_price: Optional[float] = None, reduce_only: bool = False,
+                          client_order_id: Optional[str] = None) -> Dict:
+        """Futures emri ver"""
+        params = self._build_order_params(symbol, side, order_type, quantity,
+                                          price, stop_price, reduce_only, client_order_id)
+        if self.ws_orders is not None:
+            order = await self._place_order_ws(params)
+            if order is not None:
+                return order
+        return self._expect_dict(await self._request("POST", "/v1/order", params, signed=True))
+
+    async def _place_order_ws(self, params: Dict) -> Optional[Dict]:
+        """
+        Emri kalıcı WebSocket bağlantısından gönder
+
+        Returns:
+            Emir dict'i; None ise emir borsaya ulaşmadı ve REST ile gönderilmeli
+        """
+        await self._check_rate_limit(0, 1)
+        try:
+            future = self.ws_orders.submit("order.place", self._ws_order_params(params))
+        except ConnectionError:
+            self.ws_orders.stats["fallbacks"] += 1
+            return None
+
+        try:
+            response = await asyncio.wait_for(asyncio.wrap_future(future), self.ws_orders.timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            # İstek gitti ama yanıt yok: emir açılmış olabilir, tekrar göndermeden önce sorgula.
+            # Future iptal edilir (bekleyen istek kaydı silinir; geç yanıt yok sayılır)
+            future.cancel()
+            self.ws_orders.stats["unanswered"] += 1
+            return await self._recover_ws_order(params)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        order = self._ws_order_result(response)
+        return order if order is not None else await self._recover_ws_order(params)
+
+    async def place_orders_batch(self, orders: List[Dict]) -> List[Union[Dict, BinanceAPIError]]:
+        """
+        Birden fazla emri /v1/batchOrders ile gönder (5'lik gruplar eşzamanlı)
+
+        Returns:
+            Girişle aynı sırada: emir dict'i veya o emrin hatası (BinanceAPIError)
+        """
+        chunks = await asyncio.gather(*(self._place_batch_chunk(chunk)
+                                        for chunk in self._batch_chunks(orders)))
+        return [result for chunk in chunks for result in chunk]
+
+    async def _place_batch_chunk(self, chunk: List[Dict]) -> List[Union[Dict, BinanceAPIError]]:
+        try:
+            response = await self._request("POST", "/v1/batchOrders", self._batch_request_params(chunk),
+                                           signed=True, orders=len(chunk))
+        except CircuitOpenError as e:
+            return [e] * len(chunk)
+        except NetworkError as e:
+            # Sonuç belirsiz: tekrar göndermeden önce emirleri clientOrderId ile sorgula
+            return list(await asyncio.gather(*(self._recover_batch_order(params, e) for params in chunk)))
+        except BinanceAPIError as e:
+            return [e] * len(chunk)
+        return self._batch_results(chunk, response)
+
+    async def _recover_batch_order(self, params: Dict, error: BinanceAPIError) -> Union[Dict, BinanceAPIError]:
+        """Sonucu belirsiz batch emrini bul; borsada yoksa orijinal hata döner"""
+        try:
+            return await self.get_order(params["symbol"], client_order_id=params["newClientOrderId"])
+        except InvalidOrderError:
+            # "Order does not exist": emir borsaya ulaşmamış
+            return error
+        except BinanceAPIError as e:
+            return e
+
+    async def _recover_ws_order(self, params: Dict) -> Optional[Dict]:
+        """Sonucu belirsiz WebSocket emrini clientOrderId ile bul; yoksa None (REST'e düşülür)"""
+        self.ws_orders.stats["fallbacks"] += 1
+        try:
+            return await self.get_order(params["symbol"], client_order_id=params["newClientOrderId"])
+        except InvalidOrderError:
+            # "Order does not exist": emir borsaya ulaşmamış
+            return None
+
+    async def get_order(self, symbol: str, order_id: Optional[int] = None,
+                        client_order_id: Optional[str] = None) -> Dict:
+        """Emir durumunu sorgula (orderId veya clientOrderId ile)"""
+        params = {"symbol": symbol}
+        if order_id is not None:
+            params["orderId"] = order_id
+        if client_order_id is not None:
+            params["origClientOrderId"] = client_order_id
+        return self._expect_dict(await self._request("GET", "/v1/order", params, signed=True))
+
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict:
+        """Emri iptal et"""
+        params = {
+            "symbol": symbol,
+            "orderId": order_id
+        }
+        return self._expect_dict(await self._request("DELETE", "/v1/order", params, signed=True))
+
+    async def cancel_all_orders(self, symbol: str) -> Dict:
+        """Sembol için tüm açık emirleri iptal et"""
+        params = {"symbol": symbol}
+        return self._expect_dict(await self._request("DELETE", "/v1/allOpenOrders", params, signed=True))
+
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Açık emirleri al"""
+        params = {}
+        if symbol:
+            params["symbol"] = symbol
+        return self._expect_list(await self._request("GET", "/v1/openOrders", params, signed=True))
+
+    async def get_order_history(self, symbol: str, limit: int = 100) -> List[Dict]:
+        """Emir geçmişini al"""
+        params = {
+            "symbol": symbol,
+            "limit": limit
+        }
+        return self._expect_list(await self._request("GET", "/v1/allOrders", params, signed=True))
+
+    async def close_position(self, symbol: str) -> Dict:
+        """Pozisyonu market emriyle kapat"""
+        position = self._find_open_position(await self.get_positions(), symbol)
+
+        if not position:
+            raise ValueError(f"No open position found for {symbol}")
+
+        side, position_amt = self._close_order_side(position)
+
+        return await self.place_order(
+            symbol=symbol,
+            side=side,
+            order_type="MARKET",
+            quantity=position_amt,
+            reduce_only=True
+        )
+
+    async def create_listen_key(self) -> str:
+        """User data stream listenKey oluştur (60 dk geçerli, imza gerekmez)"""
+        return self._expect_dict(await self._request("POST", "/v1/listenKey"))["listenKey"]
+
+    async def keepalive_listen_key(self) -> Dict:
+        """listenKey süresini 60 dk uzat"""
+        return self._expect_dict(await self._request("PUT", "/v1/listenKey"))
+
+    async def close_listen_key(self) -> Dict:
+        """User data stream'i kapat"""
+        return self._expect_dict(await self._request("DELETE", "/v1/listenKey"))
+
+    async def refresh_premium_index(self) -> PremiumIndexSnapshot:
+        """Tüm semboller için premiumIndex'i tek istekle al (weight 10)"""
+        self.premium_index.update_from_rest(self._expect_list(await self._request("GET", "/v1/premiumIndex")))
+        return self.premium_index
+
+    async def get_funding_rates(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Funding rate / mark price tablosu {symbol: kayıt}
+
+        Snapshot'ta güncel olmayan sembol varsa tek toplu istekle yenilenir;
+        markPrice stream'i canlıyken istek atılmaz.
+        """
+        fresh = self.premium_index.fresh_entries(symbols)
+        if self._missing_premium_entries(fresh, symbols):
+            fresh = (await self.refresh_premium_index()).fresh_entries(symbols)
+        return fresh
+
+    async def get_funding_rate(self, symbol: str) -> Dict:
+        """Funding rate bilgisini al (premium index snapshot'ından)"""
+        entry = self.premium_index.get(symbol)
+        if entry is None:
+            entry = (await self.refresh_premium_index()).get(symbol)
+        return self._funding_rate_view(symbol, entry)
+
+    async def get_position(self, symbol: str) -> Optional[Dict]:
+        """Belirli bir sembol için pozisyon bilgisi al (account snapshot'ından)"""
+        snapshot = await self.get_account_snapshot(self.account_snapshot_max_age)
+        return snapshot.get_position(symbol)
+
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        """Anlık fiyat al (get_ticker_price'ın alias'ı)"""
+        return await self.get_ticker_price(symbol)
@@ -9,6 +9,10 @@ FEATURES:
 - Specific error handling (NetworkError, RateLimitError, etc.)
 - Connection pooling
 - Request/response logging
+- Pluggable JSON decoder (orjson > ujson > json, network.json_decoder)
+- Latency-adaptive timeouts and hedged idempotent GETs (network.latency)
+- Pluggable HTTP transport (requests / httpx HTTP/2) with keep-warm pings (network.http)
+- Batch order submission (/v1/batchOrders, up to 5 orders per request)
 """
 
 import json
@@ -16,21 +20,40 @@ import hmac
 import hashlib
 import time
 import threading
-from typing import Dict, List, Optional, Any, Union
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Any, Union, Tuple
+from urllib.parse import urlencode
 from datetime import datetime, timezone
 import logging
 from functools import wraps
 
+import numpy as np
+
 try:
-    import requests
-    from requests.adapters import HTTPAdapter
-    from requests.packages.urllib3.util.retry import Retry
     import websocket
 except ImportError as e:
     print(f"Required packages not installed: {e}")
-    print("Please run: pip install requests websocket-client")
+    print("Please run: pip install websocket-client")
     raise
 
+from .exchange_info import ExchangeInfoCache
+from .kline_store import KLINE_DTYPE, klines_to_array
+from .account_snapshot import AccountSnapshot
+from .rate_limiter import RateLimiter, endpoint_weight, ORDER_ENDPOINTS
+from .retry_policy import RetryPolicy
+from .latency_tracker import LatencyTracker
+from .http_transport import (
+    create_http_transport, HTTPTransport, TransportError,
+    ConnectTimeout, ReadTimeout, ConnectionFailed,
+)
+from .request_cache import RequestCache
+from .premium_index import PremiumIndexSnapshot
+from .symbol_settings import SymbolSettingsCache
+from .json_codec import get_json_decoder
+from .ws_order_transport import WebSocketOrderTransport
+
 
 # Custom Exceptions
 class BinanceAPIError(Exception):
@@ -53,13 +76,24 @@ class InvalidOrderError(BinanceAPIError):
     """Invalid order parameters"""
     pass
 
-class BinanceFuturesTestnetAPI:
-    """Binance Futures Testnet API client with retry and rate limiting"""
+class CircuitOpenError(NetworkError):
+    """Endpoint circuit breaker open, request not sent"""
+    pass
+
+class BinanceFuturesClientBase:
+    """
+    Senkron ve asenkron client'ların ortak çekirdeği
+
+    Config yükleme, imzalama, rate limit hesabı, hata sınıflandırma ve
+    response parse işlemleri burada; HTTP katmanı alt sınıflarda.
+    """
     
     # Rate limiting
-    MAX_REQUESTS_PER_MINUTE = 1200  # Binance limit
     REQUEST_WEIGHT_LIMIT = 2400     # Per minute
     
+    # /v1/batchOrders istek başına emir sayısı
+    MAX_BATCH_ORDERS = 5
+    
     def __init__(self, config_path: str = "config/testnet_config.json"):
         with open(config_path, 'r') as f:
             self.config = json.load(f)
@@ -69,255 +103,342 @@ class BinanceFuturesTestnetAPI:
         self.base_url = self.config["testnet_config"]["api_url"]
         self.ws_url = self.config["testnet_config"]["ws_url"]
         
-        # Session with connection pooling and retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,  # 1, 2, 4 seconds
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "DELETE"]
-        )
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=20
-        )
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        self.session.headers.update({"X-MBX-APIKEY": self.api_key})
+        # Rate limiting tracking (O(1) sliding window, sunucu header'ları ile senkron)
+        self.rate_limiter = RateLimiter(weight_limit=self.REQUEST_WEIGHT_LIMIT)
+        
+        # Tek retry katmanı: idempotency kuralları, döngü bütçesi, circuit breaker
+        self.retry_policy = RetryPolicy.from_config(self.config.get("network", {}).get("retry", {}))
         
-        # Rate limiting tracking
-        self.request_timestamps = []
-        self.request_weights = []
+        # Endpoint gecikme yüzdelikleri: adaptif timeout ve hedge kararı
+        self.latency = LatencyTracker.from_config(self.config.get("network", {}).get("latency", {}))
         
         # WebSocket connections
         self.ws_connections = {}
         self.price_data = {}
         
-        # Logging setup
-        log_config = self.config.get("logging", {})
-        log_level = getattr(logging, log_config.get("level", "INFO"))
-        
-        # Eğer log_dir varsa kullan, yoksa basit logging
-        handlers = [logging.StreamHandler()]
-        if log_config.get("file_output", False):
-            log_dir = log_config.get("log_dir", "logs")
-            from pathlib import Path
-            Path(log_dir).mkdir(parents=True, exist_ok=True)
-            log_file = Path(log_dir) / "binance_api.log"
-            handlers.append(logging.FileHandler(log_file))
-        
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s | %(levelname)s | %(message)s',
-            handlers=handlers
+        # Exchange metadata cache (exchangeInfo bir kez indirilir, TTL ile yenilenir)
+        network_config = self.config.get("network", {})
+        self.exchange_info = ExchangeInfoCache(
+            ttl=network_config.get("exchange_info_ttl", ExchangeInfoCache.DEFAULT_TTL)
         )
+        
+        # Response decoder (büyük exchangeInfo / kline yanıtlarında baskın maliyet)
+        self.json_loads = get_json_decoder(network_config.get("json_decoder", "auto"))
+        
+        # Hesap/pozisyon snapshot'ı (tek /v2/account isteği, sembol bazlı indeks)
+        self.account_snapshot: Optional[AccountSnapshot] = None
+        self.account_snapshot_max_age = network_config.get("account_snapshot_max_age", 5)
+        
+        # Sembol bazlı leverage / margin tipi: aynı değer tekrar POST edilmez
+        self.symbol_settings = SymbolSettingsCache()
+        
+        # Aynı anda giden aynı GET'ler tek istek; ticker gibi endpoint'ler kısa TTL ile önbellekte
+        self.request_cache = RequestCache.from_config(network_config.get("request_cache", {}))
+        
+        # Tüm semboller için mark price / funding (tek premiumIndex isteği + markPrice stream)
+        self.premium_index = PremiumIndexSnapshot(
+            max_age=network_config.get("premium_index_max_age", PremiumIndexSnapshot.DEFAULT_MAX_AGE)
+        )
+        
+        # Logging: handler'lar uygulamaya ait (bot root'u QueueListener'a bağlar);
+        # client yalnızca kendi logger'ının seviyesini ayarlar
+        log_config = self.config.get("logging", {})
         self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(getattr(logging, log_config.get("level", "INFO")))
         
-    def _generate_signature(self, params: Dict) -> str:
-        """API imzası oluştur"""
-        query_string = "&".join([f"{k}={v}" for k, v in params.items()])
+        # WebSocket API emir yolu (opsiyonel; bağlantı yoksa emirler REST ile gider)
+        ws_orders_config = network_config.get("ws_orders", {})
+        self.ws_api_url = self.config["testnet_config"].get("ws_api_url")
+        self.ws_orders: Optional[WebSocketOrderTransport] = None
+        if ws_orders_config.get("enabled", False) and self.ws_api_url:
+            self.ws_orders = WebSocketOrderTransport(
+                self.ws_api_url,
+                timeout=ws_orders_config.get("timeout", 5.0),
+                logger=self.logger
+            )
+        
+    def _sign(self, payload: str) -> str:
         return hmac.new(
             self.secret_key.encode('utf-8'),
-            query_string.encode('utf-8'),
+            payload.encode('utf-8'),
             hashlib.sha256
         ).hexdigest()
     
-    def _check_rate_limit(self, weight: int = 1):
-        """Rate limit kontrolü ve bekleme"""
-        now = time.time()
-        
-        # 1 dakikadan eski istekleri temizle (her iki listeyi de aynı anda filtrele)
-        filtered_data = [(ts, w) for ts, w in zip(self.request_timestamps, self.request_weights) if now - ts < 60]
-        if filtered_data:
-            self.request_timestamps, self.request_weights = zip(*filtered_data)
-            self.request_timestamps = list(self.request_timestamps)
-            self.request_weights = list(self.request_weights)
-        else:
-            self.request_timestamps = []
-            self.request_weights = []
-        
-        # Rate limit kontrolü
-        if len(self.request_timestamps) >= self.MAX_REQUESTS_PER_MINUTE:
-            sleep_time = 60 - (now - self.request_timestamps[0])
-            if sleep_time > 0:
-                self.logger.warning(f"⚠️ Rate limit yaklaşıldı, {sleep_time:.1f}s bekleniyor...")
-                time.sleep(sleep_time)
-        
-        if sum(self.request_weights) + weight >= self.REQUEST_WEIGHT_LIMIT:
-            sleep_time = 60 - (now - self.request_timestamps[0])
-            if sleep_time > 0:
-                self.logger.warning(f"⚠️ Weight limit yaklaşıldı, {sleep_time:.1f}s bekleniyor...")
-                time.sleep(sleep_time)
-        
-        # İsteği kaydet
-        self.request_timestamps.append(now)
-        self.request_weights.append(weight)
+    def _generate_signature(self, params: Dict) -> str:
+        """API imzası oluştur (encode edilmemiş k=v payload, WebSocket API)"""
+        return self._sign("&".join([f"{k}={v}" for k, v in params.items()]))
     
-    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
-                 signed: bool = False, weight: int = 1, retry_count: int = 3) -> Union[Dict, List]:
+    @staticmethod
+    def _request_cost(method: str, endpoint: str, params: Optional[Dict],
+                      weight: Optional[int], orders: Optional[int] = None) -> Tuple[int, int]:
+        """İsteğin (weight, emir sayısı) maliyeti"""
+        if weight is None:
+            weight = endpoint_weight(method, endpoint, params)
+        if orders is None:
+            orders = 1 if (method, endpoint) in ORDER_ENDPOINTS else 0
+        return weight, orders
+    
+    def _prepare_query(self, params: Optional[Dict], signed: bool) -> str:
         """
-        API isteği gönder (gelişmiş hata yönetimi ve retry)
-        
-        Args:
-            method: HTTP method (GET, POST, DELETE)
-            endpoint: API endpoint
-            params: Request parameters
-            signed: Signature gerekli mi
-            weight: Request weight (rate limiting için)
-            retry_count: Hata durumunda kaç kez tekrar deneneceği
+        URL-encoded query string, gerekiyorsa timestamp + imza ile
         
-        Returns:
-            API response (dict veya list)
+        İmza gönderilen string'in kendisi üzerinden hesaplanır: batchOrders
+        gibi JSON değerlerde HTTP client'ın encoding farkı imzayı bozmaz.
+        """
+        params = dict(params) if params else {}
+        if signed:
+            params['timestamp'] = int(time.time() * 1000)
+        query = urlencode(params)
+        if signed:
+            query = f"{query}&signature={self._sign(query)}"
+        return query
+    
+    def _client_error(self, error_msg: str) -> BinanceAPIError:
+        """Borsanın reddettiği istek/emir için exception tipi"""
+        if 'insufficient balance' in error_msg.lower():
+            return InsufficientBalanceError(error_msg)
+        elif any(word in error_msg.lower() for word in ['order', 'quantity', 'price']):
+            return InvalidOrderError(error_msg)
+        return BinanceAPIError(error_msg)
+    
+    def _classify_http_error(self, status_code: int, headers: Dict,
+                             error_data: Dict) -> Tuple[BinanceAPIError, Optional[float]]:
+        """
+        HTTP hata kodunu exception'a çevir
         
-        Raises:
-            RateLimitError: Rate limit aşıldı
-            NetworkError: Ağ bağlantı hatası
-            InvalidOrderError: Geçersiz emir parametreleri
-            BinanceAPIError: Diğer API hataları
+        Tekrar denenemeyecek hatalar doğrudan raise edilir. Tekrar denenebilir
+        hatalar (429, 5xx) için (exception, Retry-After) döner.
         """
-        if params is None:
-            params = {}
+        if status_code == 429:
+            # Rate limit
+            retry_after = float(headers.get('Retry-After', 60))
+            self.logger.error(f"❌ Rate limit aşıldı! (Retry-After: {retry_after:.0f}s)")
+            return RateLimitError(f"Rate limit exceeded: HTTP 429"), retry_after
         
-        # Rate limit kontrolü
-        self._check_rate_limit(weight)
+        if status_code == 418:
+            # IP banned
+            self.logger.critical(f"🚫 IP BANNED! API erişimi engellendi!")
+            raise RateLimitError("IP banned by Binance")
         
-        if signed:
-            params['timestamp'] = int(time.time() * 1000)
-            params['signature'] = self._generate_signature(params)
+        if status_code in [400, 401, 403]:
+            # Client error - retry yapma
+            error_msg = error_data.get('msg', f"HTTP {status_code}")
+            self.logger.error(f"❌ API Client Error [{status_code}]: {error_msg}")
+            
+            # Spesifik hatalar
+            raise self._client_error(error_msg)
         
-        url = f"{self.base_url}{endpoint}"
-        last_exception = None
+        if status_code >= 500:
+            # Server error - istek işlenmiş olabilir, retry kararı policy'de
+            return BinanceAPIError(f"Server error: HTTP {status_code}"), None
         
-        for attempt in range(retry_count):
-            try:
-                # HTTP request
-                if method == "GET":
-                    response = self.session.get(url, params=params, timeout=10)
-                elif method == "POST":
-                    response = self.session.post(url, params=params, timeout=10)
-                elif method == "DELETE":
-                    response = self.session.delete(url, params=params, timeout=10)
-                else:
-                    raise ValueError(f"Unsupported method: {method}")
-                
-                # Response kontrolü
-                response.raise_for_status()
-                return response.json()
-                
-            except requests.exceptions.HTTPError as e:
-                # HTTP hata kodlarını ayıkla
-                if e.response.status_code == 429:
-                    # Rate limit
-                    retry_after = int(e.response.headers.get('Retry-After', 60))
-                    self.logger.error(f"❌ Rate limit aşıldı! {retry_after}s bekleniyor...")
-                    time.sleep(retry_after)
-                    last_exception = RateLimitError(f"Rate limit exceeded: {e}")
-                    
-                elif e.response.status_code == 418:
-                    # IP banned
-                    self.logger.critical(f"🚫 IP BANNED! API erişimi engellendi!")
-                    raise RateLimitError("IP banned by Binance")
-                    
-                elif e.response.status_code in [400, 401, 403]:
-                    # Client error - retry yapma
-                    error_data = e.response.json() if e.response.text else {}
-                    error_msg = error_data.get('msg', str(e))
-                    self.logger.error(f"❌ API Client Error [{e.response.status_code}]: {error_msg}")
-                    
-                    # Spesifik hatalar
-                    if 'insufficient balance' in error_msg.lower():
-                        raise InsufficientBalanceError(error_msg)
-                    elif any(word in error_msg.lower() for word in ['order', 'quantity', 'price']):
-                        raise InvalidOrderError(error_msg)
-                    else:
-                        raise BinanceAPIError(error_msg)
-                        
-                elif e.response.status_code >= 500:
-                    # Server error - retry yap
-                    self.logger.warning(f"⚠️ Server error [{e.response.status_code}], {attempt + 1}/{retry_count} deneme...")
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    last_exception = e
-                else:
-                    raise BinanceAPIError(f"HTTP {e.response.status_code}: {e}")
-                    
-            except requests.exceptions.ConnectionError as e:
-                # Ağ bağlantı hatası
-                self.logger.warning(f"⚠️ Ağ bağlantı hatası, {attempt + 1}/{retry_count} deneme...")
-                time.sleep(2 ** attempt)
-                last_exception = NetworkError(f"Connection error: {e}")
-                
-            except requests.exceptions.Timeout as e:
-                # Timeout
-                self.logger.warning(f"⚠️ Request timeout, {attempt + 1}/{retry_count} deneme...")
-                time.sleep(2 ** attempt)
-                last_exception = NetworkError(f"Timeout: {e}")
-                
-            except requests.exceptions.RequestException as e:
-                # Diğer request hataları
-                self.logger.error(f"❌ Request failed: {e}")
-                last_exception = BinanceAPIError(str(e))
-                break  # Retry yapma
+        raise BinanceAPIError(f"HTTP {status_code}: {error_data.get('msg', '')}")
+    
+    def _open_breaker(self, endpoint: str):
+        """Endpoint'in circuit breaker'ını al; açıksa istek gönderilmez"""
+        breaker = self.retry_policy.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {endpoint}, request skipped")
+        return breaker
+    
+    def _retry_delay(self, method: str, endpoint: str, attempt: int, error: BinanceAPIError,
+                     request_sent: bool, retry_after: Optional[float] = None) -> Optional[float]:
+        """Hata sonrası: retry yapılacaksa bekleme süresi, yapılmayacaksa None"""
+        if not self.retry_policy.should_retry(method, endpoint, attempt, request_sent, retry_after):
+            return None
+        delay = retry_after if retry_after is not None else self.retry_policy.backoff(attempt)
+        self.logger.warning(
+            f"⚠️ {method} {endpoint}: {error} | "
+            f"{attempt + 2}/{self.retry_policy.max_attempts}. deneme {delay:.1f}s sonra..."
+        )
+        return delay
+    
+    def _acquire_hedge(self, weight: int) -> bool:
+        """Hedge isteği için rate limit payı al; limit yakınsa hedge gönderilmez"""
+        headroom = self.rate_limiter.weight_limit * self.latency.hedge_max_weight_ratio
+        if self.rate_limiter.used_weight() + weight > headroom:
+            return False
+        if not self.rate_limiter.try_acquire(weight):
+            return False
+        self.latency.stats["hedged"] += 1
+        return True
+    
+    def start_ws_orders(self) -> bool:
+        """WebSocket emir bağlantısını arka planda başlat (bloklamaz)"""
+        if self.ws_orders is None:
+            return False
+        self.ws_orders.start()
+        return True
+    
+    def stop_ws_orders(self):
+        """WebSocket emir bağlantısını kapat"""
+        if self.ws_orders is not None:
+            self.ws_orders.stop()
+    
+    def _ws_order_params(self, params: Dict) -> Dict:
+        """WebSocket API için imzalı parametreler (imza alfabetik sıralı payload üzerinden)"""
+        if not params.get("newClientOrderId"):
+            # Yanıt alınamazsa emir bu ID ile sorgulanır
+            params["newClientOrderId"] = f"ws_{uuid.uuid4().hex[:24]}"
+        ws_params = dict(params, apiKey=self.api_key, timestamp=int(time.time() * 1000))
+        ws_params = dict(sorted(ws_params.items()))
+        ws_params["signature"] = self._generate_signature(ws_params)
+        return ws_params
+    
+    def _ws_order_result(self, response: Dict) -> Optional[Dict]:
+        """
+        WebSocket API yanıtını yorumla
         
-        # Tüm denemeler başarısız
-        if last_exception:
-            raise last_exception
-        raise BinanceAPIError("Request failed after all retries")
+        Returns:
+            Emir dict'i; None ise sonuç belirsiz (emir clientOrderId ile sorgulanmalı)
+        
+        Raises:
+            4xx hataları REST ile aynı exception'lara çevrilir
+        """
+        status = response.get("status")
+        if status == 200:
+            return self._expect_dict(response.get("result"))
+        error, _ = self._classify_http_error(status or 500, {}, response.get("error") or {})
+        self.logger.warning(f"⚠️ WebSocket order error: {error}")
+        return None
     
-    def get_server_time(self) -> int:
-        """Server zamanını al"""
-        response = self._request("GET", "/v1/time")
-        if isinstance(response, dict):
-            return response["serverTime"]
-        raise ValueError("Invalid response format")
+    def _store_account_snapshot(self, snapshot: AccountSnapshot) -> AccountSnapshot:
+        """Yeni snapshot'ı sakla; pozisyon satırlarındaki leverage / margin tipini önbelleğe al"""
+        self.account_snapshot = snapshot
+        self.symbol_settings.update_from_positions(snapshot.positions.values())
+        return snapshot
     
-    def get_account_info(self) -> Dict:
-        """Futures hesap bilgilerini al"""
-        response = self._request("GET", "/v2/account", signed=True)
+    @staticmethod
+    def _margin_type_unchanged(error: BinanceAPIError) -> bool:
+        """-4046: margin tipi zaten istenen değerde"""
+        return "no need to change margin type" in str(error).lower()
+    
+    def _fresh_account_snapshot(self, max_age: float) -> Optional[AccountSnapshot]:
+        """max_age saniyeden yeni snapshot varsa döndür"""
+        snapshot = self.account_snapshot
+        if snapshot is not None and max_age > 0 and snapshot.age < max_age:
+            return snapshot
+        return None
+    
+    @staticmethod
+    def _expect_dict(response: Any) -> Dict:
         if isinstance(response, dict):
             return response
         raise ValueError("Invalid response format")
     
-    def get_balance(self) -> List[Dict]:
-        """Hesap bakiyelerini al"""
-        account = self.get_account_info()
-        return account.get("assets", [])
-    
-    def get_positions(self) -> List[Dict]:
-        """Açık pozisyonları al"""
-        response = self._request("GET", "/v2/positionRisk", signed=True)
+    @staticmethod
+    def _expect_list(response: Any) -> List:
         if isinstance(response, list):
             return response
         raise ValueError("Invalid response format")
     
-    def get_symbol_info(self, symbol: str) -> Dict:
-        """Sembol bilgilerini al"""
-        response = self._request("GET", "/v1/exchangeInfo")
-        if isinstance(response, dict):
-            for s in response["symbols"]:
-                if s["symbol"] == symbol:
-                    return s
-        raise ValueError(f"Symbol {symbol} not found")
+    @staticmethod
+    def _find_open_position(positions: List[Dict], symbol: str) -> Optional[Dict]:
+        for pos in positions:
+            if pos["symbol"] == symbol and float(pos.get("positionAmt", 0)) != 0:
+                return pos
+        return None
     
-    def get_ticker_price(self, symbol: str) -> Optional[float]:
+    @staticmethod
+    def _build_order_params(symbol: str, side: str, order_type: str,
+                            quantity: float, price: Optional[float] = None,
+                            stop_price: Optional[float] = None, reduce_only: bool = False,
+                            client_order_id: Optional[str] = None) -> Dict:
+        params = {
+            "symbol": symbol,
+            "side": side,  # BUY veya SELL
+            "type": order_type,  # MARKET, LIMIT, STOP, STOP_MARKET, etc.
+            "quantity": quantity
+        }
+        
+        if order_type == "LIMIT":
+            params["timeInForce"] = "GTC"  # Good Till Cancel
+            if price:
+                params["price"] = price
+        
+        if order_type in ["STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET"] and stop_price:
+            params["stopPrice"] = stop_price
+            
+        if reduce_only:
+            params["reduceOnly"] = "true"
+        
+        if client_order_id:
+            # Retry'larda aynı ID gider; user data stream'de emrin sahibini belirtir
+            params["newClientOrderId"] = client_order_id
+        return params
+    
+    def _batch_chunks(self, orders: List[Dict]) -> List[List[Dict]]:
+        """place_order argümanlarını emir parametrelerine çevir, MAX_BATCH_ORDERS'lık gruplara böl"""
+        batch = []
+        for order in orders:
+            params = self._build_order_params(**order)
+            if not params.get("newClientOrderId"):
+                # Yanıt alınamazsa emir bu ID ile sorgulanır
+                params["newClientOrderId"] = f"bt_{uuid.uuid4().hex[:24]}"
+            batch.append(params)
+        return [batch[i:i + self.MAX_BATCH_ORDERS] for i in range(0, len(batch), self.MAX_BATCH_ORDERS)]
+    
+    @staticmethod
+    def _batch_request_params(chunk: List[Dict]) -> Dict:
+        return {"batchOrders": json.dumps([{k: str(v) for k, v in params.items()} for params in chunk],
+                                          separators=(",", ":"))}
+    
+    def _batch_results(self, chunk: List[Dict], response: Any) -> List[Union[Dict, BinanceAPIError]]:
+        """batchOrders yanıtını emirlerle eşle: emir dict'i veya o emrin hatası"""
+        if not isinstance(response, list) or len(response) != len(chunk):
+            error = BinanceAPIError(f"Unexpected batchOrders response: {response}")
+            return [error] * len(chunk)
+        results = []
+        for params, item in zip(chunk, response):
+            if isinstance(item, dict) and "orderId" not in item and "code" in item:
+                self.logger.error(f"❌ Batch order rejected {params['symbol']} [{item.get('code')}]: {item.get('msg')}")
+                results.append(self._client_error(item.get("msg", "")))
+            else:
+                results.append(item)
+        return results
+    
+    @staticmethod
+    def _close_order_side(position: Dict) -> Tuple[str, float]:
+        """Pozisyonu kapatacak emrin yönü ve miktarı"""
+        position_amt = float(position["positionAmt"])
+        
+        # Pozisyon kapatma emri (ters yönde)
+        if position_amt > 0:  # Long pozisyon
+            return "SELL", position_amt
+        return "BUY", abs(position_amt)  # Short pozisyon
+    
+    @staticmethod
+    def _funding_rate_view(symbol: str, entry: Optional[Dict]) -> Dict:
+        """Snapshot kaydını get_funding_rate formatına çevir"""
+        if entry is None:
+            raise ValueError(f"No premium index data for {symbol}")
+        return {
+            'funding_rate': entry['funding_rate'],
+            'next_funding_time': entry['next_funding_time'],
+            'mark_price': entry['mark_price']
+        }
+    
+    def _missing_premium_entries(self, fresh: Dict[str, Dict], symbols: Optional[List[str]]) -> bool:
+        """İstenen sembollerden snapshot'ta güncel olmayan var mı"""
+        expected = len(symbols) if symbols is not None else len(self.premium_index.entries)
+        return not fresh or len(fresh) < expected
+    
+    def _parse_ticker_price(self, symbol: str, response: Any) -> Optional[float]:
         """
-        Anlık fiyat al (güçlendirilmiş hata kontrolü ile)
+        /v1/ticker/price yanıtını fiyata çevir (güçlendirilmiş hata kontrolü ile)
         
         Returns:
             float: Geçerli fiyat
-            None: Hata durumunda veya geçersiz veri
+            None: Geçersiz veri
         """
-        response = None  # Initialize to avoid UnboundLocalError
         try:
-            response = self._request("GET", "/v1/ticker/price", {"symbol": symbol})
-            
-            # DEBUG: API yanıtını logla
+            # DEBUG: API yanıtını logla (lazy: INFO seviyesinde string oluşturulmaz)
             if response is None:
-                self.logger.debug(f"API returned None for {symbol}")
+                self.logger.debug("API returned None for %s", symbol)
             elif isinstance(response, list) and len(response) == 0:
-                self.logger.debug(f"API returned empty list for {symbol}")
+                self.logger.debug("API returned empty list for %s", symbol)
             else:
-                self.logger.debug(f"API response for {symbol}: {type(response)} = {response}")
+                self.logger.debug("API response for %s: %s = %s", symbol, type(response), response)
             
             # Response kontrolü - daha güvenli
             if response and isinstance(response, dict) and "price" in response:
@@ -366,7 +487,6 @@ class BinanceFuturesTestnetAPI:
                 
         except IndexError as e:
             # Liste index hatası - DETAYLI STACK TRACE
-            import traceback
             self.logger.error(f"❌ List index out of range for {symbol}: {e}")
             self.logger.error("Stack trace:")
             self.logger.error(traceback.format_exc())
@@ -374,17 +494,451 @@ class BinanceFuturesTestnetAPI:
             return None
         except (ValueError, TypeError, KeyError) as e:
             self.logger.error(f"❌ Price parsing error for {symbol}: {e}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return None
+    
+    def _parse_all_prices(self, response: Any) -> Dict[str, float]:
+        """
+        Sembolsüz /v1/ticker/price yanıtını {symbol: price} sözlüğüne çevir
+        
+        Geçersiz veya sıfır fiyatlı satırlar atlanır.
+        """
+        if not isinstance(response, list):
+            self.logger.warning(f"⚠️  Invalid bulk ticker response format: {type(response)}")
+            return {}
+        
+        prices = {}
+        for item in response:
+            try:
+                price = float(item["price"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if price > 0:
+                prices[item["symbol"]] = price
+        return prices
+    
+    def _parse_klines_array(self, symbol: str, response: Any) -> np.ndarray:
+        """Kline yanıtını KLINE_DTYPE dizisine çevir (geçersizse boş dizi)"""
+        try:
+            return klines_to_array(self._expect_list(response))
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"⚠️  Invalid kline data for {symbol}: {e}")
+            return np.empty(0, dtype=KLINE_DTYPE)
+    
+    def _parse_klines(self, symbol: str, response: Any) -> List[List]:
+        """
+        Kline yanıtını doğrula (her kline en az 6 element içerir)
+        
+        Returns:
+            List[List]: Geçerli kline'lar
+            []: Boş veya geçersiz veri
+        """
+        # GÜÇLENDİRİLMİŞ KONTROL: Liste mi, boş değil mi, geçerli mi?
+        if response and isinstance(response, list) and len(response) > 0:
+            # Her kline'ın en az 6 element olduğundan emin ol
+            valid_klines = []
+            for kline in response:
+                if kline and isinstance(kline, list) and len(kline) >= 6:
+                    valid_klines.append(kline)
+                else:
+                    self.logger.warning(f"⚠️  Invalid kline format skipped for {symbol}")
+            
+            if len(valid_klines) > 0:
+                return valid_klines
+            else:
+                self.logger.warning(f"⚠️  No valid klines found for {symbol}")
+                return []
+        else:
+            self.logger.warning(f"⚠️  Received empty or invalid kline data for {symbol}")
+            return []
+    
+    def start_price_stream(self, symbols: List[str]):
+        """Futures fiyat akışını başlat"""
+        def on_message(ws, message):
+            data = self.json_loads(message)
+            if 'data' in data:
+                symbol = data['data']['s']
+                price = float(data['data']['c'])
+                self.price_data[symbol] = {
+                    'price': price,
+                    'timestamp': datetime.now(timezone.utc),
+                    'volume': float(data['data']['v']),
+                    'mark_price': float(data['data'].get('p', price))  # Mark price
+                }
+                self.logger.debug("%s: $%.4f", symbol, price)
+        
+        def on_error(ws, error):
+            self.logger.error(f"WebSocket error: {error}")
+        
+        def on_close(ws, close_status_code, close_msg):
+            self.logger.info("WebSocket connection closed")
+        
+        # Futures stream URL
+        stream_names = [f"{symbol.lower()}@ticker" for symbol in symbols]
+        stream_url = f"{self.ws_url}/stream?streams={'/'.join(stream_names)}"
+        
+        ws = websocket.WebSocketApp(
+            stream_url,
+            on_message=on_message,
+            on_error=on_error,
+            on_close=on_close
+        )
+        
+        # WebSocket'i ayrı thread'de başlat
+        def run_ws():
+            ws.run_forever()
+            
+        ws_thread = threading.Thread(target=run_ws, daemon=True)
+        ws_thread.start()
+        
+        self.ws_connections['price_stream'] = ws
+        self.logger.info(f"Futures price stream started for {len(symbols)} symbols")
+    
+    def get_latest_price(self, symbol: str) -> Optional[float]:
+        """En son fiyatı al (WebSocket'ten)"""
+        if symbol in self.price_data:
+            return self.price_data[symbol]['price']
+        return None
+    
+    def stop_all_streams(self):
+        """Tüm WebSocket bağlantılarını kapat"""
+        for ws in self.ws_connections.values():
+            ws.close()
+        self.ws_connections.clear()
+        self.logger.info("All WebSocket streams stopped")
+    
+
+class BinanceFuturesTestnetAPI(BinanceFuturesClientBase):
+    """Binance Futures Testnet API client with retry and rate limiting"""
+    
+    def __init__(self, config_path: str = "config/testnet_config.json"):
+        super().__init__(config_path)
+        
+        # HTTP transport (connection pooling; httpx kuruluysa HTTP/2 seçilebilir)
+        self.http_config = self.config.get("network", {}).get("http", {})
+        self.transport: HTTPTransport = create_http_transport(
+            self.http_config.get("transport", "requests"),
+            headers={"X-MBX-APIKEY": self.api_key},
+            pool_maxsize=self.http_config.get("pool_maxsize", 20),
+            http2=self.http_config.get("http2", True),
+        )
+        self.logger.debug("HTTP transport: %s (%s)", self.transport.name, self.transport.protocol)
+        
+        # Boştaki bağlantıyı sıcak tutan ping thread'i (start_keepalive)
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._keepalive_stop = threading.Event()
+        
+        # Hedge'li GET'ler için (ilk hedge'de oluşturulur)
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+    
+    def close(self):
+        """Keepalive thread'ini durdur, HTTP bağlantılarını kapat"""
+        self.stop_keepalive()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        self.transport.close()
+    
+    def start_keepalive(self) -> bool:
+        """
+        Bağlantı boşta keepalive_interval'ı aşarsa /v1/ping gönder
+        
+        Döngüler arası beklemede bağlantı soğumaz, ilk istek TLS el sıkışması
+        ödemez. HTTP/2'de tüm eşzamanlı istekler tek bağlantıyı kullanır;
+        HTTP/1.1'de warm_connections kadar eşzamanlı ping ile o kadar
+        bağlantı sıcak tutulur.
+        """
+        interval = self.http_config.get("keepalive_interval", 0)
+        if not interval or (self._keepalive_thread is not None and self._keepalive_thread.is_alive()):
+            return False
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop, args=(interval,), name="http-keepalive", daemon=True
+        )
+        self._keepalive_thread.start()
+        return True
+    
+    def stop_keepalive(self):
+        self._keepalive_stop.set()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join(timeout=5)
+            self._keepalive_thread = None
+    
+    def _keepalive_loop(self, interval: float):
+        url = f"{self.base_url}/v1/ping"
+        connections = 1 if self.transport.protocol == "HTTP/2" else self.http_config.get("warm_connections", 1)
+        
+        def ping():
+            # Ping rate limit payından düşer; limit yakınsa atlanır
+            if self.rate_limiter.try_acquire(1):
+                try:
+                    self.transport.warm(url, self.latency.max_timeout)
+                except TransportError as e:
+                    self.logger.debug("Keepalive ping failed: %s", e)
+        
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="http-keepalive") as pool:
+            while True:
+                idle = time.time() - self.transport.last_used
+                if idle < interval:
+                    wait = interval - idle
+                else:
+                    list(pool.map(lambda _: ping(), range(connections)))
+                    wait = interval
+                if self._keepalive_stop.wait(wait):
+                    return
+    
+    def _check_rate_limit(self, weight: int = 1, orders: int = 0):
+        """Rate limit kontrolü ve bekleme"""
+        waited = self.rate_limiter.acquire(weight, orders)
+        if waited > 0:
+            self.logger.warning(f"⚠️ Rate limit yaklaşıldı, {waited:.1f}s beklendi")
+    
+    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
+                 signed: bool = False, weight: Optional[int] = None,
+                 orders: Optional[int] = None) -> Union[Dict, List]:
+        """
+        API isteği gönder (gelişmiş hata yönetimi ve retry)
+        
+        Retry kararları RetryPolicy'ye aittir: emir gibi idempotent olmayan
+        istekler yalnızca sunucuya hiç ulaşmadıysa tekrar gönderilir.
+        
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint
+            params: Request parameters
+            signed: Signature gerekli mi
+            weight: Request weight (None ise endpoint tablosundan)
+            orders: Emir sayacına yazılacak emir sayısı (None ise endpoint'ten)
+        
+        Returns:
+            API response (dict veya list)
+        
+        Raises:
+            RateLimitError: Rate limit aşıldı
+            NetworkError: Ağ bağlantı hatası (CircuitOpenError dahil)
+            InvalidOrderError: Geçersiz emir parametreleri
+            BinanceAPIError: Diğer API hataları
+        """
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        
+        # GET: önbellekteki yanıt (weight harcanmaz) veya uçuştaki aynı isteğin sonucu
+        if method == "GET" and self.request_cache.enabled:
+            return self.request_cache.fetch(
+                endpoint, params,
+                lambda: self._request_network(method, endpoint, params, signed, weight, orders)
+            )
+        return self._request_network(method, endpoint, params, signed, weight, orders)
+    
+    def _request_network(self, method: str, endpoint: str, params: Optional[Dict],
+                         signed: bool, weight: Optional[int], orders: Optional[int]) -> Union[Dict, List]:
+        """İsteği rate limit, circuit breaker ve retry ile ağa gönder"""
+        breaker = self._open_breaker(endpoint)
+        
+        # İstek maliyeti (her denemede yeniden düşülür)
+        weight, orders = self._request_cost(method, endpoint, params, weight, orders)
+        
+        for attempt in range(self.retry_policy.max_attempts):
+            # Her deneme borsada ayrıca sayılır: weight deneme başına alınır
+            self._check_rate_limit(weight, orders)
+            # Her denemede yeniden imzala: retry'da timestamp recvWindow dışına düşmez (-1021)
+            query = self._prepare_query(params, signed)
+            url = f"{self.base_url}{endpoint}?{query}" if query else f"{self.base_url}{endpoint}"
+            request_sent = True
+            retry_after = None
+            try:
+                # HTTP request (adaptif timeout, uygunsa hedge'li)
+                hedge_delay = self.latency.hedge_delay(method, endpoint)
+                if hedge_delay is None:
+                    response = self._send(method, endpoint, url)
+                else:
+                    response = self._send_hedged(method, endpoint, url, weight, hedge_delay)
+                self.rate_limiter.sync_from_headers(response.headers)
+                
+                # Response kontrolü
+                if response.status_code < 400:
+                    breaker.record_success()
+                    return self.json_loads(response.content)
+                
+                # HTTP hata kodlarını ayıkla
+                try:
+                    error_data = self.json_loads(response.content) if response.content else {}
+                except ValueError:
+                    error_data = {}
+                if not isinstance(error_data, dict):
+                    error_data = {}
+                try:
+                    error, retry_after = self._classify_http_error(
+                        response.status_code, response.headers, error_data
+                    )
+                except BinanceAPIError:
+                    breaker.record_success()  # Endpoint ayakta, istek hatalı
+                    raise
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    request_sent = False  # 429: istek işlenmedi
+                    
+            except ConnectTimeout as e:
+                # Bağlantı kurulamadı - istek sunucuya ulaşmadı
+                breaker.record_failure()
+                request_sent = False
+                error = NetworkError(f"Connect timeout: {e}")
+                
+            except ReadTimeout as e:
+                # Read timeout - istek işlenmiş olabilir
+                breaker.record_failure()
+                error = NetworkError(f"Timeout: {e}")
+                
+            except ConnectionFailed as e:
+                # Ağ bağlantı hatası
+                breaker.record_failure()
+                request_sent = e.request_sent
+                error = NetworkError(f"Connection error: {e}")
+                
+            except TransportError as e:
+                # Diğer request hataları - retry yapma
+                breaker.record_failure()
+                self.logger.error(f"❌ Request failed: {e}")
+                raise BinanceAPIError(str(e))
+            
+            finally:
+                # Sonuç kaydedilmeden çıkış (429, beklenmeyen hata, iptal): deneme hakkı bırakılır
+                breaker.release()
+            
+            if breaker.state == breaker.OPEN:
+                # Breaker bu istek sırasında açıldı: kalan denemeler gönderilmez
+                raise error
+            delay = self._retry_delay(method, endpoint, attempt, error, request_sent, retry_after)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+        
+        # Tüm denemeler başarısız
+        raise BinanceAPIError("Request failed after all retries")
+    
+    def _send(self, method: str, endpoint: str, url: str) -> Any:
+        """Tek HTTP isteği: endpoint'in adaptif timeout'u ile, süresi kaydedilir"""
+        timeout = self.latency.timeout_for(method, endpoint)
+        start = time.perf_counter()
+        try:
+            response = self.transport.request(method, url, None, timeout)
+        except ReadTimeout:
+            self.latency.record_timeout(method, endpoint, timeout)
+            raise
+        self.latency.record(method, endpoint, time.perf_counter() - start)
+        return response
+    
+    def _send_hedged(self, method: str, endpoint: str, url: str,
+                     weight: int, hedge_delay: float) -> Any:
+        """
+        Idempotent GET: hedge_delay içinde yanıt yoksa ikinci istek gönder
+        
+        İlk başarılı yanıt döner; ikisi de hata verirse ilk isteğin hatası.
+        Kaybeden istek arka planda tamamlanır (senkron istek iptal edilemez).
+        """
+        if self._hedge_pool is None:
+            self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="http-hedge")
+        primary = self._hedge_pool.submit(self._send, method, endpoint, url)
+        try:
+            return primary.result(timeout=hedge_delay)
+        except FutureTimeoutError:
+            pass
+        if not self._acquire_hedge(weight):
+            return primary.result()
+        
+        self.logger.debug("Hedging %s %s after %.0f ms", method, endpoint, hedge_delay * 1000)
+        hedge = self._hedge_pool.submit(self._send, method, endpoint, url)
+        for future in as_completed((primary, hedge)):
+            if future.exception() is None:
+                if future is hedge:
+                    self.latency.stats["hedge_wins"] += 1
+                return future.result()
+        return primary.result()
+    
+    def get_server_time(self) -> int:
+        """Server zamanını al"""
+        response = self._request("GET", "/v1/time")
+        if isinstance(response, dict):
+            return response["serverTime"]
+        raise ValueError("Invalid response format")
+    
+    def get_account_info(self) -> Dict:
+        """Futures hesap bilgilerini al"""
+        return self._expect_dict(self._request("GET", "/v2/account", signed=True))
+    
+    def get_balance(self) -> List[Dict]:
+        """Hesap bakiyelerini al"""
+        account = self.get_account_info()
+        return account.get("assets", [])
+    
+    def get_positions(self) -> List[Dict]:
+        """Açık pozisyonları al"""
+        return self._expect_list(self._request("GET", "/v2/positionRisk", signed=True))
+    
+    def get_account_snapshot(self, max_age: float = 0) -> AccountSnapshot:
+        """
+        Hesap + pozisyon snapshot'ı al (tek istek)
+        
+        Args:
+            max_age: Bu süreden (saniye) yeni snapshot varsa istek atılmaz
+        """
+        snapshot = self._fresh_account_snapshot(max_age)
+        if snapshot is None:
+            snapshot = self._store_account_snapshot(AccountSnapshot(self.get_account_info()))
+        return snapshot
+    
+    def get_exchange_info(self) -> Dict:
+        """Exchange bilgilerini al (ham yanıt, önbelleksiz)"""
+        return self._expect_dict(self._request("GET", "/v1/exchangeInfo"))
+    
+    def refresh_exchange_info(self) -> ExchangeInfoCache:
+        """exchangeInfo'yu indir ve önbelleği yenile"""
+        payload = self.get_exchange_info()
+        self.exchange_info.update(payload)
+        self.rate_limiter.update_limits(payload.get("rateLimits", []))
+        self.logger.info(f"📚 Exchange info cached: {len(self.exchange_info.symbols)} symbols")
+        return self.exchange_info
+    
+    def get_symbol_info(self, symbol: str) -> Dict:
+        """Sembol bilgilerini al (önbellekten, TTL dolduysa yenile)"""
+        if self.exchange_info.is_stale():
+            self.refresh_exchange_info()
+        return self.exchange_info.get(symbol)
+    
+    def get_ticker_price(self, symbol: str) -> Optional[float]:
+        """
+        Anlık fiyat al (güçlendirilmiş hata kontrolü ile)
+        
+        Returns:
+            float: Geçerli fiyat
+            None: Hata durumunda veya geçersiz veri
+        """
+        try:
+            response = self._request("GET", "/v1/ticker/price", {"symbol": symbol})
         except Exception as e:
             self.logger.error(f"❌ Unexpected error getting price for {symbol}: {e}")
             # Detaylı stack trace
-            import traceback
             self.logger.error(traceback.format_exc())
             return None
+        return self._parse_ticker_price(symbol, response)
     
-    def get_klines(self, symbol: str, interval: str, limit: int = 100) -> List[List]:
+    def get_all_prices(self) -> Dict[str, float]:
+        """
+        Tüm sembollerin anlık fiyatını tek istekte al
+        
+        Returns:
+            Dict[str, float]: {symbol: price}, hata durumunda {}
+        """
+        try:
+            response = self._request("GET", "/v1/ticker/price")
+        except Exception as e:
+            self.logger.error(f"❌ Error getting bulk prices: {e}")
+            return {}
+        return self._parse_all_prices(response)
+    
+    def get_klines(self, symbol: str, interval: str, limit: int = 100,
+                   start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[List]:
         """
         Kline/Candlestick verisi al (güçlendirilmiş veri kontrolü ile)
         
@@ -398,41 +952,73 @@ class BinanceFuturesTestnetAPI:
                 "interval": interval,
                 "limit": limit
             }
+            if start_time is not None:
+                params["startTime"] = start_time
+            if end_time is not None:
+                params["endTime"] = end_time
             response = self._request("GET", "/v1/klines", params)
-            
-            # GÜÇLENDİRİLMİŞ KONTROL: Liste mi, boş değil mi, geçerli mi?
-            if response and isinstance(response, list) and len(response) > 0:
-                # Her kline'ın en az 6 element olduğundan emin ol
-                valid_klines = []
-                for kline in response:
-                    if kline and isinstance(kline, list) and len(kline) >= 6:
-                        valid_klines.append(kline)
-                    else:
-                        self.logger.warning(f"⚠️  Invalid kline format skipped for {symbol}")
-                
-                if len(valid_klines) > 0:
-                    return valid_klines
-                else:
-                    self.logger.warning(f"⚠️  No valid klines found for {symbol}")
-                    return []
-            else:
-                self.logger.warning(f"⚠️  Received empty or invalid kline data for {symbol}")
-                return []
+            return self._parse_klines(symbol, response)
                 
         except Exception as e:
             self.logger.error(f"❌ Error getting klines for {symbol}: {e}")
             return []
     
+    def get_klines_array(self, symbol: str, interval: str, limit: int = 100,
+                         start_time: Optional[int] = None, end_time: Optional[int] = None) -> np.ndarray:
+        """
+        Kline verisi, kolonlu NumPy dizisi olarak (KLINE_DTYPE)
+        
+        Returns:
+            np.ndarray: open_time, OHLCV, trades... kolonları
+            Boş dizi: Hata durumunda veya boş veri
+        """
+        try:
+            params = {
+                "symbol": symbol,
+                "interval": interval,
+                "limit": limit
+            }
+            if start_time is not None:
+                params["startTime"] = start_time
+            if end_time is not None:
+                params["endTime"] = end_time
+            response = self._request("GET", "/v1/klines", params)
+            return self._parse_klines_array(symbol, response)
+        except Exception as e:
+            self.logger.error(f"❌ Error getting klines for {symbol}: {e}")
+            return np.empty(0, dtype=KLINE_DTYPE)
+    
+    def get_klines_page(self, symbol: str, interval: str, start_time: int, end_time: int,
+                        limit: int = 1000) -> List[List]:
+        """
+        [start_time, end_time] aralığındaki kline sayfası (ham yanıt)
+        
+        get_klines'tan farklı olarak hata yutulmaz: boş liste "bu aralıkta mum yok" demektir.
+        """
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_time,
+            "endTime": end_time,
+            "limit": limit
+        }
+        return self._expect_list(self._request("GET", "/v1/klines", params))
+    
+    def get_leverage_brackets(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Notional kademeleri (maintMarginRatio, cum); symbol yoksa tüm semboller"""
+        params = {"symbol": symbol} if symbol else None
+        response = self._request("GET", "/v1/leverageBracket", params, signed=True)
+        return [response] if isinstance(response, dict) else self._expect_list(response)
+    
     def set_leverage(self, symbol: str, leverage: int) -> Dict:
         """Leverage ayarla"""
         params = {
             "symbol": symbol,
             "leverage": leverage
         }
-        response = self._request("POST", "/v1/leverage", params, signed=True)
-        if isinstance(response, dict):
-            return response
-        raise ValueError("Invalid response format")
+        result = self._expect_dict(self._request("POST", "/v1/leverage", params, signed=True))
+        self.symbol_settings.leverage[symbol] = int(result.get("leverage", leverage))
+        return result
     
     def set_margin_type(self, symbol: str, margin_type: str) -> Dict:
         """Margin tipini ayarla (ISOLATED veya CROSSED)"""
@@ -440,37 +1026,128 @@ class BinanceFuturesTestnetAPI:
             "symbol": symbol,
             "marginType": margin_type
         }
-        response = self._request("POST", "/v1/marginType", params, signed=True)
-        if isinstance(response, dict):
-            return response
-        raise ValueError("Invalid response format")
+        try:
+            result = self._expect_dict(self._request("POST", "/v1/marginType", params, signed=True))
+        except BinanceAPIError as e:
+            if not self._margin_type_unchanged(e):
+                raise
+            result = {"code": -4046, "msg": str(e)}
+        self.symbol_settings.margin_type[symbol] = self.symbol_settings.normalize_margin_type(margin_type)
+        return result
+    
+    def ensure_leverage(self, symbol: str, leverage: int) -> bool:
+        """
+        Leverage farklıysa ayarla (önbellekte aynıysa istek atılmaz)
+        
+        Returns:
+            True: POST /v1/leverage gönderildi
+        """
+        if not self.symbol_settings.needs_leverage(symbol, leverage):
+            return False
+        self.set_leverage(symbol, leverage)
+        return True
+    
+    def ensure_margin_type(self, symbol: str, margin_type: str) -> bool:
+        """Margin tipi farklıysa ayarla (True: istek gönderildi)"""
+        if not self.symbol_settings.needs_margin_type(symbol, margin_type):
+            return False
+        self.set_margin_type(symbol, margin_type)
+        return True
     
     def place_order(self, symbol: str, side: str, order_type: str, 
                    quantity: float, price: Optional[float] = None, 
-                   stop_price: Optional[float] = None, reduce_only: bool = False) -> Dict:
+                   stop_price: Optional[float] = None, reduce_only: bool = False,
+                   client_order_id: Optional[str] = None) -> Dict:
         """Futures emri ver"""
-        params = {
-            "symbol": symbol,
-            "side": side,  # BUY veya SELL
-            "type": order_type,  # MARKET, LIMIT, STOP, STOP_MARKET, etc.
-            "quantity": quantity
-        }
+        params = self._build_order_params(symbol, side, order_type, quantity,
+                                          price, stop_price, reduce_only, client_order_id)
+        if self.ws_orders is not None:
+            order = self._place_order_ws(params)
+            if order is not None:
+                return order
+        return self._expect_dict(self._request("POST", "/v1/order", params, signed=True))
+    
+    def _place_order_ws(self, params: Dict) -> Optional[Dict]:
+        """
+        Emri kalıcı WebSocket bağlantısından gönder
         
-        if order_type == "LIMIT":
-            params["timeInForce"] = "GTC"  # Good Till Cancel
-            if price:
-                params["price"] = price
+        Returns:
+            Emir dict'i; None ise emir borsaya ulaşmadı ve REST ile gönderilmeli
+        """
+        self._check_rate_limit(0, 1)
+        try:
+            future = self.ws_orders.submit("order.place", self._ws_order_params(params))
+        except ConnectionError:
+            self.ws_orders.stats["fallbacks"] += 1
+            return None
         
-        if order_type in ["STOP", "STOP_MARKET"] and stop_price:
-            params["stopPrice"] = stop_price
-            
-        if reduce_only:
-            params["reduceOnly"] = "true"
-            
-        response = self._request("POST", "/v1/order", params, signed=True)
-        if isinstance(response, dict):
-            return response
-        raise ValueError("Invalid response format")
+        try:
+            response = future.result(timeout=self.ws_orders.timeout)
+        except (FutureTimeoutError, ConnectionError):
+            # İstek gitti ama yanıt yok: emir açılmış olabilir, tekrar göndermeden önce sorgula
+            future.cancel()
+            self.ws_orders.stats["unanswered"] += 1
+            return self._recover_ws_order(params)
+        
+        order = self._ws_order_result(response)
+        return order if order is not None else self._recover_ws_order(params)
+    
+    def place_orders_batch(self, orders: List[Dict]) -> List[Union[Dict, BinanceAPIError]]:
+        """
+        Birden fazla emri /v1/batchOrders ile gönder (istek başına en fazla 5)
+        
+        Args:
+            orders: place_order argümanları (symbol, side, order_type, quantity, ...)
+        
+        Returns:
+            Girişle aynı sırada: emir dict'i veya o emrin hatası (BinanceAPIError)
+        """
+        results = []
+        for chunk in self._batch_chunks(orders):
+            results.extend(self._place_batch_chunk(chunk))
+        return results
+    
+    def _place_batch_chunk(self, chunk: List[Dict]) -> List[Union[Dict, BinanceAPIError]]:
+        try:
+            response = self._request("POST", "/v1/batchOrders", self._batch_request_params(chunk),
+                                     signed=True, orders=len(chunk))
+        except CircuitOpenError as e:
+            return [e] * len(chunk)
+        except NetworkError as e:
+            # Sonuç belirsiz: tekrar göndermeden önce emirleri clientOrderId ile sorgula
+            return [self._recover_batch_order(params, e) for params in chunk]
+        except BinanceAPIError as e:
+            return [e] * len(chunk)
+        return self._batch_results(chunk, response)
+    
+    def _recover_batch_order(self, params: Dict, error: BinanceAPIError) -> Union[Dict, BinanceAPIError]:
+        """Sonucu belirsiz batch emrini bul; borsada yoksa orijinal hata döner"""
+        try:
+            return self.get_order(params["symbol"], client_order_id=params["newClientOrderId"])
+        except InvalidOrderError:
+            # "Order does not exist": emir borsaya ulaşmamış
+            return error
+        except BinanceAPIError as e:
+            return e
+    
+    def _recover_ws_order(self, params: Dict) -> Optional[Dict]:
+        """Sonucu belirsiz WebSocket emrini clientOrderId ile bul; yoksa None (REST'e düşülür)"""
+        self.ws_orders.stats["fallbacks"] += 1
+        try:
+            return self.get_order(params["symbol"], client_order_id=params["newClientOrderId"])
+        except InvalidOrderError:
+            # "Order does not exist": emir borsaya ulaşmamış
+            return None
+    
+    def get_order(self, symbol: str, order_id: Optional[int] = None,
+                  client_order_id: Optional[str] = None) -> Dict:
+        """Emir durumunu sorgula (orderId veya clientOrderId ile)"""
+        params = {"symbol": symbol}
+        if order_id is not None:
+            params["orderId"] = order_id
+        if client_order_id is not None:
+            params["origClientOrderId"] = client_order_id
+        return self._expect_dict(self._request("GET", "/v1/order", params, signed=True))
     
     def cancel_order(self, symbol: str, order_id: int) -> Dict:
         """Emri iptal et"""
@@ -478,28 +1155,19 @@ class BinanceFuturesTestnetAPI:
             "symbol": symbol,
             "orderId": order_id
         }
-        response = self._request("DELETE", "/v1/order", params, signed=True)
-        if isinstance(response, dict):
-            return response
-        raise ValueError("Invalid response format")
+        return self._expect_dict(self._request("DELETE", "/v1/order", params, signed=True))
     
     def cancel_all_orders(self, symbol: str) -> Dict:
         """Sembol için tüm açık emirleri iptal et"""
         params = {"symbol": symbol}
-        response = self._request("DELETE", "/v1/allOpenOrders", params, signed=True)
-        if isinstance(response, dict):
-            return response
-        raise ValueError("Invalid response format")
+        return self._expect_dict(self._request("DELETE", "/v1/allOpenOrders", params, signed=True))
     
     def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
         """Açık emirleri al"""
         params = {}
         if symbol:
             params["symbol"] = symbol
-        response = self._request("GET", "/v1/openOrders", params, signed=True)
-        if isinstance(response, list):
-            return response
-        raise ValueError("Invalid response format")
+        return self._expect_list(self._request("GET", "/v1/openOrders", params, signed=True))
     
     def get_order_history(self, symbol: str, limit: int = 100) -> List[Dict]:
         """Emir geçmişini al"""
@@ -507,33 +1175,17 @@ class BinanceFuturesTestnetAPI:
             "symbol": symbol,
             "limit": limit
         }
-        response = self._request("GET", "/v1/allOrders", params, signed=True)
-        if isinstance(response, list):
-            return response
-        raise ValueError("Invalid response format")
+        return self._expect_list(self._request("GET", "/v1/allOrders", params, signed=True))
     
     def close_position(self, symbol: str) -> Dict:
         """Pozisyonu market emriyle kapat"""
         # Önce mevcut pozisyonu kontrol et
-        positions = self.get_positions()
-        position = None
-        
-        for pos in positions:
-            if pos["symbol"] == symbol and float(pos["positionAmt"]) != 0:
-                position = pos
-                break
+        position = self._find_open_position(self.get_positions(), symbol)
         
         if not position:
             raise ValueError(f"No open position found for {symbol}")
         
-        position_amt = float(position["positionAmt"])
-        
-        # Pozisyon kapatma emri (ters yönde)
-        if position_amt > 0:  # Long pozisyon
-            side = "SELL"
-        else:  # Short pozisyon
-            side = "BUY"
-            position_amt = abs(position_amt)
+        side, position_amt = self._close_order_side(position)
         
         return self.place_order(
             symbol=symbol,
@@ -543,84 +1195,49 @@ class BinanceFuturesTestnetAPI:
             reduce_only=True
         )
     
-    def start_price_stream(self, symbols: List[str]):
-        """Futures fiyat akışını başlat"""
-        def on_message(ws, message):
-            data = json.loads(message)
-            if 'data' in data:
-                symbol = data['data']['s']
-                price = float(data['data']['c'])
-                self.price_data[symbol] = {
-                    'price': price,
-                    'timestamp': datetime.now(timezone.utc),
-                    'volume': float(data['data']['v']),
-                    'mark_price': float(data['data'].get('p', price))  # Mark price
-                }
-                self.logger.debug(f"{symbol}: ${price:.4f}")
-        
-        def on_error(ws, error):
-            self.logger.error(f"WebSocket error: {error}")
-        
-        def on_close(ws, close_status_code, close_msg):
-            self.logger.info("WebSocket connection closed")
-        
-        # Futures stream URL
-        stream_names = [f"{symbol.lower()}@ticker" for symbol in symbols]
-        stream_url = f"wss://fstream.binancefuture.com/stream?streams={'/'.join(stream_names)}"
-        
-        ws = websocket.WebSocketApp(
-            stream_url,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close
-        )
-        
-        # WebSocket'i ayrı thread'de başlat
-        def run_ws():
-            ws.run_forever()
-            
-        ws_thread = threading.Thread(target=run_ws, daemon=True)
-        ws_thread.start()
-        
-        self.ws_connections['price_stream'] = ws
-        self.logger.info(f"Futures price stream started for {len(symbols)} symbols")
+    def create_listen_key(self) -> str:
+        """User data stream listenKey oluştur (60 dk geçerli, imza gerekmez)"""
+        return self._expect_dict(self._request("POST", "/v1/listenKey"))["listenKey"]
     
-    def get_latest_price(self, symbol: str) -> Optional[float]:
-        """En son fiyatı al (WebSocket'ten)"""
-        if symbol in self.price_data:
-            return self.price_data[symbol]['price']
-        return None
+    def keepalive_listen_key(self) -> Dict:
+        """listenKey süresini 60 dk uzat"""
+        return self._expect_dict(self._request("PUT", "/v1/listenKey"))
+    
+    def close_listen_key(self) -> Dict:
+        """User data stream'i kapat"""
+        return self._expect_dict(self._request("DELETE", "/v1/listenKey"))
+    
+    def refresh_premium_index(self) -> PremiumIndexSnapshot:
+        """Tüm semboller için premiumIndex'i tek istekle al (weight 10)"""
+        self.premium_index.update_from_rest(self._expect_list(self._request("GET", "/v1/premiumIndex")))
+        return self.premium_index
+    
+    def get_funding_rates(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Funding rate / mark price tablosu {symbol: kayıt}
+        
+        Snapshot'ta güncel olmayan sembol varsa tek toplu istekle yenilenir;
+        markPrice stream'i canlıyken istek atılmaz.
+        """
+        fresh = self.premium_index.fresh_entries(symbols)
+        if self._missing_premium_entries(fresh, symbols):
+            fresh = self.refresh_premium_index().fresh_entries(symbols)
+        return fresh
     
     def get_funding_rate(self, symbol: str) -> Dict:
-        """Funding rate bilgisini al"""
-        params = {"symbol": symbol}
-        response = self._request("GET", "/v1/premiumIndex", params)
-        if isinstance(response, dict):
-            return {
-                'funding_rate': float(response.get('lastFundingRate', 0)),
-                'next_funding_time': response.get('nextFundingTime', 0),
-                'mark_price': float(response.get('markPrice', 0))
-            }
-        raise ValueError("Invalid response format")
+        """Funding rate bilgisini al (premium index snapshot'ından)"""
+        entry = self.premium_index.get(symbol)
+        if entry is None:
+            entry = self.refresh_premium_index().get(symbol)
+        return self._funding_rate_view(symbol, entry)
     
     def get_position(self, symbol: str) -> Optional[Dict]:
-        """Belirli bir sembol için pozisyon bilgisi al"""
-        positions = self.get_positions()
-        for pos in positions:
-            if pos["symbol"] == symbol and float(pos.get("positionAmt", 0)) != 0:
-                return pos
-        return None
+        """Belirli bir sembol için pozisyon bilgisi al (account snapshot'ından)"""
+        return self.get_account_snapshot(self.account_snapshot_max_age).get_position(symbol)
     
     def get_current_price(self, symbol: str) -> Optional[float]:
         """Anlık fiyat al (get_ticker_price'ın alias'ı)"""
         return self.get_ticker_price(symbol)
-    
-    def stop_all_streams(self):
-        """Tüm WebSocket bağlantılarını kapat"""
-        for ws in self.ws_connections.values():
-            ws.close()
-        self.ws_connections.clear()
-        self.logger.info("All WebSocket streams stopped")
 
 
 # Test fonksiyonu
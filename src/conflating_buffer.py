@@ -0,0 +1,114 @@
+"""
+Conflating Buffer
+WebSocket thread'inden asyncio loop'una sembol bazlı birleştiren event aktarımı
+
+FEATURES:
+- (sembol, event tipi) başına tek slot: teslim edilmemiş tick'in üzerine yenisi
+  yazılır (ticker, açık kline, markPrice); birikme sembol x tip ile sınırlı
+- Kapanan kline'lar ve gap bildirimleri hiç birleştirilmez, geliş sırasıyla
+  teslim edilir (gap, onu ortaya çıkaran kline'dan önce); aynı mumun bekleyen
+  ara güncellemesi kapanışla birlikte düşer
+- Hacim alanları kümülatif (açık mumun hacmi, 24 saatlik ticker hacmi): son event
+  aradaki tick'lerin hacmini zaten içerir, birleştirmede hacim kaybolmaz
+- Loop'a aynı anda en fazla bir drain callback'i planlanır (call_soon_threadsafe
+  mesaj başına değil, tampon boşken bir kez)
+- Sayaçlar: received, delivered, dropped (üzerine yazılan), lag_ms / max_lag_ms
+  (ilk teslim edilmeyen tick'in alınmasından teslimine kadar geçen süre)
+"""
+
+import logging
+import threading
+import time
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ConflatingBuffer:
+    """Sembol bazlı birleştiren event tamponu (WebSocket thread -> loop thread)"""
+
+    def __init__(self, loop, on_event: Callable[[Dict], None],
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            loop: Event'lerin teslim edileceği asyncio loop
+            on_event: Loop thread'inde her event için çağrılır
+        """
+        self.loop = loop
+        self.on_event = on_event
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._latest: Dict[Tuple[str, str], Tuple[Dict, float]] = {}  # (symbol, type) -> (event, alındığı an)
+        self._ordered: List[Tuple[Dict, float]] = []  # kapanan kline'lar (birleştirilmez)
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+        self.stats = {"received": 0, "delivered": 0, "dropped": 0, "drains": 0,
+                      "max_pending": 0, "lag_ms": 0.0, "max_lag_ms": 0.0}
+
+    @staticmethod
+    def conflation_key(event: Dict) -> Optional[Tuple[str, str]]:
+        """Birleştirilebilir event'in slotu; None: sırayla teslim edilir"""
+        if event["type"] == "gap" or (event["type"] == "kline" and event["closed"]):
+            return None
+        return event["symbol"], event["type"]
+
+    @property
+    def pending(self) -> int:
+        return len(self._ordered) + len(self._latest)
+
+    def put(self, event: Dict) -> bool:
+        """
+        Event'i tampona ekle (WebSocket thread'inde çalışır)
+
+        Returns:
+            False: loop kapandı (shutdown)
+        """
+        received_at = time.monotonic()
+        key = self.conflation_key(event)
+        with self._lock:
+            self.stats["received"] += 1
+            if key is None:
+                self._ordered.append((event, received_at))
+                # Kapanışla eskiyen aynı mumun ara güncellemesi teslim edilmez
+                partial = self._latest.get((event["symbol"], "kline")) if event["type"] == "kline" else None
+                if partial is not None and partial[0]["open_time"] <= event["open_time"]:
+                    del self._latest[(event["symbol"], "kline")]
+                    self.stats["dropped"] += 1
+            else:
+                previous = self._latest.get(key)
+                if previous is not None:
+                    # Gecikme ilk teslim edilmeyen tick'ten ölçülür
+                    received_at = previous[1]
+                    self.stats["dropped"] += 1
+                self._latest[key] = (event, received_at)
+            self.stats["max_pending"] = max(self.stats["max_pending"], self.pending)
+            if self._scheduled:
+                return True
+            self._scheduled = True
+        try:
+            self.loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            return False
+        return True
+
+    def _drain(self):
+        """Bekleyen event'leri teslim et (loop thread'inde çalışır)"""
+        with self._lock:
+            ordered, self._ordered = self._ordered, []
+            latest, self._latest = self._latest, {}
+            self._scheduled = False
+
+        now = time.monotonic()
+        lag = 0.0
+        for event, received_at in chain(ordered, latest.values()):
+            lag = max(lag, now - received_at)
+            try:
+                self.on_event(event)
+            except Exception as e:
+                self.logger.error(f"❌ Market event handler error ({event['type']} {event['symbol']}): {e}")
+
+        lag_ms = lag * 1000
+        self.stats["drains"] += 1
+        self.stats["delivered"] += len(ordered) + len(latest)
+        self.stats["lag_ms"] = round(lag_ms, 2)
+        self.stats["max_lag_ms"] = round(max(self.stats["max_lag_ms"], lag_ms), 2)
@@ -0,0 +1,101 @@
+"""
+Exchange Metadata Cache
+/v1/exchangeInfo yanıtını TTL ile önbelleğe alır ve sembol bazlı indeksler
+
+FEATURES:
+- Sembol bilgisine O(1) erişim (dict index)
+- LOT_SIZE / PRICE_FILTER / MIN_NOTIONAL filtrelerinden türetilmiş tablolar
+- Step size ve tick size'a göre Decimal ile güvenli yuvarlama
+- Thread-safe güncelleme (tablolar atomik olarak değiştirilir)
+"""
+
+import time
+from decimal import Decimal, ROUND_DOWN
+from typing import Dict, Optional
+
+
+class ExchangeInfoCache:
+    """Exchange bilgisi önbelleği ve türetilmiş filtre tabloları"""
+
+    DEFAULT_TTL = 3600  # saniye
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.loaded_at = 0.0
+        self.symbols: Dict[str, Dict] = {}
+        self.step_sizes: Dict[str, Decimal] = {}
+        self.tick_sizes: Dict[str, Decimal] = {}
+        self.min_quantities: Dict[str, Decimal] = {}
+        self.min_notionals: Dict[str, float] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at > 0
+
+    def is_stale(self) -> bool:
+        """TTL doldu mu (hiç yüklenmediyse True)"""
+        return time.time() - self.loaded_at >= self.ttl
+
+    def update(self, payload: Dict):
+        """exchangeInfo yanıtından indeksleri yeniden oluştur"""
+        symbols = {}
+        step_sizes = {}
+        tick_sizes = {}
+        min_quantities = {}
+        min_notionals = {}
+
+        for info in payload.get("symbols", []):
+            symbol = info["symbol"]
+            symbols[symbol] = info
+            for f in info.get("filters", []):
+                filter_type = f.get("filterType")
+                if filter_type == "LOT_SIZE":
+                    step_sizes[symbol] = Decimal(f["stepSize"])
+                    min_quantities[symbol] = Decimal(f["minQty"])
+                elif filter_type == "PRICE_FILTER":
+                    tick_sizes[symbol] = Decimal(f["tickSize"])
+                elif filter_type == "MIN_NOTIONAL":
+                    # Futures "notional", spot "minNotional" kullanır
+                    min_notionals[symbol] = float(f.get("notional", f.get("minNotional", 0)))
+
+        # Okuyucular (dashboard thread'i) yarım tablo görmesin
+        self.symbols = symbols
+        self.step_sizes = step_sizes
+        self.tick_sizes = tick_sizes
+        self.min_quantities = min_quantities
+        self.min_notionals = min_notionals
+        self.loaded_at = time.time()
+
+    def get(self, symbol: str) -> Dict:
+        """Sembol bilgisini al"""
+        try:
+            return self.symbols[symbol]
+        except KeyError:
+            raise ValueError(f"Symbol {symbol} not found")
+
+    def has_filters(self, symbol: str) -> bool:
+        return symbol in self.step_sizes
+
+    @staticmethod
+    def _floor_to_step(value: float, step: Decimal) -> float:
+        if step <= 0:
+            return value
+        steps = (Decimal(str(value)) / step).to_integral_value(rounding=ROUND_DOWN)
+        return float(steps * step)
+
+    def round_quantity(self, symbol: str, quantity: float) -> float:
+        """Miktarı LOT_SIZE step size'a aşağı yuvarla"""
+        step = self.step_sizes.get(symbol)
+        if step is None:
+            return quantity
+        return self._floor_to_step(quantity, step)
+
+    def round_price(self, symbol: str, price: float) -> float:
+        """Fiyatı PRICE_FILTER tick size'a aşağı yuvarla"""
+        tick = self.tick_sizes.get(symbol)
+        if tick is None:
+            return price
+        return self._floor_to_step(price, tick)
+
+    def min_notional(self, symbol: str) -> Optional[float]:
+        return self.min_notionals.get(symbol)
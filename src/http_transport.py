@@ -0,0 +1,241 @@
+"""
+HTTP Transport Katmanı
+BinanceFuturesTestnetAPI altındaki değiştirilebilir HTTP client
+
+FEATURES:
+- create_http_transport("auto"): httpx kuruluysa httpx (h2 kuruluysa HTTP/2
+  multiplexing: eşzamanlı istekler tek bağlantıyı paylaşır), yoksa requests
+- Ortak exception'lar: retry kararı için isteğin sunucuya gidip gitmediği
+  transport'tan bağımsız ayrıştırılır
+- Bağlantı sayaçları: handshakes (yeni bağlantı), reused, warm_pings
+- warm(): boşta kalan bağlantıyı hafif bir istekle sıcak tutar (zamanlama client'ta)
+
+Yanıt nesneleri status_code, headers ve content sağlar (requests.Response /
+httpx.Response).
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 desteği)
+    HTTP2_AVAILABLE = httpx is not None
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class TransportError(Exception):
+    """Sınıflandırılamayan transport hatası (retry yapılmaz)"""
+    pass
+
+class ConnectTimeout(TransportError):
+    """Bağlantı kurulamadı: istek sunucuya ulaşmadı"""
+    pass
+
+class ReadTimeout(TransportError):
+    """Yanıt zamanında gelmedi: istek işlenmiş olabilir"""
+    pass
+
+class ConnectionFailed(TransportError):
+    """Bağlantı hatası; request_sent=False ise istek hiç gönderilmedi"""
+
+    def __init__(self, message: str, request_sent: bool = True):
+        super().__init__(message)
+        self.request_sent = request_sent
+
+
+class HTTPTransport:
+    """Transport arayüzü ve ortak sayaçlar"""
+
+    name = "base"
+
+    def __init__(self):
+        self.last_used = time.time()
+        self._requests = 0
+        self._warm_pings = 0
+
+    @property
+    def protocol(self) -> str:
+        return "HTTP/1.1"
+
+    def request(self, method: str, url: str, params: Dict, timeout: float) -> Any:
+        """
+        Tek HTTP isteği
+
+        Raises:
+            ConnectTimeout / ReadTimeout / ConnectionFailed / TransportError
+        """
+        self._requests += 1
+        self.last_used = time.time()
+        return self._send(method, url, params, timeout)
+
+    def warm(self, url: str, timeout: float):
+        """Boştaki bağlantıyı sıcak tut (yanıt kullanılmaz)"""
+        self._warm_pings += 1
+        self.last_used = time.time()
+        self._send("GET", url, {}, timeout)
+
+    def _send(self, method: str, url: str, params: Dict, timeout: float) -> Any:
+        raise NotImplementedError
+
+    def _handshakes(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def stats(self) -> Dict:
+        handshakes = self._handshakes()
+        return {
+            "transport": self.name,
+            "protocol": self.protocol,
+            "requests": self._requests,
+            "warm_pings": self._warm_pings,
+            "handshakes": handshakes,
+            "reused": max(0, self._requests + self._warm_pings - handshakes),
+        }
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(HTTPTransport):
+    """requests.Session (HTTP/1.1, urllib3 connection pool)"""
+
+    name = "requests"
+
+    def __init__(self, headers: Dict[str, str], pool_maxsize: int = 20, **_):
+        super().__init__()
+        # Retry'lar yalnızca RetryPolicy'de
+        self.adapter = HTTPAdapter(max_retries=0, pool_connections=10, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.session.headers.update(headers)
+
+        # Bağlantı sayacı: urllib3 kopan bağlantıyı aynı nesne üzerinden yeniden
+        # kurar (num_connections artmaz), bu yüzden connect() sayılır
+        self._connects = 0
+        transport = self
+
+        class CountingHTTPConnection(HTTPConnection):
+            def connect(self):
+                transport._connects += 1
+                super().connect()
+
+        class CountingHTTPSConnection(HTTPSConnection):
+            def connect(self):
+                transport._connects += 1
+                super().connect()
+
+        self.adapter.poolmanager.pool_classes_by_scheme = {
+            "http": type("CountingHTTPConnectionPool", (HTTPConnectionPool,),
+                         {"ConnectionCls": CountingHTTPConnection}),
+            "https": type("CountingHTTPSConnectionPool", (HTTPSConnectionPool,),
+                          {"ConnectionCls": CountingHTTPSConnection}),
+        }
+
+    def _send(self, method: str, url: str, params: Dict, timeout: float) -> requests.Response:
+        try:
+            return self.session.request(method, url, params=params, timeout=timeout)
+        except requests.exceptions.ConnectTimeout as e:
+            raise ConnectTimeout(str(e)) from e
+        except requests.exceptions.Timeout as e:
+            raise ReadTimeout(str(e)) from e
+        except requests.exceptions.ConnectionError as e:
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            raise ConnectionFailed(str(e), request_sent=not isinstance(reason, NewConnectionError)) from e
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def _handshakes(self) -> int:
+        return self._connects
+
+    def close(self):
+        self.session.close()
+
+
+class HttpxTransport(HTTPTransport):
+    """httpx.Client (h2 kuruluysa HTTP/2: tek bağlantı üzerinde multiplexing)"""
+
+    name = "httpx"
+
+    def __init__(self, headers: Dict[str, str], pool_maxsize: int = 20,
+                 http2: bool = True, keepalive_expiry: float = 120.0, **_):
+        super().__init__()
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.client = httpx.Client(
+            http2=self.http2,
+            headers=headers,
+            limits=httpx.Limits(max_connections=pool_maxsize,
+                                max_keepalive_connections=pool_maxsize,
+                                keepalive_expiry=keepalive_expiry),
+        )
+        self._connects = 0
+        self._http_version: Optional[str] = None
+        self._extensions = {"trace": self._trace}
+
+    @property
+    def protocol(self) -> str:
+        return self._http_version or ("HTTP/2" if self.http2 else "HTTP/1.1")
+
+    def _trace(self, event: str, info: Dict):
+        if event == "connection.connect_tcp.complete":
+            self._connects += 1
+
+    def _send(self, method: str, url: str, params: Dict, timeout: float) -> "httpx.Response":
+        try:
+            response = self.client.request(method, url, params=params, timeout=timeout,
+                                           extensions=self._extensions)
+        except (httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            raise ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise ReadTimeout(str(e)) from e
+        except httpx.ConnectError as e:
+            raise ConnectionFailed(str(e), request_sent=False) from e
+        except (httpx.NetworkError, httpx.ProtocolError) as e:
+            raise ConnectionFailed(str(e), request_sent=True) from e
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+        self._http_version = response.http_version
+        return response
+
+    def _handshakes(self) -> int:
+        return self._connects
+
+    def close(self):
+        self.client.close()
+
+
+HTTP_TRANSPORTS = {"requests": RequestsTransport}
+if httpx is not None:
+    HTTP_TRANSPORTS["httpx"] = HttpxTransport
+
+# "auto" seçim sırası
+TRANSPORT_PREFERENCE = ("httpx", "requests")
+
+
+def create_http_transport(name: str = "requests", **options) -> HTTPTransport:
+    """
+    İsimle transport oluştur
+
+    Args:
+        name: "requests", "httpx" veya "auto" (kurulu en uygun transport)
+        options: headers, pool_maxsize, http2, keepalive_expiry
+    """
+    if name == "auto":
+        name = next(n for n in TRANSPORT_PREFERENCE if n in HTTP_TRANSPORTS)
+    try:
+        transport_cls = HTTP_TRANSPORTS[name]
+    except KeyError:
+        raise ValueError(f"HTTP transport not available: {name} (pip install httpx[http2])")
+    return transport_cls(**options)
@@ -0,0 +1,217 @@
+"""
+Streaming Indicators
+Her yeni fiyatta bir kez güncellenen SMA, RSI ve Bollinger Bands
+
+FEATURES:
+- SMA: kayan toplam (çıkan değer düşülür, giren eklenir)
+- RSI: pencere içindeki değişimlerin kayan kazanç / kayıp toplamları
+- Bollinger: kayan ortalama + kayan kare sapma toplamı (Welford'un kayan pencere
+  güncellemesi; sum / sum-of-squares farkındaki sayısal iptal yok)
+- Güncelleme başına maliyet periyottan bağımsız (O(1)); max(RESYNC_INTERVAL, period)
+  güncellemede bir toplamlar pencereden yeniden hesaplanır (kayan hata birikmez,
+  amortize maliyet güncelleme başına en fazla bir pencere elemanı)
+
+Sonuçlar MTFTradingStrategy'nin pencere üzerinden hesapladığı değerlerle aynıdır
+(kayan nokta toleransında): RSI basit ortalamalı (Wilder yumuşatması değil),
+Bollinger popülasyon standart sapması kullanır.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+RESYNC_INTERVAL = 1000
+
+
+class RollingSMA:
+    """Son period fiyatın basit ortalaması"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque = deque(maxlen=period)
+        self.total = 0.0
+        self._updates = 0
+        self._resync_every = max(RESYNC_INTERVAL, period)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period
+
+    def update(self, price: float):
+        window = self.window
+        if len(window) == self.period:
+            self.total -= window[0]
+        window.append(price)
+        self.total += price
+        self._tick()
+
+    def extend(self, prices: Sequence[float]):
+        """Toplu ekleme: pencereden uzunsa yalnızca son period değerden yeniden kurulur"""
+        if len(prices) >= self.period:
+            self.window.clear()
+            self.window.extend(float(p) for p in prices[-self.period:])
+            self._resync()
+        else:
+            for price in prices:
+                self.update(float(price))
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.ready:
+            return None
+        return self.total / self.period
+
+    def reset(self):
+        self.window.clear()
+        self._resync()
+
+    def _tick(self):
+        self._updates += 1
+        if self._updates % self._resync_every == 0:
+            self._resync()
+
+    def _resync(self):
+        self.total = math.fsum(self.window)
+
+
+class RollingBollinger(RollingSMA):
+    """Son period fiyatın ortalaması ± num_std * popülasyon standart sapması"""
+
+    def __init__(self, period: int, num_std: float):
+        self.num_std = num_std
+        self.m2 = 0.0  # Ortalamadan kare sapmaların toplamı
+        super().__init__(period)
+
+    def update(self, price: float):
+        window = self.window
+        count = len(window)
+        old_mean = self.total / count if count else 0.0
+        if count == self.period:
+            outgoing = window[0]
+            window.append(price)
+            self.total += price - outgoing
+            new_mean = self.total / count
+            self.m2 += (price - outgoing) * (price - new_mean + outgoing - old_mean)
+        else:
+            window.append(price)
+            self.total += price
+            new_mean = self.total / (count + 1)
+            self.m2 += (price - old_mean) * (price - new_mean)
+        self._tick()
+
+    @property
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        """(upper, middle, lower)"""
+        if not self.ready:
+            return None
+        middle = self.total / self.period
+        std = (max(self.m2, 0.0) / self.period) ** 0.5
+        return middle + std * self.num_std, middle, middle - std * self.num_std
+
+    def _resync(self):
+        super()._resync()
+        if self.window:
+            mean = self.total / len(self.window)
+            self.m2 = math.fsum((p - mean) ** 2 for p in self.window)
+        else:
+            self.m2 = 0.0
+
+
+class RollingRSI:
+    """Son period fiyat değişiminin ortalama kazanç / kayıp oranından RSI"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.changes: deque = deque(maxlen=period)
+        self.last_price: Optional[float] = None
+        self.gains = 0.0
+        self.losses = 0.0  # Pozitif tutulur
+        # Penceredeki pozitif / negatif değişim sayısı: toplam tam 0 ise kayan hata taşımaz
+        self._gain_count = 0
+        self._loss_count = 0
+        self._updates = 0
+        self._resync_every = max(RESYNC_INTERVAL, period)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.changes) == self.period
+
+    def update(self, price: float):
+        if self.last_price is not None:
+            changes = self.changes
+            if len(changes) == self.period:
+                outgoing = changes[0]
+                if outgoing > 0:
+                    self.gains -= outgoing
+                    self._gain_count -= 1
+                elif outgoing < 0:
+                    self.losses += outgoing
+                    self._loss_count -= 1
+            change = price - self.last_price
+            changes.append(change)
+            if change > 0:
+                self.gains += change
+                self._gain_count += 1
+            elif change < 0:
+                self.losses -= change
+                self._loss_count += 1
+            self._updates += 1
+            if self._updates % self._resync_every == 0:
+                self._resync()
+        self.last_price = price
+
+    def extend(self, prices: Sequence[float]):
+        """Toplu ekleme: pencereden uzunsa yalnızca son period + 1 fiyattan yeniden kurulur"""
+        if len(prices) > self.period:
+            tail = [float(p) for p in prices[-(self.period + 1):]]
+            self.changes.clear()
+            self.changes.extend(b - a for a, b in zip(tail, tail[1:]))
+            self.last_price = tail[-1]
+            self._resync()
+        else:
+            for price in prices:
+                self.update(float(price))
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.ready:
+            return None
+        if self._loss_count == 0:
+            return 100
+        avg_gain = self.gains / self.period if self._gain_count else 0.0
+        avg_loss = self.losses / self.period
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def reset(self):
+        self.changes.clear()
+        self.last_price = None
+        self._resync()
+
+    def _resync(self):
+        self.gains = math.fsum(c for c in self.changes if c > 0)
+        self.losses = -math.fsum(c for c in self.changes if c < 0)
+        self._gain_count = sum(1 for c in self.changes if c > 0)
+        self._loss_count = sum(1 for c in self.changes if c < 0)
+
+
+class SymbolIndicators:
+    """Bir sembolün stratejide kullanılan indikatörleri (fiyat başına tek güncelleme)"""
+
+    def __init__(self, sma_periods: Iterable[int], rsi_period: int,
+                 bb_period: int, bb_std: float):
+        self.sma: Dict[int, RollingSMA] = {period: RollingSMA(period) for period in set(sma_periods)}
+        self.rsi = RollingRSI(rsi_period)
+        self.bollinger = RollingBollinger(bb_period, bb_std)
+
+    def update(self, price: float):
+        for sma in self.sma.values():
+            sma.update(price)
+        self.rsi.update(price)
+        self.bollinger.update(price)
+
+    def extend(self, prices: Sequence[float]):
+        for sma in self.sma.values():
+            sma.extend(prices)
+        self.rsi.extend(prices)
+        self.bollinger.extend(prices)
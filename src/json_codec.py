@@ -0,0 +1,108 @@
+"""
+JSON Decoder Katmanı
+REST yanıtları ve stream mesajları için değiştirilebilir JSON decoder
+
+FEATURES:
+- get_json_decoder("auto"): kuruluysa orjson, sonra ujson, yoksa stdlib json
+- register_json_decoder ile başka decoder eklenebilir
+- extract_stream_payload: combined stream mesajından yalnızca gereken alanları
+  tek regex taramasıyla çıkarır. Hızlı decoder kurulu değilken tam decode'dan
+  ucuzdur; eşleşmezse None döner ve tam decode'a düşülür.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Optional, Union
+
+JsonDecoder = Callable[[Union[str, bytes]], Any]
+
+JSON_DECODERS: Dict[str, JsonDecoder] = {"json": json.loads}
+
+try:
+    import orjson
+    JSON_DECODERS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import ujson
+    JSON_DECODERS["ujson"] = ujson.loads
+except ImportError:
+    pass
+
+# "auto" seçim sırası (hızlıdan yavaşa)
+DECODER_PREFERENCE = ("orjson", "ujson", "json")
+
+
+def register_json_decoder(name: str, loads: JsonDecoder):
+    """Yeni decoder ekle (str ve bytes kabul etmeli, hatada ValueError vermeli)"""
+    JSON_DECODERS[name] = loads
+
+
+def get_json_decoder(name: str = "auto") -> JsonDecoder:
+    """İsimle decoder al; "auto" kurulu en hızlı decoder'ı seçer"""
+    if name == "auto":
+        for candidate in DECODER_PREFERENCE:
+            if candidate in JSON_DECODERS:
+                return JSON_DECODERS[candidate]
+    try:
+        return JSON_DECODERS[name]
+    except KeyError:
+        raise ValueError(f"JSON decoder not available: {name}")
+
+
+json_loads = get_json_decoder()
+FAST_JSON = json_loads is not json.loads
+
+
+# Stream alan çıkarma: Binance'in belgelenmiş alan sırası varsayılır, aradaki
+# alanlar atlanır. Eşleşmeyen mesajlar tam decode'a düşer.
+_TICKER = re.compile(
+    r'"e":"24hrTicker","E":(\d+),"s":"([^"]+)".*?"c":"([^"]+)".*?"v":"([^"]+)"'
+)
+_KLINE = re.compile(
+    r'"e":"kline","E":(\d+),"s":"([^"]+)","k":\{"t":(\d+),"T":(\d+).*?"i":"([^"]+)"'
+    r'.*?"o":"([^"]+)","c":"([^"]+)","h":"([^"]+)","l":"([^"]+)","v":"([^"]+)".*?"x":(true|false)'
+)
+_MARK_PRICE = re.compile(
+    r'"e":"markPriceUpdate","E":(\d+),"s":"([^"]+)","p":"([^"]+)".*?"i":"([^"]*)"'
+    r'.*?"r":"([^"]*)","T":(\d+)'
+)
+
+
+def extract_stream_payload(message: Union[str, bytes]) -> Optional[Dict]:
+    """
+    Combined stream mesajından gerekli alanları çıkar
+
+    Returns:
+        {'data': {...}} (parse_stream_message ile uyumlu, fiyatlar string)
+        veya None (bilinmeyen event / beklenmeyen format)
+    """
+    if isinstance(message, bytes):
+        message = message.decode()
+    pos = message.find('"e":"')
+    if pos < 0:
+        return None
+    kind = message[pos + 5:pos + 6]
+
+    if kind == "2":
+        match = _TICKER.search(message, pos)
+        if match:
+            event_time, symbol, close, volume = match.groups()
+            return {"data": {"e": "24hrTicker", "E": int(event_time), "s": symbol,
+                             "c": close, "v": volume}}
+    elif kind == "k":
+        match = _KLINE.search(message, pos)
+        if match:
+            (event_time, symbol, open_time, close_time, interval,
+             o, c, h, l, v, closed) = match.groups()
+            return {"data": {"e": "kline", "E": int(event_time), "s": symbol, "k": {
+                "t": int(open_time), "T": int(close_time), "i": interval,
+                "o": o, "c": c, "h": h, "l": l, "v": v, "x": closed == "true"}}}
+    elif kind == "m":
+        match = _MARK_PRICE.search(message, pos)
+        if match:
+            event_time, symbol, mark, index, rate, next_funding = match.groups()
+            return {"data": {"e": "markPriceUpdate", "E": int(event_time), "s": symbol,
+                             "p": mark, "i": index, "r": rate, "T": int(next_funding)}}
+    return None
@@ -0,0 +1,145 @@
+"""
+Kline Downloader
+Geçmiş mumları sayfalı ve paralel indirip KlineStore'a yazar
+
+FEATURES:
+- startTime / endTime ile 1000'lik sayfalar; semboller ve sayfalar eşzamanlı
+  (concurrency kadar istek aynı anda)
+- Rate limit payı: dakikalık weight limitin max_weight_ratio kadarı kullanılır,
+  kalan kapasite trading istekleri için ayrılır
+- Yalnızca önbellekte olmayan aralıklar indirilir; veriler ay ay yazılır, kesilen
+  indirme tekrar çalıştırıldığında tamamlanmamış aydan devam eder
+- Yalnızca kapanmış mumlar kaydedilir
+- Senkron ve asenkron API client ile çalışır
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .kline_store import KlineStore, klines_to_array, split_by_month
+from .market_data import INTERVAL_MS
+from .rate_limiter import kline_weight
+
+
+class KlineDownloader:
+    """Paralel, kaldığı yerden devam eden geçmiş kline indirici"""
+
+    PAGE_LIMIT = 1000
+
+    def __init__(self, api, store: KlineStore, concurrency: int = 8,
+                 max_weight_ratio: float = 0.5, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            api: BinanceFuturesTestnetAPI veya AsyncBinanceFuturesTestnetAPI
+            store: Yerel önbellek
+            concurrency: Aynı anda gönderilen sayfa isteği
+            max_weight_ratio: İndirmenin kullanabileceği dakikalık weight oranı
+        """
+        self.api = api
+        self.store = store
+        self.concurrency = concurrency
+        self.max_weight_ratio = max_weight_ratio
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.stats = {"pages": 0, "candles": 0, "months": 0, "failed_months": 0, "budget_waits": 0}
+
+    @classmethod
+    def from_config(cls, api, config: Dict, **kwargs) -> "KlineDownloader":
+        """history config bloğundan oluştur"""
+        return cls(
+            api,
+            KlineStore(config.get("cache_dir", "data/klines")),
+            concurrency=config.get("concurrency", 8),
+            max_weight_ratio=config.get("max_weight_ratio", 0.5),
+            **kwargs
+        )
+
+    async def download(self, symbols: List[str], interval: str, start_ms: int,
+                       end_ms: Optional[int] = None) -> Dict[str, int]:
+        """
+        [start_ms, end_ms) aralığının eksik mumlarını indir
+
+        Returns:
+            {symbol: indirilen mum sayısı}
+        """
+        interval_ms = self._interval_ms(interval)
+        # Yalnızca kapanmış mumlar: open_time < içinde bulunulan mumun başı
+        closed_end = int(time.time() * 1000) // interval_ms * interval_ms
+        end_ms = closed_end if end_ms is None else min(end_ms, closed_end)
+        start_ms = start_ms // interval_ms * interval_ms
+
+        jobs = []
+        for symbol in symbols:
+            for missing_start, missing_end in self.store.missing(symbol, interval, start_ms, end_ms):
+                for month_start, month_end in split_by_month(missing_start, missing_end):
+                    jobs.append((symbol, month_start, month_end))
+
+        downloaded = {symbol: 0 for symbol in symbols}
+        if not jobs:
+            return downloaded
+
+        self.logger.info(f"📥 Downloading {interval} klines: {len(symbols)} symbols, {len(jobs)} month chunks")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._download_month(semaphore, symbol, interval, interval_ms, start, end)
+              for symbol, start, end in jobs),
+            return_exceptions=True
+        )
+        for (symbol, start, _), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                self.stats["failed_months"] += 1
+                month = self.store.month_path(symbol, interval, start).stem
+                self.logger.error(f"❌ {symbol} {interval} {month} download failed: {result}")
+            else:
+                downloaded[symbol] += result
+        return downloaded
+
+    async def _download_month(self, semaphore: asyncio.Semaphore, symbol: str, interval: str,
+                              interval_ms: int, start_ms: int, end_ms: int) -> int:
+        """Tek ay içindeki aralığı sayfa sayfa indir ve kaydet"""
+        page_span = self.PAGE_LIMIT * interval_ms
+        pages = await asyncio.gather(*(
+            self._fetch_page(semaphore, symbol, interval, page_start, min(page_start + page_span, end_ms))
+            for page_start in range(start_ms, end_ms, page_span)
+        ))
+        klines = np.concatenate(pages)
+        self.store.write(symbol, interval, klines, start_ms, end_ms)
+        self.stats["months"] += 1
+        self.stats["candles"] += len(klines)
+        self.logger.debug("📥 %s %s %s: %d candles", symbol, interval,
+                          self.store.month_path(symbol, interval, start_ms).stem, len(klines))
+        return len(klines)
+
+    async def _fetch_page(self, semaphore: asyncio.Semaphore, symbol: str, interval: str,
+                          start_ms: int, end_ms: int) -> np.ndarray:
+        """[start_ms, end_ms) sayfası (endTime dahil olduğu için end_ms - 1)"""
+        async with semaphore:
+            await self._wait_for_budget(kline_weight(self.PAGE_LIMIT))
+            rows = await self._call(self.api.get_klines_page, symbol, interval,
+                                    start_ms, end_ms - 1, self.PAGE_LIMIT)
+        self.stats["pages"] += 1
+        return klines_to_array(rows)
+
+    async def _wait_for_budget(self, weight: int):
+        """Kullanılan weight indirme payının altına inene dek bekle"""
+        limiter = self.api.rate_limiter
+        while limiter.used_weight() + weight > limiter.weight_limit * self.max_weight_ratio:
+            self.stats["budget_waits"] += 1
+            await asyncio.sleep(1.0)
+
+    @staticmethod
+    async def _call(func, *args):
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    @staticmethod
+    def _interval_ms(interval: str) -> int:
+        try:
+            return INTERVAL_MS[interval]
+        except KeyError:
+            raise ValueError(f"Unsupported kline interval for paging: {interval}")
@@ -0,0 +1,175 @@
+"""
+Kline Store
+Geçmiş mumlar için yerel disk önbelleği
+
+FEATURES:
+- Sembol / interval / ay başına bir .npy dosyası (yapısal NumPy dizisi,
+  open_time'a göre sıralı ve tekil); JSON'a göre ~8 kat daha küçük
+- coverage.json: indirilmiş [start, end) aralıkları. Borsada mum olmayan
+  aralıklar (bakım vb.) da kapsanmış sayılır, tekrar istenmez
+- Yazma atomik (geçici dosya + os.replace): kesilen indirme yarım dosya bırakmaz
+- Aynı mum tekrar yazılırsa yeni değer eskisinin yerine geçer (idempotent)
+
+DİZİN YAPISI:
+    {root}/{SYMBOL}/{interval}/2024-05.npy
+    {root}/{SYMBOL}/{interval}/coverage.json
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+# /v1/klines satırının ilk 11 alanı (12. alan kullanılmıyor)
+KLINE_DTYPE = np.dtype([
+    ("open_time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("close_time", "i8"),
+    ("quote_volume", "f8"),
+    ("trades", "i8"),
+    ("taker_buy_volume", "f8"),
+    ("taker_buy_quote_volume", "f8"),
+])
+
+
+def klines_to_array(rows: Sequence[Sequence]) -> np.ndarray:
+    """
+    Ham /v1/klines yanıtını KLINE_DTYPE dizisine çevir (satır başına Python işi yok)
+
+    Yanıt tek adımda 2 boyutlu object matrisine alınır, her kolon tek astype ile
+    tipine çevrilir. Eksik alanlı veya sayı olmayan satır tüm yanıtı geçersiz kılar.
+
+    Raises:
+        ValueError: Geçersiz kline formatı
+    """
+    array = np.empty(len(rows), dtype=KLINE_DTYPE)
+    if len(rows) == 0:
+        return array
+    table = np.array(rows, dtype=object)
+    if table.ndim != 2 or table.shape[1] < len(KLINE_DTYPE.names):
+        raise ValueError(f"Invalid kline format: shape {table.shape}")
+    for index, name in enumerate(KLINE_DTYPE.names):
+        array[name] = table[:, index].astype(KLINE_DTYPE[name])
+    return array
+
+
+def month_start(ms: int) -> int:
+    """ms'nin içinde olduğu ayın başlangıcı (UTC, ms)"""
+    dt = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    return int(datetime(dt.year, dt.month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def next_month_start(ms: int) -> int:
+    """ms'den sonraki ayın başlangıcı (UTC, ms)"""
+    dt = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def split_by_month(start_ms: int, end_ms: int) -> Iterator[Tuple[int, int]]:
+    """[start, end) aralığını ay sınırlarından böl"""
+    while start_ms < end_ms:
+        boundary = min(next_month_start(start_ms), end_ms)
+        yield start_ms, boundary
+        start_ms = boundary
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Çakışan / bitişik [start, end) aralıklarını birleştir"""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_ranges(start_ms: int, end_ms: int,
+                    covered: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """[start, end) aralığının covered dışında kalan parçaları"""
+    missing = []
+    cursor = start_ms
+    for cov_start, cov_end in covered:
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end_ms:
+            break
+        if cov_start > cursor:
+            missing.append((cursor, cov_start))
+        cursor = max(cursor, cov_end)
+    if cursor < end_ms:
+        missing.append((cursor, end_ms))
+    return missing
+
+
+class KlineStore:
+    """Sembol / interval bazlı aylık .npy kline önbelleği"""
+
+    def __init__(self, root: str = "data/klines"):
+        self.root = Path(root)
+
+    def series_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol / interval
+
+    def month_path(self, symbol: str, interval: str, ms: int) -> Path:
+        dt = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+        return self.series_dir(symbol, interval) / f"{dt.year:04d}-{dt.month:02d}.npy"
+
+    def coverage(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """İndirilmiş [start, end) aralıkları (sıralı, birleşik)"""
+        path = self.series_dir(symbol, interval) / "coverage.json"
+        try:
+            return [tuple(r) for r in json.loads(path.read_text())]
+        except FileNotFoundError:
+            return []
+
+    def missing(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """[start, end) aralığının önbellekte olmayan parçaları"""
+        return subtract_ranges(start_ms, end_ms, self.coverage(symbol, interval))
+
+    def write(self, symbol: str, interval: str, klines: np.ndarray, start_ms: int, end_ms: int):
+        """
+        [start, end) aralığının mumlarını kaydet ve aralığı kapsanmış işaretle
+
+        Aralık tek bir ay içinde olmalı (KlineDownloader ay ay yazar).
+        """
+        path = self.month_path(symbol, interval, start_ms)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            # Yeni satırlar önce: np.unique ilk görüleni tutar
+            klines = np.concatenate([klines, np.load(path)])
+        _, first = np.unique(klines["open_time"], return_index=True)
+        self._atomic_write(path, lambda f: np.save(f, klines[first]))
+
+        covered = merge_ranges(self.coverage(symbol, interval) + [(start_ms, end_ms)])
+        self._atomic_write(path.parent / "coverage.json",
+                           lambda f: f.write(json.dumps(covered).encode()))
+
+    def load(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """[start, end) aralığındaki önbellekteki mumlar (open_time sıralı)"""
+        parts = []
+        for month, _ in split_by_month(month_start(start_ms), end_ms):
+            path = self.month_path(symbol, interval, month)
+            if path.exists():
+                parts.append(np.load(path))
+        if not parts:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        klines = np.concatenate(parts)
+        open_times = klines["open_time"]
+        return klines[(open_times >= start_ms) & (open_times < end_ms)]
+
+    @staticmethod
+    def _atomic_write(path: Path, write):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
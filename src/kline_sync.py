@@ -0,0 +1,154 @@
+"""
+Kline Sync
+Sembol / interval başına son kapanan mumu hatırlayıp yalnızca yeni mumları indirir
+
+FEATURES:
+- İlk senkronizasyon: pencere önce disk önbelleğinden (KlineStore) doldurulur,
+  REST'ten yalnızca önbellekten sonraki mumlar istenir
+- Sonraki çağrılar: startTime = son açılış + interval (kararlı durumda sembol
+  başına birkaç satır)
+- Birleştirme idempotent: aynı open_time tekrar gelirse tek satır kalır
+- Eksik mum tespiti: pencerede ardışık olmayan open_time aralıkları
+- Yeni mumlar diske de yazılır; bir sonraki başlatma kaldığı yerden devam eder
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .kline_store import KLINE_DTYPE, KlineStore, klines_to_array, split_by_month
+from .market_data import INTERVAL_MS
+
+
+class KlineSync:
+    """Artımlı kline senkronizasyonu (son N mumluk bellek penceresi)"""
+
+    PAGE_LIMIT = 1000
+
+    def __init__(self, api, store: Optional[KlineStore] = None, window: int = 500,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            api: BinanceFuturesTestnetAPI veya AsyncBinanceFuturesTestnetAPI
+            store: Disk önbelleği (None: yalnızca bellek)
+            window: Bellekte tutulan ve ilk senkronizasyonda doldurulan mum sayısı
+        """
+        self.api = api
+        self.store = store
+        self.window = window
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._series: Dict[Tuple[str, str], np.ndarray] = {}
+        self.stats = {"requests": 0, "rows": 0, "cache_rows": 0, "missing_bars": 0}
+
+    def klines(self, symbol: str, interval: str) -> np.ndarray:
+        """Bellekteki pencere (open_time sıralı)"""
+        return self._series.get((symbol, interval), np.empty(0, dtype=KLINE_DTYPE))
+
+    def last_close_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Son senkronize edilen kapanmış mumun close_time'ı"""
+        series = self._series.get((symbol, interval))
+        if series is None or len(series) == 0:
+            return None
+        return int(series["close_time"][-1])
+
+    async def sync(self, symbol: str, interval: str) -> np.ndarray:
+        """
+        Son kapanan mumdan sonraki mumları al ve pencereye ekle
+
+        Returns:
+            Pencereye yeni eklenen mumlar (ilk çağrıda önbellekten gelenler dahil)
+        """
+        interval_ms = INTERVAL_MS[interval]
+        key = (symbol, interval)
+        closed_end = int(time.time() * 1000) // interval_ms * interval_ms
+        window_start = closed_end - self.window * interval_ms
+
+        series = self._series.get(key)
+        if series is None:
+            series = self._load_cached(symbol, interval, window_start, closed_end)
+
+        # Penceredeki son mumdan devam; pencere dışında kalan eski mumlar istenmez
+        start_ms = window_start
+        if len(series):
+            start_ms = max(start_ms, int(series["open_time"][-1]) + interval_ms)
+
+        fetched = await self._fetch_range(symbol, interval, start_ms, closed_end)
+        previous_last = int(series["open_time"][-1]) if key in self._series and len(series) else None
+        merged = self._merge(series, fetched)[-self.window:]
+        self._series[key] = merged
+
+        if len(fetched) and self.store is not None:
+            self._persist(symbol, interval, fetched, start_ms, closed_end)
+
+        # Yalnızca yeni mumlarla oluşan boşluklar raporlanır
+        missing = [gap for gap in self.find_missing(merged, interval_ms)
+                   if previous_last is None or gap[1] > previous_last]
+        if missing:
+            bars = sum((end - start) // interval_ms for start, end in missing)
+            self.stats["missing_bars"] += bars
+            self.logger.warning(f"⚠️  {symbol} {interval}: {bars} missing candles in {len(missing)} gaps")
+
+        if previous_last is None:
+            return merged
+        return merged[merged["open_time"] > previous_last]
+
+    @staticmethod
+    def find_missing(klines: np.ndarray, interval_ms: int) -> List[Tuple[int, int]]:
+        """Ardışık olmayan open_time'lar arasındaki [start, end) boşlukları"""
+        if len(klines) < 2:
+            return []
+        open_times = klines["open_time"]
+        gaps = np.nonzero(np.diff(open_times) > interval_ms)[0]
+        return [(int(open_times[i]) + interval_ms, int(open_times[i + 1])) for i in gaps]
+
+    def _load_cached(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> np.ndarray:
+        if self.store is None:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        cached = self.store.load(symbol, interval, start_ms, end_ms)
+        self.stats["cache_rows"] += len(cached)
+        return cached
+
+    async def _fetch_range(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """[start_ms, end_ms) aralığındaki kapanmış mumlar (gerekirse birden çok sayfa)"""
+        pages = []
+        page_span = self.PAGE_LIMIT * INTERVAL_MS[interval]
+        for page_start in range(start_ms, end_ms, page_span):
+            page_end = min(page_start + page_span, end_ms)
+            bars = (page_end - page_start) // INTERVAL_MS[interval]
+            rows = await self._call(self.api.get_klines_page, symbol, interval,
+                                    page_start, page_end - 1, bars)
+            self.stats["requests"] += 1
+            self.stats["rows"] += len(rows)
+            pages.append(klines_to_array(rows))
+        if not pages:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        klines = np.concatenate(pages)
+        return klines[klines["open_time"] < end_ms]
+
+    @staticmethod
+    def _merge(series: np.ndarray, fetched: np.ndarray) -> np.ndarray:
+        """İdempotent birleştirme: open_time başına tek satır (yeni gelen kazanır)"""
+        if len(fetched) == 0:
+            return series
+        combined = np.concatenate([fetched, series])
+        _, first = np.unique(combined["open_time"], return_index=True)
+        return combined[first]
+
+    def _persist(self, symbol: str, interval: str, klines: np.ndarray, start_ms: int, end_ms: int):
+        try:
+            open_times = klines["open_time"]
+            for month_start, month_end in split_by_month(start_ms, end_ms):
+                part = klines[(open_times >= month_start) & (open_times < month_end)]
+                self.store.write(symbol, interval, part, month_start, month_end)
+        except OSError as e:
+            self.logger.warning(f"⚠️  {symbol} {interval} kline cache write failed: {e}")
+
+    @staticmethod
+    async def _call(func, *args):
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args)
+        return await asyncio.to_thread(func, *args)
@@ -0,0 +1,117 @@
+"""
+Latency Tracker
+Endpoint bazlı gecikme yüzdelikleri, adaptif timeout ve hedge kararı
+
+FEATURES:
+- (method, endpoint) başına son N isteğin süresi (ring buffer)
+- Adaptif timeout: p99 * çarpan, [min_timeout, max_timeout] aralığında.
+  Yeterli örnek yoksa max_timeout (eski sabit 10s) kullanılır.
+- Hedge: idempotent GET p95 süresini aşarsa ikinci istek gönderilir,
+  ilk dönen yanıt kullanılır
+- Timeout olan istek max değerle değil kendi timeout'u ile örneklenir;
+  gecikme kalıcı olarak artarsa timeout da yukarı uyum sağlar
+
+Emir gibi idempotent olmayan isteklerde timeout daraltılmaz: read timeout
+emrin durumunu belirsiz bırakır.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from .retry_policy import RetryPolicy
+
+
+class LatencyTracker:
+    """Endpoint gecikme istatistikleri (thread-safe)"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20,
+                 timeout_multiplier: float = 3.0, min_timeout: float = 1.0,
+                 max_timeout: float = 10.0, hedge: bool = False,
+                 hedge_percentile: float = 95.0, hedge_min_delay: float = 0.05,
+                 hedge_max_weight_ratio: float = 0.5):
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        # Hedge yalnızca dakikalık weight bu oranın altındayken gönderilir
+        self.hedge_max_weight_ratio = hedge_max_weight_ratio
+
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        # Sıralı örnek önbelleği: yeni örnek gelene kadar tekrar sıralanmaz
+        self._sorted: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {"hedged": 0, "hedge_wins": 0, "timeouts": 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "LatencyTracker":
+        """network.latency config bloğundan oluştur"""
+        return cls(**{k: v for k, v in config.items() if k in (
+            "window", "min_samples", "timeout_multiplier", "min_timeout", "max_timeout",
+            "hedge", "hedge_percentile", "hedge_min_delay", "hedge_max_weight_ratio"
+        )})
+
+    def record(self, method: str, endpoint: str, seconds: float):
+        """Tamamlanan (veya timeout olan) tek isteğin süresini kaydet"""
+        key = (method, endpoint)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._sorted.pop(key, None)
+
+    def record_timeout(self, method: str, endpoint: str, timeout: float):
+        self.stats["timeouts"] += 1
+        self.record(method, endpoint, timeout)
+
+    def percentile(self, method: str, endpoint: str, pct: float) -> Optional[float]:
+        """Yüzdelik (saniye); min_samples'tan az örnek varsa None"""
+        key = (method, endpoint)
+        with self._lock:
+            ordered = self._sorted.get(key)
+            if ordered is None:
+                samples = self._samples.get(key)
+                if samples is None or len(samples) < self.min_samples:
+                    return None
+                ordered = self._sorted[key] = sorted(samples)
+        index = min(len(ordered) - 1, int(pct / 100 * len(ordered)))
+        return ordered[index]
+
+    def timeout_for(self, method: str, endpoint: str) -> float:
+        """İsteğin timeout'u (saniye)"""
+        if not RetryPolicy.is_idempotent(method, endpoint):
+            return self.max_timeout
+        p99 = self.percentile(method, endpoint, 99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.timeout_multiplier))
+
+    def hedge_delay(self, method: str, endpoint: str) -> Optional[float]:
+        """Hedge isteği için bekleme süresi; hedge yapılmayacaksa None"""
+        if not self.hedge or method != "GET":
+            return None
+        delay = self.percentile(method, endpoint, self.hedge_percentile)
+        if delay is None:
+            return None
+        return max(delay, self.hedge_min_delay)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Endpoint başına p50/p95/p99 (ms) ve timeout (s)"""
+        result = {}
+        for method, endpoint in list(self._samples):
+            p50 = self.percentile(method, endpoint, 50)
+            if p50 is None:
+                continue
+            result[f"{method} {endpoint}"] = {
+                "p50_ms": round(p50 * 1000, 2),
+                "p95_ms": round(self.percentile(method, endpoint, 95) * 1000, 2),
+                "p99_ms": round(self.percentile(method, endpoint, 99) * 1000, 2),
+                "timeout_s": round(self.timeout_for(method, endpoint), 3),
+            }
+        return result
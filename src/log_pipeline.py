@@ -0,0 +1,73 @@
+"""
+Log Pipeline
+Logger handler'larını QueueHandler / QueueListener arkasına alır
+
+Log çağrısı yalnızca kaydı kuyruğa koyar; formatlama, konsola / dosyaya
+yazma ve rotation tek bir arka plan thread'inde yapılır. Böylece disk
+gecikmesi veya rollover event loop'u bloklamaz. Root logger da kuyruğa
+alınabilir: API client (src.*) gibi kendi handler'ı olmayan logger'lar da
+senkron yazmaz.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List
+
+
+class _RouteFilter(logging.Filter):
+    """Listener handler'ı: yalnızca kayıtlı olduğu logger'lardan gelen kayıtlar"""
+
+    def __init__(self):
+        super().__init__()
+        self.routes = set()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "queue_route", None) in self.routes
+
+
+def install_queue_logging(handlers_by_logger: Dict[str, List[logging.Handler]]) -> QueueListener:
+    """
+    Logger'ların handler'larını ortak bir QueueListener thread'ine taşı
+
+    Args:
+        handlers_by_logger: {logger_name: [handler, ...]}; "" root logger'dır
+            (kendi handler'ı olmayan src.* gibi tüm logger'lar). Her handler
+            yalnızca kayıtlı olduğu logger'ların kayıtlarını alır; aynı handler
+            birden fazla logger'a verilebilir
+
+    Returns:
+        Başlatılmış QueueListener (çıkışta kuyruk boşaltılıp durdurulur)
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    route_filters: Dict[int, _RouteFilter] = {}
+    listener_handlers = []
+    for name, handlers in handlers_by_logger.items():
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        queue_handler = QueueHandler(log_queue)
+        # Kaydı hangi logger'ın kuyruğa koyduğu (listener tarafında yönlendirme)
+        queue_handler.addFilter(lambda record, route=name: setattr(record, "queue_route", route) or True)
+        logger.addHandler(queue_handler)
+        if name:
+            # Kendi handler'ları var; root'a tekrar yazılmasın
+            logger.propagate = False
+        for handler in handlers:
+            route_filter = route_filters.get(id(handler))
+            if route_filter is None:
+                route_filter = route_filters[id(handler)] = _RouteFilter()
+                handler.addFilter(route_filter)
+                listener_handlers.append(handler)
+            route_filter.routes.add(name)
+
+    listener = QueueListener(log_queue, *listener_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_queue_logging, listener)
+    return listener
+
+
+def stop_queue_logging(listener: QueueListener):
+    """Kuyruktaki kayıtları yazıp listener'ı durdur (birden fazla çağrılabilir)"""
+    if listener._thread is not None:
+        listener.stop()
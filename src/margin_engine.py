@@ -0,0 +1,181 @@
+"""
+Margin Engine
+Leverage bracket'lerine göre pozisyon bazlı initial / maintenance margin,
+likidasyon fiyatı ve portföy margin kullanımı
+
+FEATURES:
+- /v1/leverageBracket bir kez indirilir (sembol başına notional kademeleri)
+- Mark price tick'inde yalnızca o sembolün katkısı çıkarılıp yeniden eklenir:
+  portföy toplamları (IM, MM, unrealized PnL) tick başına O(1)
+- Pozisyon açılış / kapanışında toplamlar baştan hesaplanır (kayan hata birikmez)
+- Likidasyon fiyatı (cross, one-way): diğer pozisyonların MM ve PnL'i toplamlardan
+  O(1) bulunur; MMR likidasyon fiyatındaki notional'ın kademesinden alınır
+
+FORMÜLLER (USDⓈ-M):
+    notional = |miktar| * mark
+    IM       = notional / leverage
+    MM       = notional * maintMarginRatio - cum      (notional'ın bracket'ı)
+    LP       = (WB - TMM_diğer + UPNL_diğer + cum - yön*|q|*giriş) / (|q|*MMR - yön*|q|)
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# (notionalFloor, notionalCap, maintMarginRatio, cum, initialLeverage)
+Bracket = Tuple[float, float, float, float, int]
+
+# Bracket'i bilinmeyen sembol için temkinli varsayım (tek kademe, %1 MMR)
+DEFAULT_BRACKET: Bracket = (0.0, float("inf"), 0.01, 0.0, 20)
+
+
+class MarginEngine:
+    """Portföy margin durumu (bot loop thread'inde güncellenir)"""
+
+    def __init__(self):
+        self.brackets: Dict[str, List[Bracket]] = {}
+        self._floors: Dict[str, List[float]] = {}
+
+        # {symbol: {'amount', 'entry_price', 'leverage', 'mark_price', 'notional',
+        #           'initial_margin', 'maint_margin', 'unrealized_pnl', 'mmr', 'cum'}}
+        self.positions: Dict[str, Dict] = {}
+        self.total_initial_margin = 0.0
+        self.total_maint_margin = 0.0
+        self.total_unrealized_pnl = 0.0
+
+    def load_brackets(self, payload):
+        """/v1/leverageBracket yanıtını uygula (liste veya tek sembol dict'i)"""
+        items = payload if isinstance(payload, list) else [payload]
+        for item in items:
+            brackets = sorted(
+                (float(b["notionalFloor"]), float(b["notionalCap"]), float(b["maintMarginRatio"]),
+                 float(b.get("cum", 0)), int(b["initialLeverage"]))
+                for b in item.get("brackets", [])
+            )
+            if brackets:
+                self.brackets[item["symbol"]] = brackets
+                self._floors[item["symbol"]] = [b[0] for b in brackets]
+        # Yeni kademeler mevcut pozisyonların MM'ini değiştirebilir
+        for symbol in list(self.positions):
+            self._recompute(symbol)
+        self._recompute_totals()
+
+    def bracket(self, symbol: str, notional: float) -> Bracket:
+        """Notional'ın düştüğü kademe"""
+        brackets = self.brackets.get(symbol)
+        if not brackets:
+            return DEFAULT_BRACKET
+        index = max(bisect_right(self._floors[symbol], notional) - 1, 0)
+        return brackets[index]
+
+    def max_notional(self, symbol: str, leverage: int) -> float:
+        """Bu leverage ile açılabilecek en büyük pozisyon notional'ı"""
+        brackets = self.brackets.get(symbol)
+        if not brackets:
+            return DEFAULT_BRACKET[1]
+        caps = [cap for _, cap, _, _, max_leverage in brackets if max_leverage >= leverage]
+        return max(caps) if caps else 0.0
+
+    def update_position(self, symbol: str, amount: float, entry_price: float,
+                        leverage: int, mark_price: Optional[float] = None):
+        """Pozisyonu ekle / değiştir (amount 0: kaldır)"""
+        if amount == 0:
+            self.remove_position(symbol)
+            return
+        current = self.positions.get(symbol)
+        if mark_price is None:
+            mark_price = current["mark_price"] if current else entry_price
+        self.positions[symbol] = {
+            "amount": amount,
+            "entry_price": entry_price,
+            "leverage": max(int(leverage), 1),
+            "mark_price": mark_price,
+        }
+        self._recompute(symbol)
+        self._recompute_totals()
+
+    def remove_position(self, symbol: str):
+        if self.positions.pop(symbol, None) is not None:
+            self._recompute_totals()
+
+    def update_mark(self, symbol: str, mark_price: float):
+        """Mark price tick'i: yalnızca bu sembolün katkısı güncellenir (O(1))"""
+        position = self.positions.get(symbol)
+        if position is None:
+            return
+        self.total_initial_margin -= position["initial_margin"]
+        self.total_maint_margin -= position["maint_margin"]
+        self.total_unrealized_pnl -= position["unrealized_pnl"]
+        position["mark_price"] = mark_price
+        self._recompute(symbol)
+        self.total_initial_margin += position["initial_margin"]
+        self.total_maint_margin += position["maint_margin"]
+        self.total_unrealized_pnl += position["unrealized_pnl"]
+
+    def liquidation_price(self, symbol: str, wallet_balance: float) -> Optional[float]:
+        """Cross margin likidasyon fiyatı (None: pozisyon yok / likide olmaz)"""
+        position = self.positions.get(symbol)
+        if position is None:
+            return None
+        quantity = abs(position["amount"])
+        direction = 1 if position["amount"] > 0 else -1
+        other_maint = self.total_maint_margin - position["maint_margin"]
+        other_pnl = self.total_unrealized_pnl - position["unrealized_pnl"]
+        base = wallet_balance - other_maint + other_pnl - direction * quantity * position["entry_price"]
+
+        # MMR / cum likidasyon anındaki notional'ın kademesinden: kademe başına bir aday
+        price = None
+        for floor, cap, mmr, cum, _ in self.brackets.get(symbol) or [DEFAULT_BRACKET]:
+            price = (base + cum) / (quantity * mmr - direction * quantity)
+            if floor <= quantity * price < cap:
+                break
+        return price if price is not None and price > 0 else None
+
+    def margin_balance(self, wallet_balance: float) -> float:
+        return wallet_balance + self.total_unrealized_pnl
+
+    def available_margin(self, wallet_balance: float) -> float:
+        """Yeni pozisyonlar için kalan margin"""
+        return self.margin_balance(wallet_balance) - self.total_initial_margin
+
+    def utilization(self, wallet_balance: float) -> float:
+        """Kullanılan initial margin / margin bakiyesi"""
+        if not self.positions:
+            return 0.0
+        balance = self.margin_balance(wallet_balance)
+        return self.total_initial_margin / balance if balance > 0 else float("inf")
+
+    def margin_ratio(self, wallet_balance: float) -> float:
+        """Maintenance margin / margin bakiyesi (1.0: likidasyon)"""
+        if not self.positions:
+            return 0.0
+        balance = self.margin_balance(wallet_balance)
+        return self.total_maint_margin / balance if balance > 0 else float("inf")
+
+    def summary(self, wallet_balance: float) -> Dict:
+        return {
+            "positions": len(self.positions),
+            "initial_margin": round(self.total_initial_margin, 2),
+            "maint_margin": round(self.total_maint_margin, 2),
+            "unrealized_pnl": round(self.total_unrealized_pnl, 2),
+            "available_margin": round(self.available_margin(wallet_balance), 2),
+            "utilization": round(self.utilization(wallet_balance), 4),
+            "margin_ratio": round(self.margin_ratio(wallet_balance), 4),
+        }
+
+    def _recompute(self, symbol: str):
+        position = self.positions[symbol]
+        amount = position["amount"]
+        notional = abs(amount) * position["mark_price"]
+        _, _, mmr, cum, _ = self.bracket(symbol, notional)
+        position["notional"] = notional
+        position["mmr"] = mmr
+        position["cum"] = cum
+        position["initial_margin"] = notional / position["leverage"]
+        position["maint_margin"] = max(notional * mmr - cum, 0.0)
+        position["unrealized_pnl"] = amount * (position["mark_price"] - position["entry_price"])
+
+    def _recompute_totals(self):
+        positions = self.positions.values()
+        self.total_initial_margin = sum(p["initial_margin"] for p in positions)
+        self.total_maint_margin = sum(p["maint_margin"] for p in positions)
+        self.total_unrealized_pnl = sum(p["unrealized_pnl"] for p in positions)
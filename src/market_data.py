@@ -0,0 +1,355 @@
+"""
+Market Data Engine
+Binance Futures combined stream (ticker + kline + markPrice) üzerinden
+push tabanlı piyasa verisi
+
+FEATURES:
+- Tek multiplexed WebSocket bağlantısı (/stream?streams=...)
+- Supervisor thread: kopan bağlantıda exponential backoff ile yeniden bağlanma
+  ve tüm stream'lere yeniden abone olma
+- Gap detection: kapanışı görülmeyen kline aralıkları (kopukluklar dahil) on_gap ile bildirilir
+- Event'ler asyncio loop'una call_soon_threadsafe ile aktarılır; bot state'i
+  yalnızca loop thread'inde değişir
+- Backpressure: event'ler sembol bazlı birleştiren tampondan geçer (ConflatingBuffer);
+  yoğun akışta strateji eski tick'leri değil en son durumu işler
+- Mesajlar hızlı JSON decoder ile çözülür; hızlı decoder yoksa gereken alanlar
+  regex ile çıkarılır (json_codec)
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    import websocket
+except ImportError as e:
+    print(f"Required packages not installed: {e}")
+    print("Please run: pip install websocket-client")
+    raise
+
+from .json_codec import json_loads, extract_stream_payload, FAST_JSON
+from .conflating_buffer import ConflatingBuffer
+
+
+# Kline interval -> milisaniye
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000,
+}
+
+
+def parse_stream_message(message: Dict) -> Optional[Dict]:
+    """
+    Combined stream mesajını normalize event'e çevir
+
+    Returns:
+        {'type': 'ticker' | 'kline' | 'mark_price', 'symbol': ..., ...} veya None
+    """
+    data = message.get("data")
+    if not isinstance(data, dict):
+        return None
+
+    event_type = data.get("e")
+    if event_type == "24hrTicker":
+        return {
+            "type": "ticker",
+            "symbol": data["s"],
+            "price": float(data["c"]),
+            "volume": float(data["v"]),
+            "event_time": data["E"],
+        }
+    if event_type == "kline":
+        k = data["k"]
+        return {
+            "type": "kline",
+            "symbol": data["s"],
+            "interval": k["i"],
+            "open_time": k["t"],
+            "close_time": k["T"],
+            "open": float(k["o"]),
+            "high": float(k["h"]),
+            "low": float(k["l"]),
+            "close": float(k["c"]),
+            "volume": float(k["v"]),
+            "closed": k["x"],
+            "event_time": data["E"],
+        }
+    if event_type == "markPriceUpdate":
+        return {
+            "type": "mark_price",
+            "symbol": data["s"],
+            "mark_price": float(data["p"]),
+            "index_price": float(data.get("i", 0) or 0),
+            "funding_rate": float(data.get("r", 0) or 0),
+            "next_funding_time": data.get("T", 0),
+            "event_time": data["E"],
+        }
+    return None
+
+
+class SupervisedStream:
+    """
+    Supervisor thread'li WebSocket
+
+    Kopan bağlantı exponential backoff ile yeniden kurulur; alt sınıflar
+    stream_url ve _handle_message'ı tanımlar. Callback'ler asyncio loop
+    thread'inde çalışır.
+    """
+
+    MAX_BACKOFF = 30.0
+    label = "Stream"
+    thread_name = "stream"
+
+    def __init__(self, loop, ping_interval: float = 20.0, ping_timeout: float = 10.0,
+                 logger: Optional[logging.Logger] = None):
+        self.loop = loop
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.ws: Optional[websocket.WebSocketApp] = None
+        self.connected = False
+        self.last_message_time = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connections = 0
+
+        self.stats = {"messages": 0, "reconnects": 0, "errors": 0}
+
+    @property
+    def stream_url(self) -> str:
+        raise NotImplementedError
+
+    def _decode(self, message: Union[str, bytes]) -> Dict:
+        """Ham mesajı çöz (ValueError / KeyError / TypeError hata sayılır)"""
+        return json_loads(message)
+
+    def _handle_message(self, message: Dict):
+        """Çözülmüş JSON mesajı (WebSocket thread'inde çalışır)"""
+        raise NotImplementedError
+
+    def _on_connected(self, reconnect: bool):
+        """Bağlantı açıldı (WebSocket thread'inde çalışır)"""
+
+    def is_healthy(self, max_silence: Optional[float] = None) -> bool:
+        """Bağlı mı; max_silence verilirse son max_silence saniyede mesaj alınmış mı"""
+        if not self.connected:
+            return False
+        return max_silence is None or time.time() - self.last_message_time < max_silence
+
+    def start(self):
+        """Supervisor thread'ini başlat"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._supervise, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Bağlantıyı kapat, yeniden bağlanmayı durdur"""
+        self._stop.set()
+        if self.ws is not None:
+            self.ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.connected = False
+
+    # ------------------------------------------------------------------
+    # WebSocket thread
+    # ------------------------------------------------------------------
+
+    def _supervise(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            connected_at = time.time()
+            self.ws = websocket.WebSocketApp(
+                self.stream_url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self.ws.run_forever(ping_interval=self.ping_interval, ping_timeout=self.ping_timeout)
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.logger.error(f"❌ {self.label} crashed: {e}")
+
+            self.connected = False
+            if self._stop.is_set():
+                break
+
+            # Uzun süre bağlı kaldıysa backoff'u sıfırla
+            if time.time() - connected_at > 60:
+                backoff = 1.0
+            self.stats["reconnects"] += 1
+            self.logger.warning(f"🔄 {self.label} reconnecting in {backoff:.0f}s...")
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.MAX_BACKOFF)
+
+    def _on_open(self, ws):
+        self.connected = True
+        self.last_message_time = time.time()
+        self._connections += 1
+        self.logger.info(f"✅ {self.label} connected")
+        self._on_connected(reconnect=self._connections > 1)
+
+    def _on_message(self, ws, message):
+        self.last_message_time = time.time()
+        self.stats["messages"] += 1
+        try:
+            self._handle_message(self._decode(message))
+        except (ValueError, KeyError, TypeError) as e:
+            self.stats["errors"] += 1
+            self.logger.debug("Unparseable %s message: %s", self.label.lower(), e)
+
+    def _dispatch(self, callback, *args):
+        """Callback'i asyncio loop thread'inde çalıştır"""
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Loop kapandı (shutdown)
+            self._stop.set()
+
+    def _on_error(self, ws, error):
+        self.stats["errors"] += 1
+        self.logger.error(f"WebSocket error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.connected = False
+        self.logger.info(f"{self.label} closed ({close_status_code})")
+
+
+class MarketDataEngine(SupervisedStream):
+    """Supervised multiplexed market-data WebSocket"""
+
+    label = "Market data stream"
+    thread_name = "market-data"
+
+    def __init__(self, ws_url: str, symbols: List[str], loop,
+                 on_event: Callable[[Dict], None],
+                 on_gap: Optional[Callable[[str, int, int], None]] = None,
+                 kline_interval: str = "1m", mark_price_speed: str = "1s",
+                 ping_interval: float = 20.0, ping_timeout: float = 10.0,
+                 extract_fields: Optional[bool] = None, conflate: bool = True,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            ws_url: testnet_config.ws_url (ör. wss://stream.binancefuture.com)
+            loop: Event'lerin aktarılacağı asyncio loop
+            on_event: Loop thread'inde çağrılır: on_event(event)
+            on_gap: Loop thread'inde çağrılır: on_gap(symbol, start_ms, end_ms)
+            extract_fields: Tam decode yerine regex ile alan çıkar
+                (None: yalnızca hızlı JSON decoder kurulu değilse)
+            conflate: Event'leri birleştiren tampondan geçir (False: her mesaj ayrı callback)
+        """
+        super().__init__(loop, ping_interval, ping_timeout, logger)
+        self.ws_url = ws_url.rstrip("/")
+        self.symbols = list(symbols)
+        self.on_event = on_event
+        self.on_gap = on_gap
+        self.kline_interval = kline_interval
+        self.interval_ms = INTERVAL_MS.get(kline_interval, 60_000)
+        self.mark_price_speed = mark_price_speed
+        self.extract_fields = (not FAST_JSON) if extract_fields is None else extract_fields
+        self.buffer = ConflatingBuffer(loop, self._deliver, self.logger) if conflate else None
+        self._request_id = 0
+
+        # Gap detection: son kapanmış kline'ın open time'ı (yalnızca WebSocket thread'inde değişir)
+        self._last_closed_open: Dict[str, int] = {}
+
+        self.stats["gaps"] = 0
+
+    def streams(self, symbols: Optional[List[str]] = None) -> List[str]:
+        """Semboller için stream isimleri"""
+        names = []
+        for symbol in symbols or self.symbols:
+            s = symbol.lower()
+            names.append(f"{s}@ticker")
+            names.append(f"{s}@kline_{self.kline_interval}")
+            names.append(f"{s}@markPrice@{self.mark_price_speed}")
+        return names
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.ws_url}/stream?streams={'/'.join(self.streams())}"
+
+    def start(self):
+        super().start()
+        self.logger.info(f"📡 Market data engine started: {len(self.symbols)} symbols, "
+                         f"{len(self.streams())} streams")
+
+    def subscribe(self, symbols: List[str]):
+        """Çalışırken yeni sembollere abone ol (yeniden bağlanınca URL'de de yer alır)"""
+        new_symbols = [s for s in symbols if s not in self.symbols]
+        if not new_symbols:
+            return
+        self.symbols.extend(new_symbols)
+        if self.connected and self.ws is not None:
+            self._request_id += 1
+            self.ws.send(json.dumps({
+                "method": "SUBSCRIBE",
+                "params": self.streams(new_symbols),
+                "id": self._request_id,
+            }))
+
+    def _decode(self, message: Union[str, bytes]) -> Dict:
+        if self.extract_fields:
+            payload = extract_stream_payload(message)
+            if payload is not None:
+                return payload
+        return json_loads(message)
+
+    def _handle_message(self, message: Dict):
+        event = parse_stream_message(message)
+        if event is None:
+            return
+        if event["type"] == "kline":
+            self._check_kline_gap(event)
+        if self.buffer is None:
+            self._dispatch(self.on_event, event)
+        elif not self.buffer.put(event):
+            # Loop kapandı (shutdown)
+            self._stop.set()
+
+    def _deliver(self, event: Dict):
+        """Tampondan gelen event (loop thread'inde): gap bildirimi veya market event'i"""
+        if event["type"] == "gap":
+            if self.on_gap is not None:
+                self.on_gap(event["symbol"], event["start_ms"], event["end_ms"])
+        else:
+            self.on_event(event)
+
+    def _check_kline_gap(self, event: Dict):
+        """
+        Kapanışı görülmeyen kline'ları tespit et
+
+        Yeniden bağlanma sonrası ilk kline event'i, kopukluk sırasında kaçırılan
+        (yarıda kalan mumun kapanışı dahil) aralığın tamamını kapsar.
+        """
+        symbol = event["symbol"]
+        open_time = event["open_time"]
+        last_closed = self._last_closed_open.get(symbol)
+        if last_closed is not None:
+            expected = last_closed + self.interval_ms
+            if open_time > expected:
+                self._report_gap(symbol, expected, open_time - 1)
+                self._last_closed_open[symbol] = open_time - self.interval_ms
+        if event["closed"] and (last_closed is None or open_time > last_closed):
+            self._last_closed_open[symbol] = open_time
+
+    def _report_gap(self, symbol: str, start_ms: int, end_ms: int):
+        if end_ms < start_ms:
+            return
+        self.stats["gaps"] += 1
+        self.logger.warning(f"⚠️  Market data gap: {symbol} {start_ms} → {end_ms}")
+        if self.on_gap is None:
+            return
+        if self.buffer is None:
+            self._dispatch(self.on_gap, symbol, start_ms, end_ms)
+        elif not self.buffer.put({"type": "gap", "symbol": symbol,
+                                  "start_ms": start_ms, "end_ms": end_ms}):
+            self._stop.set()
@@ -0,0 +1,89 @@
+"""
+Premium Index Snapshot
+Tüm semboller için mark price ve funding rate (tek /v1/premiumIndex isteği)
+
+FEATURES:
+- Sembolsüz /v1/premiumIndex (weight 10) ile tüm evren tek istekte
+- markPrice stream event'leri aynı tabloyu günceller; stream canlıyken
+  funding / mark price okumaları istek gerektirmez
+- Kayıt bir sonraki funding zamanına kadar veya mark price max_age'den
+  eski olana kadar geçerli
+- REST yanıtı stream'den gelen daha yeni kaydın üzerine yazılmaz (event zamanı)
+- Okuma O(1); kayıtlar atomik olarak değiştirilir (thread'lerden okunabilir)
+"""
+
+import time
+from typing import Dict, List, Optional
+
+
+class PremiumIndexSnapshot:
+    """Sembol bazlı mark price / funding rate tablosu"""
+
+    DEFAULT_MAX_AGE = 60.0  # saniye
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Args:
+            max_age: Mark price'ın güncel sayıldığı süre (stream 1-3 sn'de bir günceller)
+        """
+        self.max_age = max_age
+        # {symbol: {'mark_price', 'index_price', 'funding_rate', 'next_funding_time',
+        #           'event_time', 'updated_at'}}
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {"rest_updates": 0, "stream_updates": 0}
+
+    def update_from_rest(self, payload: List[Dict]):
+        """Sembolsüz /v1/premiumIndex yanıtını uygula (daha yeni kayıtlar korunur)"""
+        now = time.time()
+        for item in payload:
+            event_time = int(item.get("time", 0) or 0)
+            current = self.entries.get(item["symbol"])
+            if current is not None and event_time and current["event_time"] > event_time:
+                continue
+            self.entries[item["symbol"]] = {
+                "mark_price": float(item.get("markPrice", 0)),
+                "index_price": float(item.get("indexPrice", 0) or 0),
+                "funding_rate": float(item.get("lastFundingRate", 0) or 0),
+                "next_funding_time": int(item.get("nextFundingTime", 0) or 0),
+                "event_time": event_time,
+                "updated_at": now,
+            }
+        self.stats["rest_updates"] += 1
+
+    def apply_mark_price(self, event: Dict):
+        """markPrice stream event'ini (parse_stream_message çıktısı) uygula"""
+        self.entries[event["symbol"]] = {
+            "mark_price": event["mark_price"],
+            "index_price": event["index_price"],
+            "funding_rate": event["funding_rate"],
+            "next_funding_time": int(event["next_funding_time"] or 0),
+            "event_time": int(event["event_time"]),
+            "updated_at": time.time(),
+        }
+        self.stats["stream_updates"] += 1
+
+    def is_fresh(self, entry: Dict, now: Optional[float] = None) -> bool:
+        """Funding zamanı geçmemiş ve mark price max_age'den yeni mi"""
+        now = time.time() if now is None else now
+        if now - entry["updated_at"] > self.max_age:
+            return False
+        next_funding = entry["next_funding_time"]
+        return not next_funding or now * 1000 < next_funding
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Sembolün güncel kaydı, yoksa / eskiyse None"""
+        entry = self.entries.get(symbol)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return entry
+
+    def fresh_entries(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Güncel kayıtlar; symbols verilirse yalnızca onlar"""
+        now = time.time()
+        names = self.entries.keys() if symbols is None else symbols
+        result = {}
+        for symbol in names:
+            entry = self.entries.get(symbol)
+            if entry is not None and self.is_fresh(entry, now):
+                result[symbol] = entry
+        return result
@@ -0,0 +1,90 @@
+"""
+Price History
+Sembol başına sabit kapasiteli, kolonlu (price / volume / timestamp) ring buffer
+
+FEATURES:
+- float64 NumPy dizileri: tick başına dict / datetime nesnesi oluşturulmaz
+- Kapasite dolunca en eski değerin üzerine yazılır; liste kesme (kopya) yok
+- Her değer iki kez yazılır (i ve i + capacity): son n değer her zaman
+  bitişiktir, window(n) kopyasız view döner
+- Toplu ekleme (extend) warmup / backfill için tek vektörel yazma
+
+View'lar salt okunur kabul edilir ve sonraki append'lerle değişebilir; saklanacaksa
+kopyalanmalıdır.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, list, tuple]
+
+
+class PriceRingBuffer:
+    """Sabit kapasiteli kolonlu fiyat geçmişi"""
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        # Aynalı depolama: [0, capacity) ve [capacity, 2 * capacity) aynı değerleri tutar
+        self._price = np.zeros(2 * capacity)
+        self._volume = np.zeros(2 * capacity)
+        self._timestamp = np.zeros(2 * capacity)
+        self._next = 0  # Sonraki yazma pozisyonu [0, capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, price: float, volume: float, timestamp: float):
+        """Tek değer ekle (O(1), allocation yok)"""
+        i = self._next
+        j = i + self.capacity
+        self._price[i] = self._price[j] = price
+        self._volume[i] = self._volume[j] = volume
+        self._timestamp[i] = self._timestamp[j] = timestamp
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, prices: ArrayLike, volumes: ArrayLike, timestamps: Union[ArrayLike, float]):
+        """Çok değeri sırayla ekle (yalnızca son capacity kadarı yazılır)"""
+        prices = np.asarray(prices, dtype=np.float64)[-self.capacity:]
+        count = len(prices)
+        if count == 0:
+            return
+        volumes = np.asarray(volumes, dtype=np.float64)[-count:]
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (count,)) \
+            if np.ndim(timestamps) == 0 else np.asarray(timestamps, dtype=np.float64)[-count:]
+
+        positions = (self._next + np.arange(count)) % self.capacity
+        for column, values in ((self._price, prices), (self._volume, volumes),
+                               (self._timestamp, timestamps)):
+            column[positions] = values
+            column[positions + self.capacity] = values
+        self._next = (self._next + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def _window(self, column: np.ndarray, n: Optional[int]) -> np.ndarray:
+        n = self._size if n is None else min(n, self._size)
+        end = self._next + self.capacity
+        return column[end - n:end]
+
+    def prices(self, n: Optional[int] = None) -> np.ndarray:
+        """Son n fiyat, eskiden yeniye (kopyasız view)"""
+        return self._window(self._price, n)
+
+    def volumes(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._volume, n)
+
+    def timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._timestamp, n)
+
+    @property
+    def last_price(self) -> Optional[float]:
+        if self._size == 0:
+            return None
+        return float(self._price[self._next + self.capacity - 1])
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
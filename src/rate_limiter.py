@@ -0,0 +1,245 @@
+"""
+Binance Futures Rate Limiter
+Saniyelik bucket'lar ve running sum ile O(1) sliding-window limit takibi
+
+FEATURES:
+- Sabit zamanlı güncelleme (60 saniyelik ring buffer, liste filtreleme yok)
+- Endpoint bazlı gerçek request weight tablosu
+- X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-* header'ları ile senkronizasyon
+- Bloklayan (thread) ve bloklamayan (asyncio) acquire
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+# Endpoint weight tablosu: (method, endpoint) -> (sembollü weight, sembolsüz weight)
+# Kaynak: https://developers.binance.com/docs/derivatives/usds-margined-futures
+ENDPOINT_WEIGHTS: Dict[Tuple[str, str], Tuple[int, int]] = {
+    ("GET", "/v1/ping"): (1, 1),
+    ("GET", "/v1/time"): (1, 1),
+    ("GET", "/v1/exchangeInfo"): (1, 1),
+    ("GET", "/v1/ticker/price"): (1, 2),
+    ("GET", "/v1/ticker/24hr"): (1, 40),
+    ("GET", "/v1/premiumIndex"): (1, 10),
+    ("GET", "/v1/leverageBracket"): (1, 1),
+    ("GET", "/v2/account"): (5, 5),
+    ("GET", "/v2/positionRisk"): (5, 5),
+    ("GET", "/v1/openOrders"): (1, 40),
+    ("GET", "/v1/allOrders"): (5, 5),
+    ("GET", "/v1/order"): (1, 1),
+    ("POST", "/v1/order"): (1, 1),
+    ("DELETE", "/v1/order"): (1, 1),
+    ("POST", "/v1/batchOrders"): (5, 5),
+    ("DELETE", "/v1/allOpenOrders"): (1, 1),
+    ("POST", "/v1/leverage"): (1, 1),
+    ("POST", "/v1/marginType"): (1, 1),
+    ("POST", "/v1/listenKey"): (1, 1),
+    ("PUT", "/v1/listenKey"): (1, 1),
+    ("DELETE", "/v1/listenKey"): (1, 1),
+}
+
+# Emir sayacına yazılan endpoint'ler
+ORDER_ENDPOINTS = {("POST", "/v1/order"), ("POST", "/v1/batchOrders")}
+
+
+def kline_weight(limit: int) -> int:
+    """/v1/klines weight'i limit parametresine bağlı"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def endpoint_weight(method: str, endpoint: str, params: Optional[Dict] = None) -> int:
+    """İsteğin request weight'ini hesapla (bilinmeyen endpoint'ler için 1)"""
+    params = params or {}
+    if endpoint in ("/v1/klines", "/v1/continuousKlines", "/v1/markPriceKlines"):
+        return kline_weight(int(params.get("limit", 500)))
+    weights = ENDPOINT_WEIGHTS.get((method, endpoint))
+    if weights is None:
+        return 1
+    return weights[0] if "symbol" in params else weights[1]
+
+
+class _SlidingWindow:
+    """Saniyelik bucket'larla sliding window sayacı (running sum)"""
+
+    def __init__(self, window_seconds: int):
+        self.window = window_seconds
+        self.buckets = [0] * window_seconds
+        self.total = 0
+        self.last_second = int(time.time())
+
+    def _advance(self, now_second: int):
+        # Süresi dolan bucket'ları temizle (en fazla window kadar adım: O(1))
+        elapsed = now_second - self.last_second
+        if elapsed <= 0:
+            return
+        if elapsed >= self.window:
+            self.buckets = [0] * self.window
+            self.total = 0
+        else:
+            for second in range(self.last_second + 1, now_second + 1):
+                idx = second % self.window
+                self.total -= self.buckets[idx]
+                self.buckets[idx] = 0
+        self.last_second = now_second
+
+    def used(self, now: float) -> int:
+        self._advance(int(now))
+        return self.total
+
+    def add(self, now: float, amount: int):
+        second = int(now)
+        self._advance(second)
+        self.buckets[second % self.window] += amount
+        self.total += amount
+
+    def wait_for(self, now: float, amount: int, limit: int) -> float:
+        """amount kadar kapasite açılana dek beklenecek süre"""
+        second = int(now)
+        self._advance(second)
+        excess = self.total + amount - limit
+        if excess <= 0:
+            return 0.0
+        # En eski bucket'tan itibaren düşecek miktarı say
+        freed = 0
+        for offset in range(1, self.window + 1):
+            expiring_second = second - self.window + offset
+            freed += self.buckets[expiring_second % self.window]
+            if freed >= excess:
+                return max(expiring_second + self.window - now, 0.0)
+        return float(self.window)
+
+
+class RateLimiter:
+    """Request weight ve emir sayısı limitleri (thread-safe)"""
+
+    REQUEST_WEIGHT_LIMIT = 2400   # Per minute
+    ORDER_LIMIT_1M = 1200         # Per minute
+    ORDER_LIMIT_10S = 300         # Per 10 seconds
+
+    def __init__(self, weight_limit: int = REQUEST_WEIGHT_LIMIT,
+                 order_limit_1m: int = ORDER_LIMIT_1M,
+                 order_limit_10s: int = ORDER_LIMIT_10S):
+        self.weight_limit = weight_limit
+        self.order_limit_1m = order_limit_1m
+        self.order_limit_10s = order_limit_10s
+
+        self._weights = _SlidingWindow(60)
+        self._orders_1m = _SlidingWindow(60)
+        self._orders_10s = _SlidingWindow(10)
+        self._lock = threading.Lock()
+
+        # Sunucunun bildirdiği kullanım (Binance dakikalık pencereyi dakika başında sıfırlar)
+        self._server_weight = 0
+        self._server_weight_minute = -1
+        self._server_orders_1m = 0
+        self._server_orders_minute = -1
+
+    def update_limits(self, rate_limits: List[Dict]):
+        """exchangeInfo.rateLimits'ten limitleri güncelle"""
+        for rl in rate_limits:
+            interval = rl.get("interval")
+            num = rl.get("intervalNum", 1)
+            limit = rl.get("limit")
+            if limit is None:
+                continue
+            if rl.get("rateLimitType") == "REQUEST_WEIGHT" and interval == "MINUTE" and num == 1:
+                self.weight_limit = limit
+            elif rl.get("rateLimitType") == "ORDERS":
+                if interval == "MINUTE" and num == 1:
+                    self.order_limit_1m = limit
+                elif interval == "SECOND" and num == 10:
+                    self.order_limit_10s = limit
+
+    def sync_from_headers(self, headers: Mapping[str, str]):
+        """Yanıt header'larındaki sunucu sayaçlarını al"""
+        minute = int(time.time() // 60)
+        used_weight = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("X-MBX-USED-WEIGHT-1m")
+        order_count = headers.get("X-MBX-ORDER-COUNT-1M") or headers.get("X-MBX-ORDER-COUNT-1m")
+        with self._lock:
+            if used_weight is not None:
+                try:
+                    self._server_weight = int(used_weight)
+                    self._server_weight_minute = minute
+                except ValueError:
+                    pass
+            if order_count is not None:
+                try:
+                    self._server_orders_1m = int(order_count)
+                    self._server_orders_minute = minute
+                except ValueError:
+                    pass
+
+    def used_weight(self) -> int:
+        """Son 60 saniyedeki weight (yerel ve sunucu değerinin büyüğü)"""
+        now = time.time()
+        with self._lock:
+            return max(self._weights.used(now), self._server_value(now, self._server_weight,
+                                                                   self._server_weight_minute))
+
+    @staticmethod
+    def _server_value(now: float, value: int, minute: int) -> int:
+        return value if int(now // 60) == minute else 0
+
+    def _try_acquire(self, weight: int, orders: int = 0) -> float:
+        """Kapasite varsa kaydet ve 0 döndür, yoksa beklenecek süreyi döndür"""
+        now = time.time()
+        with self._lock:
+            delay = self._weights.wait_for(now, weight, self.weight_limit)
+
+            # Sunucu sayacı dakika sonuna kadar geçerli
+            server_weight = self._server_value(now, self._server_weight, self._server_weight_minute)
+            if server_weight + weight > self.weight_limit:
+                delay = max(delay, 60 - now % 60)
+
+            if orders:
+                delay = max(delay, self._orders_1m.wait_for(now, orders, self.order_limit_1m))
+                delay = max(delay, self._orders_10s.wait_for(now, orders, self.order_limit_10s))
+                server_orders = self._server_value(now, self._server_orders_1m, self._server_orders_minute)
+                if server_orders + orders > self.order_limit_1m:
+                    delay = max(delay, 60 - now % 60)
+
+            if delay > 0:
+                return delay
+
+            self._weights.add(now, weight)
+            if server_weight:
+                self._server_weight += weight
+            if orders:
+                self._orders_1m.add(now, orders)
+                self._orders_10s.add(now, orders)
+                if self._server_orders_minute == int(now // 60):
+                    self._server_orders_1m += orders
+            return 0.0
+
+    def try_acquire(self, weight: int = 1, orders: int = 0) -> bool:
+        """Beklemeden: kapasite varsa kaydet ve True döndür"""
+        return self._try_acquire(weight, orders) <= 0
+
+    def acquire(self, weight: int = 1, orders: int = 0) -> float:
+        """Kapasite açılana dek thread'i beklet, toplam bekleme süresini döndür"""
+        waited = 0.0
+        while True:
+            delay = self._try_acquire(weight, orders)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, weight: int = 1, orders: int = 0) -> float:
+        """Kapasite açılana dek event loop'u bloklamadan bekle"""
+        waited = 0.0
+        while True:
+            delay = self._try_acquire(weight, orders)
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
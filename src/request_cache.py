@@ -0,0 +1,176 @@
+"""
+Request Cache
+GET istekleri için single-flight birleştirme ve kısa TTL'li yanıt önbelleği
+
+FEATURES:
+- Single-flight: aynı (endpoint, parametreler) için uçuşta olan istek varsa
+  yeni istek gönderilmez, ilk isteğin sonucu (veya hatası) paylaşılır
+- Endpoint bazlı TTL: süresi dolmamış yanıt ağa çıkmadan döner ve rate limit
+  weight'i harcamaz (ttl 0: yalnızca birleştirme)
+- LRU ile sınırlı boyut (max_entries)
+- Sayaçlar: hits, misses (ağa giden istek), coalesced, evictions
+- Senkron client (thread'ler: trading döngüsü, dashboard) ve asenkron client
+  (tek event loop) için ayrı uçuş tabloları
+
+Anahtar imzalanmadan önceki parametrelerden oluşturulur (timestamp / signature
+hariç). Paylaşılan yanıt nesneleri salt okunur kabul edilir.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+class RequestCache:
+    """Single-flight + TTL önbellek (thread-safe)"""
+
+    DEFAULT_MAX_ENTRIES = 256
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True):
+        """
+        Args:
+            ttls: {endpoint: saniye}; listede olmayan endpoint'ler önbelleğe alınmaz
+            max_entries: Önbellekteki en fazla yanıt
+            enabled: False ise her istek doğrudan gönderilir
+        """
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_async: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RequestCache":
+        """network.request_cache config bloğundan oluştur"""
+        return cls(
+            ttls=config.get("ttl", {}),
+            max_entries=config.get("max_entries", cls.DEFAULT_MAX_ENTRIES),
+            enabled=config.get("enabled", True),
+        )
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Dict]) -> str:
+        """İstek anahtarı (parametre sırasından bağımsız)"""
+        if not params:
+            return endpoint
+        return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """(bulundu, yanıt); süresi dolan kayıt silinir"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, entry[1]
+                del self._entries[key]
+        return False, None
+
+    def store(self, key: str, endpoint: str, value: Any):
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def fetch(self, endpoint: str, params: Optional[Dict], send: Callable[[], Any]) -> Any:
+        """
+        Önbellekten veya tek uçuştan yanıt al (senkron)
+
+        Args:
+            send: Ağ isteğini yapan fonksiyon (yalnızca lider thread çağırır)
+        """
+        key = self.key(endpoint, params)
+        found, value = self.lookup(key)
+        if found:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self._counters["misses"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = send()
+            # Uçuş kaydı silinmeden önce önbelleğe yaz: arada tekrar istek gitmesin
+            self.store(key, endpoint, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def fetch_async(self, endpoint: str, params: Optional[Dict],
+                          send: Callable[[], Awaitable[Any]]) -> Any:
+        """Önbellekten veya tek uçuştan yanıt al (asenkron client, tek event loop)"""
+        key = self.key(endpoint, params)
+        found, value = self.lookup(key)
+        if found:
+            return value
+
+        future = self._inflight_async.get(key)
+        if future is not None:
+            self._counters["coalesced"] += 1
+            try:
+                # shield: bekleyen iptal edilirse liderin isteği sürer
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Lider iptal edildi: isteği kendimiz gönderelim
+                return await self.fetch_async(endpoint, params, send)
+
+        future = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+        # Bekleyen yoksa "exception was never retrieved" uyarısı çıkmasın
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._counters["misses"] += 1
+        try:
+            value = await send()
+            self.store(key, endpoint, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight_async[key]
+
+    @property
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        requests = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = round((stats["hits"] + stats["coalesced"]) / requests, 3) if requests else 0.0
+        return stats
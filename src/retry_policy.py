@@ -0,0 +1,172 @@
+"""
+Retry Policy
+Tek katmanlı retry kararı: idempotency kuralları, jitter'lı backoff,
+döngü başına retry bütçesi ve endpoint bazlı circuit breaker
+
+urllib3 Retry ve manuel retry döngüsü üst üste binmez; bir isteğin kaç kez
+deneneceğine yalnızca bu modül karar verir.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+# Tekrar gönderilmesi çift emir açabilecek endpoint'ler. Bunlar yalnızca
+# istek sunucuya hiç ulaşmadıysa (bağlantı kurulamadı) tekrar denenir.
+NON_IDEMPOTENT_ENDPOINTS = {
+    ("POST", "/v1/order"),
+    ("POST", "/v1/batchOrders"),
+}
+
+
+class RetryBudget:
+    """Döngü başına toplam retry hakkı (thread-safe)"""
+
+    def __init__(self, per_cycle: int = 10, window: float = 30.0):
+        self.per_cycle = per_cycle
+        self.window = window
+        self._remaining = per_cycle
+        self._reset_at = time.time()
+        self._lock = threading.Lock()
+
+    def start_cycle(self):
+        """Yeni trading döngüsü: bütçeyi yenile"""
+        with self._lock:
+            self._remaining = self.per_cycle
+            self._reset_at = time.time()
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            # Bot start_cycle çağırmıyorsa (tek başına kullanım) zamanla yenilenir
+            if time.time() - self._reset_at >= self.window:
+                self._remaining = self.per_cycle
+                self._reset_at = time.time()
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        return self._remaining
+
+
+class CircuitBreaker:
+    """
+    Endpoint circuit breaker
+
+    CLOSED: normal. Art arda failure_threshold hata -> OPEN.
+    OPEN: istekler hemen reddedilir. reset_timeout sonra -> HALF_OPEN.
+    HALF_OPEN: tek deneme isteğine izin verilir; başarılıysa CLOSED, değilse OPEN.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                # Tek deneme isteği
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+    def release(self):
+        """
+        Sonuç kaydedilmeden biten deneme (429, beklenmeyen hata, iptal)
+
+        HALF_OPEN'daki tek deneme hakkı başarısız sayılır: breaker OPEN'a döner ve
+        reset_timeout sonra yeni deneme isteğine izin verir (aksi halde kalıcı kilit).
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+
+class RetryPolicy:
+    """Retry kararları, backoff süreleri ve endpoint circuit breaker'ları"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 5.0,
+                 cycle_budget: int = 10, breaker_failure_threshold: int = 5,
+                 breaker_reset_timeout: float = 30.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = RetryBudget(cycle_budget)
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RetryPolicy":
+        """network.retry config bloğundan oluştur"""
+        return cls(**{k: v for k, v in config.items() if k in (
+            "max_attempts", "base_delay", "max_delay", "cycle_budget",
+            "breaker_failure_threshold", "breaker_reset_timeout"
+        )})
+
+    def start_cycle(self):
+        self.budget.start_cycle()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(
+                    endpoint,
+                    CircuitBreaker(self.breaker_failure_threshold, self.breaker_reset_timeout)
+                )
+        return breaker
+
+    @staticmethod
+    def is_idempotent(method: str, endpoint: str) -> bool:
+        return (method, endpoint) not in NON_IDEMPOTENT_ENDPOINTS
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def should_retry(self, method: str, endpoint: str, attempt: int, request_sent: bool,
+                     retry_after: Optional[float] = None) -> bool:
+        """
+        Bir hata sonrası tekrar denenmeli mi?
+
+        Args:
+            attempt: Başarısız olan denemenin indeksi (0'dan başlar)
+            request_sent: İstek sunucuya ulaşmış olabilir mi (timeout, 5xx)
+            retry_after: Sunucunun istediği bekleme (429); max_delay'den uzunsa retry yok
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if request_sent and not self.is_idempotent(method, endpoint):
+            return False
+        if retry_after is not None and retry_after > self.max_delay:
+            return False
+        return self.budget.try_spend()
@@ -0,0 +1,53 @@
+"""
+Symbol Settings Cache
+Sembol bazlı leverage ve margin tipi (borsadaki güncel değerler)
+
+FEATURES:
+- Account snapshot'ındaki pozisyon satırlarından doldurulur (ek istek yok)
+- Başarılı set_leverage / set_margin_type ve ACCOUNT_CONFIG_UPDATE event'leri
+  kaydı günceller
+- Değer zaten istenen gibiyse POST /v1/leverage, /v1/marginType atlanır;
+  giriş emri yolunda yalnızca emir isteği kalır
+"""
+
+from typing import Dict, Iterable, Optional
+
+
+class SymbolSettingsCache:
+    """Sembol bazlı leverage / margin tipi önbelleği"""
+
+    def __init__(self):
+        self.leverage: Dict[str, int] = {}
+        self.margin_type: Dict[str, str] = {}  # "ISOLATED" | "CROSSED"
+
+    @staticmethod
+    def normalize_margin_type(value) -> str:
+        """/v2/account 'isolated' (bool) veya positionRisk 'marginType' (cross/isolated)"""
+        if isinstance(value, bool):
+            return "ISOLATED" if value else "CROSSED"
+        return "ISOLATED" if str(value).upper() == "ISOLATED" else "CROSSED"
+
+    def update_from_positions(self, positions: Iterable[Dict]):
+        """Account snapshot / positionRisk pozisyon satırlarını uygula"""
+        for pos in positions:
+            symbol = pos["symbol"]
+            if pos.get("leverage") is not None:
+                self.leverage[symbol] = int(pos["leverage"])
+            if "isolated" in pos:
+                self.margin_type[symbol] = self.normalize_margin_type(pos["isolated"])
+            elif "marginType" in pos:
+                self.margin_type[symbol] = self.normalize_margin_type(pos["marginType"])
+
+    def needs_leverage(self, symbol: str, leverage: int) -> bool:
+        """Borsadaki leverage bilinmiyor veya farklı mı"""
+        return self.leverage.get(symbol) != int(leverage)
+
+    def needs_margin_type(self, symbol: str, margin_type: str) -> bool:
+        """Borsadaki margin tipi bilinmiyor veya farklı mı"""
+        return self.margin_type.get(symbol) != self.normalize_margin_type(margin_type)
+
+    def get(self, symbol: str) -> Dict[str, Optional[object]]:
+        return {
+            "leverage": self.leverage.get(symbol),
+            "margin_type": self.margin_type.get(symbol),
+        }
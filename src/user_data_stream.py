@@ -0,0 +1,125 @@
+"""
+User Data Stream
+listenKey ile emir dolumları, bakiye ve pozisyon değişikliklerinin push akışı
+
+FEATURES:
+- ORDER_TRADE_UPDATE / ACCOUNT_UPDATE / ACCOUNT_CONFIG_UPDATE / listenKeyExpired
+  event'lerini normalize eder
+- Supervisor thread ile yeniden bağlanma (SupervisedStream)
+- Yeniden bağlanınca on_reconnect: kopukluk sırasında kaçan event'ler için
+  bot REST ile bir kez mutabakat yapar
+- listenKey oluşturma / keepalive REST tarafında (API client) yapılır
+"""
+
+import logging
+from typing import Callable, Dict, Optional
+
+from .market_data import SupervisedStream
+
+
+def parse_user_event(message: Dict) -> Optional[Dict]:
+    """
+    User data stream mesajını normalize event'e çevir
+
+    Returns:
+        {'type': 'order' | 'account' | 'account_config' | 'listen_key_expired', ...} veya None
+    """
+    event_type = message.get("e")
+    if event_type == "ORDER_TRADE_UPDATE":
+        o = message["o"]
+        return {
+            "type": "order",
+            "symbol": o["s"],
+            "order_id": o["i"],
+            "client_order_id": o.get("c", ""),
+            "side": o["S"],
+            "order_type": o["o"],
+            "status": o["X"],
+            "execution_type": o["x"],
+            "last_filled_qty": float(o.get("l", 0)),
+            "last_filled_price": float(o.get("L", 0)),
+            "filled_qty": float(o.get("z", 0)),
+            "avg_price": float(o.get("ap", 0)),
+            "reduce_only": bool(o.get("R", False)),
+            "realized_pnl": float(o.get("rp", 0) or 0),
+            "commission": float(o.get("n", 0) or 0),
+            "trade_time": o.get("T", message["E"]),
+            "event_time": message["E"],
+        }
+    if event_type == "ACCOUNT_UPDATE":
+        a = message["a"]
+        return {
+            "type": "account",
+            "reason": a.get("m"),
+            "balances": {b["a"]: float(b["wb"]) for b in a.get("B", [])},
+            "positions": [
+                {
+                    "symbol": p["s"],
+                    "amount": float(p["pa"]),
+                    "entry_price": float(p["ep"]),
+                    "unrealized_pnl": float(p.get("up", 0) or 0),
+                    "position_side": p.get("ps", "BOTH"),
+                }
+                for p in a.get("P", [])
+            ],
+            "event_time": message["E"],
+        }
+    if event_type == "ACCOUNT_CONFIG_UPDATE" and "ac" in message:
+        # Sembol leverage değişikliği (multi-assets mode güncellemesi "ai" ile gelir, kullanılmıyor)
+        return {
+            "type": "account_config",
+            "symbol": message["ac"]["s"],
+            "leverage": int(message["ac"]["l"]),
+            "event_time": message["E"],
+        }
+    if event_type == "listenKeyExpired":
+        return {"type": "listen_key_expired", "event_time": message["E"]}
+    return None
+
+
+class UserDataStream(SupervisedStream):
+    """listenKey tabanlı user data WebSocket"""
+
+    label = "User data stream"
+    thread_name = "user-data"
+
+    def __init__(self, ws_url: str, listen_key: str, loop,
+                 on_event: Callable[[Dict], None],
+                 on_reconnect: Optional[Callable[[], None]] = None,
+                 ping_interval: float = 20.0, ping_timeout: float = 10.0,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            ws_url: testnet_config.ws_url (ör. wss://stream.binancefuture.com)
+            listen_key: create_listen_key() sonucu
+            loop: Event'lerin aktarılacağı asyncio loop
+            on_event: Loop thread'inde çağrılır: on_event(event)
+            on_reconnect: Yeniden bağlanınca loop thread'inde çağrılır
+        """
+        super().__init__(loop, ping_interval, ping_timeout, logger)
+        self.ws_url = ws_url.rstrip("/")
+        self.listen_key = listen_key
+        self.on_event = on_event
+        self.on_reconnect = on_reconnect
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.ws_url}/ws/{self.listen_key}"
+
+    def set_listen_key(self, listen_key: str):
+        """Yeni listenKey ile yeniden bağlan"""
+        if listen_key == self.listen_key and self.connected:
+            return
+        self.listen_key = listen_key
+        if self.ws is not None:
+            # Supervisor yeni URL ile tekrar bağlanır
+            self.ws.close()
+
+    def _on_connected(self, reconnect: bool):
+        if reconnect and self.on_reconnect is not None:
+            self._dispatch(self.on_reconnect)
+
+    def _handle_message(self, message: Dict):
+        event = parse_user_event(message)
+        if event is not None:
+            self._dispatch(self.on_event, event)
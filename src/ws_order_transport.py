@@ -0,0 +1,89 @@
+"""
+WebSocket Order Transport
+Binance Futures WebSocket API (ws-fapi) üzerinden emir gönderimi
+
+FEATURES:
+- Tek kalıcı bağlantı: her emirde TCP/TLS el sıkışması ve HTTP overhead yok
+- Request id ile istek/yanıt eşleştirme (concurrent.futures.Future)
+- Supervisor thread ile yeniden bağlanma (SupervisedStream)
+- Bağlantı yoksa submit() ConnectionError verir: istek gitmemiştir,
+  çağıran REST'e güvenle düşebilir
+
+İmzalama API client'ta yapılır (HMAC anahtarlarında session.logon yok,
+her istek kendi imzasını taşır).
+"""
+
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from .market_data import SupervisedStream
+
+
+class WebSocketOrderTransport(SupervisedStream):
+    """ws-fapi istek/yanıt bağlantısı"""
+
+    label = "Order WebSocket"
+    thread_name = "ws-orders"
+
+    def __init__(self, url: str, timeout: float = 5.0,
+                 ping_interval: float = 20.0, ping_timeout: float = 10.0,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            url: testnet_config.ws_api_url (ör. wss://testnet.binancefuture.com/ws-fapi/v1)
+            timeout: Yanıt bekleme süresi (saniye)
+        """
+        # Yanıtlar Future'lara WebSocket thread'inde yazılır, asyncio loop gerekmez
+        super().__init__(None, ping_interval, ping_timeout, logger)
+        self.url = url
+        self.timeout = timeout
+        self._pending: Dict[str, Future] = {}
+        self._send_lock = threading.Lock()
+
+        self.stats.update({"requests": 0, "unanswered": 0, "fallbacks": 0})
+
+    @property
+    def stream_url(self) -> str:
+        return self.url
+
+    def submit(self, method: str, params: Dict) -> Future:
+        """
+        İsteği gönder, yanıtı bekleyen Future'ı döndür
+
+        Raises:
+            ConnectionError: Bağlantı yok veya gönderilemedi (istek sunucuya gitmedi)
+        """
+        if not self.connected or self.ws is None:
+            raise ConnectionError(f"{self.label} not connected")
+
+        request_id = uuid.uuid4().hex
+        future: Future = Future()
+        self._pending[request_id] = future
+        future.add_done_callback(lambda _: self._pending.pop(request_id, None))
+
+        payload = json.dumps({"id": request_id, "method": method, "params": params})
+        try:
+            with self._send_lock:
+                self.ws.send(payload)
+        except Exception as e:
+            future.cancel()
+            raise ConnectionError(f"{self.label} send failed: {e}") from e
+
+        self.stats["requests"] += 1
+        return future
+
+    def _handle_message(self, message: Dict):
+        future = self._pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        super()._on_close(ws, close_status_code, close_msg)
+        # Yanıtı gelmeyecek istekler: sonuç belirsiz, çağıran emir durumunu sorgular
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(ConnectionError(f"{self.label} closed"))
@@ -0,0 +1,57 @@
+"""Ortak fixture'lar: gerçek borsaya bağlanmayan client'lar"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.binance_futures_api import BinanceFuturesTestnetAPI
+from src.http_transport import ConnectionFailed, TransportError
+
+
+class FailingTransport:
+    """Her isteği verilen hatayla düşüren stand-in transport"""
+
+    def __init__(self, error: Exception = None):
+        self.error = error or TransportError("boom")
+        self.last_used = time.time()
+        self.calls = 0
+
+    def request(self, method, url, params, timeout):
+        self.calls += 1
+        raise self.error
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    config = {
+        "api_credentials": {"api_key": "test-key", "secret_key": "test-secret"},
+        "testnet_config": {"api_url": "http://127.0.0.1:1", "ws_url": "ws://127.0.0.1:1",
+                           "ws_api_url": "ws://127.0.0.1:1"},
+        "network": {"retry": {"base_delay": 0.0, "max_delay": 0.0}},
+        "logging": {"level": "CRITICAL"},
+    }
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+@pytest.fixture
+def api(config_path):
+    client = BinanceFuturesTestnetAPI(config_path)
+    client.transport = FailingTransport()
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def unreachable():
+    """İstek hiç gönderilmeden düşen bağlantı hatası (retry edilebilir)"""
+    return ConnectionFailed("refused", request_sent=False)
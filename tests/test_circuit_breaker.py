@@ -0,0 +1,74 @@
+"""Circuit breaker: HALF_OPEN deneme hakkı her çıkış yolunda bırakılır"""
+
+import time
+
+import pytest
+
+from src.binance_futures_api import BinanceAPIError, CircuitOpenError
+from src.retry_policy import CircuitBreaker
+
+
+def open_breaker(breaker: CircuitBreaker, reset_timeout: float = 0.05):
+    breaker.reset_timeout = reset_timeout
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = time.time() - reset_timeout
+
+
+def test_release_reopens_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    open_breaker(breaker)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.release()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+def test_release_is_noop_when_closed():
+    breaker = CircuitBreaker()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_generic_transport_error_releases_half_open_trial(api):
+    endpoint = "/fapi/v1/time"
+    breaker = api.retry_policy.breaker(endpoint)
+    open_breaker(breaker)
+
+    with pytest.raises(BinanceAPIError):
+        api._request("GET", endpoint)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        api._request("GET", endpoint)
+
+    time.sleep(0.06)
+    with pytest.raises(BinanceAPIError) as excinfo:
+        api._request("GET", endpoint)
+    assert not isinstance(excinfo.value, CircuitOpenError)
+    assert api.transport.calls == 2
+
+
+def test_retries_stop_once_breaker_opens(api, unreachable):
+    endpoint = "/fapi/v1/time"
+    api.transport.error = unreachable
+    api.retry_policy.breaker(endpoint).failure_threshold = 1
+
+    with pytest.raises(BinanceAPIError):
+        api._request("GET", endpoint)
+    assert api.retry_policy.breaker(endpoint).state == CircuitBreaker.OPEN
+    assert api.transport.calls == 1
+
+
+def test_rate_limit_weight_acquired_per_attempt(api, unreachable):
+    endpoint = "/fapi/v1/time"
+    api.transport.error = unreachable
+    attempts = api.retry_policy.max_attempts
+
+    with pytest.raises(BinanceAPIError):
+        api._request("GET", endpoint, weight=5)
+    assert api.transport.calls == attempts
+    assert api.rate_limiter.used_weight() == 5 * attempts
@@ -0,0 +1,87 @@
+"""Streaming indikatörler: her adımda pencere üzerinden hesaplanan değere eşit"""
+
+import numpy as np
+import pytest
+
+from src.indicators import RESYNC_INTERVAL, RollingBollinger, RollingRSI, RollingSMA, SymbolIndicators
+
+
+def random_walk(n: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 30000.0 + np.cumsum(rng.normal(0.0, 25.0, n))
+
+
+def window_sma(prices, period):
+    return float(np.mean(prices[-period:]))
+
+
+def window_rsi(prices, period):
+    changes = np.diff(prices[-(period + 1):])
+    avg_gain = changes[changes > 0].sum() / period
+    avg_loss = -changes[changes < 0].sum() / period
+    if avg_loss == 0:
+        return 100
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def window_bollinger(prices, period, num_std):
+    window = prices[-period:]
+    middle = float(np.mean(window))
+    std = float(np.std(window))
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+@pytest.mark.parametrize("period", [5, 20, 200])
+def test_streaming_matches_window(period):
+    prices = random_walk(RESYNC_INTERVAL + 3 * period)  # En az bir resync dahil
+    sma, rsi, bollinger = RollingSMA(period), RollingRSI(period), RollingBollinger(period, 2.0)
+    for i, price in enumerate(prices):
+        sma.update(float(price))
+        rsi.update(float(price))
+        bollinger.update(float(price))
+        seen = prices[:i + 1]
+        if i + 1 < period:
+            assert sma.value is None and bollinger.value is None
+        else:
+            assert sma.value == pytest.approx(window_sma(seen, period), rel=1e-12)
+            assert bollinger.value == pytest.approx(window_bollinger(seen, period, 2.0), rel=1e-12)
+        if i < period:
+            assert rsi.value is None
+        else:
+            assert rsi.value == pytest.approx(window_rsi(seen, period), rel=1e-9)
+
+
+def test_extend_then_update_matches_window():
+    prices = random_walk(300, seed=11)
+    indicators = SymbolIndicators(sma_periods=(10, 50), rsi_period=14, bb_period=20, bb_std=2.0)
+    indicators.extend(prices[:250])
+    for price in prices[250:]:
+        indicators.update(float(price))
+
+    assert indicators.sma[10].value == pytest.approx(window_sma(prices, 10), rel=1e-12)
+    assert indicators.sma[50].value == pytest.approx(window_sma(prices, 50), rel=1e-12)
+    assert indicators.rsi.value == pytest.approx(window_rsi(prices, 14), rel=1e-9)
+    assert indicators.bollinger.value == pytest.approx(window_bollinger(prices, 20, 2.0), rel=1e-12)
+
+
+def test_short_extend_accumulates():
+    sma = RollingSMA(4)
+    sma.extend([1.0, 2.0])
+    assert not sma.ready
+    sma.extend([3.0, 4.0, 5.0])
+    assert sma.value == pytest.approx(3.5)
+
+
+def test_rsi_without_losses_is_100():
+    rsi = RollingRSI(3)
+    rsi.extend([1.0, 2.0, 2.0, 3.0, 4.0])
+    assert rsi.value == 100
+    rsi.update(3.5)
+    assert rsi.value == pytest.approx(window_rsi(np.array([2.0, 3.0, 4.0, 3.5]), 3))
+
+
+def test_flat_series_has_zero_width_bands():
+    bollinger = RollingBollinger(5, 2.0)
+    for _ in range(10):
+        bollinger.update(100.0)
+    assert bollinger.value == (100.0, 100.0, 100.0)
@@ -0,0 +1,52 @@
+"""QueueListener yönlendirmesi: root (src.*) kayıtları da kuyruktan geçer"""
+
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from src.log_pipeline import install_queue_logging, stop_queue_logging
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.name, threading.current_thread().name))
+
+
+@pytest.fixture
+def restore_loggers():
+    names = ("", "TestBot", "TestTrades")
+    saved = {name: (list(logging.getLogger(name).handlers), logging.getLogger(name).propagate)
+             for name in names}
+    yield
+    for name, (handlers, propagate) in saved.items():
+        logger = logging.getLogger(name)
+        logger.handlers[:] = handlers
+        logger.propagate = propagate
+
+
+def test_root_and_named_loggers_share_listener(restore_loggers):
+    bot_handler, trade_handler = CollectingHandler(), CollectingHandler()
+    listener = install_queue_logging({
+        "TestBot": [bot_handler],
+        "TestTrades": [trade_handler],
+        "": [bot_handler],
+    })
+    api_logger = logging.getLogger("src.test_client")
+    api_logger.setLevel(logging.INFO)
+    logging.getLogger("TestBot").warning("bot")
+    logging.getLogger("TestTrades").warning("trade")
+    api_logger.info("api")
+    stop_queue_logging(listener)
+
+    assert [name for name, _ in bot_handler.records] == ["TestBot", "src.test_client"]
+    assert [name for name, _ in trade_handler.records] == ["TestTrades"]
+    # Handler'lar çağıran thread'de değil listener thread'inde çalışır
+    caller = threading.current_thread().name
+    assert all(thread != caller for _, thread in bot_handler.records + trade_handler.records)
+    assert all(isinstance(h, QueueHandler) for h in logging.getLogger("").handlers)
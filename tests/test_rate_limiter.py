@@ -0,0 +1,86 @@
+"""Rate limiter: saniyelik bucket'ların süresi dolar, sunucu sayacı dakika sonuna kadar geçerli"""
+
+import pytest
+
+from src import rate_limiter
+from src.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """time modülünün rate limiter'ın kullandığı kısmı (elle ilerletilen saat)"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(6000.2)  # Dakika başı: 6000 = 100 * 60
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def test_weight_expires_after_window(clock):
+    limiter = RateLimiter(weight_limit=100)
+    assert limiter.try_acquire(60)
+    clock.now += 10
+    assert limiter.try_acquire(40)
+    assert not limiter.try_acquire(1)
+    assert limiter.used_weight() == 100
+
+    # İlk bucket 60 saniye sonra düşer, ikincisi hâlâ pencerede
+    clock.now = 6060.0
+    assert limiter.used_weight() == 40
+    assert limiter.try_acquire(60)
+    assert not limiter.try_acquire(1)
+
+    clock.now = 6070.0
+    assert limiter.used_weight() == 60
+
+
+def test_acquire_waits_until_oldest_bucket_expires(clock):
+    limiter = RateLimiter(weight_limit=10)
+    limiter.acquire(10)
+    clock.now += 5
+    waited = limiter.acquire(1)
+    # Bucket saniye başında düşer: 6000. saniyenin kaydı 6060.0'da
+    assert waited == pytest.approx(6060.0 - 6005.2)
+    assert clock.now == pytest.approx(6060.0)
+    assert limiter.used_weight() == 1
+
+
+def test_order_limit_10s(clock):
+    limiter = RateLimiter(order_limit_10s=2)
+    assert limiter.try_acquire(1, orders=2)
+    assert not limiter.try_acquire(1, orders=1)
+    clock.now += 10
+    assert limiter.try_acquire(1, orders=1)
+
+
+def test_server_weight_blocks_until_minute_rollover(clock):
+    limiter = RateLimiter(weight_limit=100)
+    limiter.sync_from_headers({"X-MBX-USED-WEIGHT-1M": "95"})
+    assert limiter.used_weight() == 95
+    assert limiter.try_acquire(5)
+    # Yerel kayıt sunucu sayacına da eklenir
+    assert limiter.used_weight() == 100
+    assert not limiter.try_acquire(1)
+
+    # Sunucu penceresi dakika başında sıfırlanır; yerel pencere 5 weight tutar
+    clock.now = 6060.0
+    assert limiter.used_weight() == 0
+    assert limiter.try_acquire(1)
+
+
+def test_server_headers_lowercase_and_invalid(clock):
+    limiter = RateLimiter(weight_limit=100)
+    limiter.sync_from_headers({"X-MBX-USED-WEIGHT-1m": "30", "X-MBX-ORDER-COUNT-1m": "x"})
+    assert limiter.used_weight() == 30
+    limiter.sync_from_headers({"X-MBX-USED-WEIGHT-1M": "bad"})
+    assert limiter.used_weight() == 30
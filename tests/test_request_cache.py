@@ -0,0 +1,139 @@
+"""Request cache: aynı anda giden aynı GET tek istek, süresi dolan yanıt yeniden istenir"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src import request_cache
+from src.request_cache import RequestCache
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeMonotonic()
+    monkeypatch.setattr(request_cache, "time", clock)
+    return clock
+
+
+def test_concurrent_fetches_share_one_request():
+    cache = RequestCache(ttls={})
+    release = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        release.wait(5)
+        return {"price": "1"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        cache.fetch("/v1/ticker/price", {"symbol": "BTCUSDT"}, send))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Tüm bekleyenler uçuştaki isteğe bağlanana kadar bekle
+    while cache.stats["misses"] + cache.stats["coalesced"] < len(threads):
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"price": "1"}] * len(threads)
+    assert cache.stats["coalesced"] == len(threads) - 1
+    # ttl 0: yalnızca birleştirme, sonraki istek yeniden gider
+    cache.fetch("/v1/ticker/price", {"symbol": "BTCUSDT"}, send)
+    assert len(calls) == 2
+
+
+def test_leader_error_is_shared():
+    cache = RequestCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def send():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def fetch():
+        try:
+            cache.fetch("/v1/time", None, send)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=fetch)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=fetch)
+    follower.start()
+    while cache.stats["coalesced"] < 1:
+        threading.Event().wait(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2
+    assert cache._inflight == {}
+
+
+def test_async_fetches_share_one_request():
+    cache = RequestCache()
+    calls = []
+
+    async def send():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [1, 2]
+
+    async def run():
+        return await asyncio.gather(*(cache.fetch_async("/v1/time", None, send) for _ in range(5)))
+
+    assert asyncio.run(run()) == [[1, 2]] * 5
+    assert len(calls) == 1
+    assert cache._inflight_async == {}
+
+
+def test_ttl_expiry(clock):
+    cache = RequestCache(ttls={"/v1/ticker/price": 2.0})
+    calls = []
+
+    def send():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.fetch("/v1/ticker/price", {"symbol": "BTCUSDT"}, send) == 1
+    clock.now += 1.9
+    assert cache.fetch("/v1/ticker/price", {"symbol": "BTCUSDT"}, send) == 1
+    assert cache.stats["hits"] == 1
+    clock.now += 0.1
+    assert cache.fetch("/v1/ticker/price", {"symbol": "BTCUSDT"}, send) == 2
+    assert len(calls) == 2
+
+
+def test_lru_eviction(clock):
+    cache = RequestCache(ttls={"/v1/ticker/price": 60.0}, max_entries=2)
+    for symbol in ("A", "B"):
+        cache.fetch("/v1/ticker/price", {"symbol": symbol}, lambda: symbol)
+    # A son kullanılan olur, B en eskisi
+    assert cache.lookup(cache.key("/v1/ticker/price", {"symbol": "A"})) == (True, "A")
+    cache.fetch("/v1/ticker/price", {"symbol": "C"}, lambda: "C")
+
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["entries"] == 2
+    assert cache.lookup(cache.key("/v1/ticker/price", {"symbol": "B"})) == (False, None)
+    assert cache.lookup(cache.key("/v1/ticker/price", {"symbol": "A"})) == (True, "A")
+
+
+def test_key_ignores_param_order():
+    assert RequestCache.key("/v1/klines", {"symbol": "X", "interval": "1m"}) == \
+        RequestCache.key("/v1/klines", {"interval": "1m", "symbol": "X"})
@@ -0,0 +1,43 @@
+"""WebSocket emir yolu: yanıtsız istek bekleyen kayıtlardan silinir"""
+
+import asyncio
+import threading
+
+from src.async_binance_futures_api import AsyncBinanceFuturesTestnetAPI
+from src.ws_order_transport import WebSocketOrderTransport
+
+
+class SilentSocket:
+    """Gönderilen mesaja hiç yanıt vermeyen WebSocket"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append(payload)
+
+
+def test_async_ws_order_timeout_cancels_pending_request(config_path):
+    api = AsyncBinanceFuturesTestnetAPI(config_path)
+    transport = WebSocketOrderTransport("ws://127.0.0.1:1", timeout=0.05)
+    transport.ws = SilentSocket()
+    transport.connected = True
+    api.ws_orders = transport
+
+    async def recover(params):
+        return None
+
+    api._recover_ws_order = recover
+    params = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": "0.001",
+              "newClientOrderId": "test-1"}
+
+    async def run():
+        try:
+            return await api._place_order_ws(params)
+        finally:
+            await api.close()
+
+    assert asyncio.run(run()) is None
+    assert len(transport.ws.sent) == 1
+    assert transport._pending == {}
+    assert transport.stats["unanswered"] == 1